@@ -7,6 +7,9 @@ from .lib import fusionAddInUtils as futil
 from .module.JoystickAddIn import JoystickAddIn
 from .module.CameraController import CameraController
 from .module.SharedState import shared_state
+from .module.MotionPredictor import MotionPredictor
+from .module.MotionIntegrator import MotionIntegrator
+from .lib.cameraUtils import shared_viewport_cache
 
 app = adsk.core.Application.get()
 ui = app.userInterface
@@ -26,10 +29,12 @@ class CameraUpdateHandler(adsk.core.CustomEventHandler):
         # 最低10ms間隔で更新（100fps）
         self.update_interval = min(getattr(config, 'UPDATE_RATE', 0.01), 0.01)
         
-        # ボタンの前回の状態を追跡する辞書
-        self.prev_button_states = {}
-        # 十字キーの前回の状態を追跡する辞書
-        self.prev_dpad_states = {}
+        # 入力値を画面に反映される時点まで外挿する（PREDICTION_ENABLED の場合のみ使用）
+        self.motion_predictor = MotionPredictor()
+        self._settings_generation = None
+        
+        # 前回の更新以降のすべての入力値を積分する（MOTION_INTEGRATION_ENABLED の場合のみ使用）
+        self.motion_integrator = MotionIntegrator()
 
     def notify(self, args: adsk.core.CustomEventArgs):
         try:
@@ -81,82 +86,73 @@ class CameraUpdateHandler(adsk.core.CustomEventHandler):
             # 一定間隔以上空いていない場合はスキップ
             if elapsed < self.update_interval:
                 return
+            
+            # ビュー遷移アニメーションとスケジュールされたカメラ操作を進める
+            self.camera_controller.tick()
                 
+            # 入力が古くなったと判断する時間（メインスレッドが止まっていた間の入力は適用しない）
+            now = time.monotonic()
+            stale_horizon = getattr(config, 'INPUT_STALE_HORIZON', 0.25)
+            
+            # 前回のカメラ更新以降に取得したすべての入力値
+            motion_samples = shared_state.drain_motion()
+            
+            if getattr(config, 'MOTION_INTEGRATION_ENABLED', True):
+                # すべての入力値を時間で重み付けして積分し、1回の書き込みでカメラに適用する
+                self._apply_integrated_motion(config, motion_samples, now, stale_horizon, elapsed)
             # 新しいジョイスティックデータがあるか確認
-            if shared_state.is_dirty:
-                # 共有状態から値を取得
-                joystick_x = shared_state.joystick_x
-                joystick_y = shared_state.joystick_y
+            elif shared_state.is_dirty:
+                # 共有状態から値を取得（値と取得時刻は同時に更新されるので1回で読む）
+                motion, sample_time = shared_state.motion_sample
                 
-                # 最新の回転感度を設定に反映
-                self.camera_controller.rotation_scale = getattr(config, 'ROTATION_SCALE', 0.008)
-                
-                # カメラ位置を更新
-                self.camera_controller.update_camera_position(joystick_x, joystick_y)
+                if now - sample_time > stale_horizon:
+                    # 再計算などで止まっていた間の古い入力は破棄する
+                    futil.log(f"古いジョイスティック入力を破棄しました（{now - sample_time:.3f}秒前）", adsk.core.LogLevels.InfoLogLevel)
+                    self.motion_predictor.reset()
+                else:
+                    if getattr(config, 'PREDICTION_ENABLED', False):
+                        # 入力の取得から画面に反映されるまでの遅延の分だけ先の入力値を予測する
+                        predictor = self._get_motion_predictor(config)
+                        predictor.observe(motion, sample_time)
+                        predictor.record_latency(now - sample_time + elapsed)
+                        motion = predictor.predict()
+                    
+                    # 最新の回転感度を設定に反映
+                    self.camera_controller.rotation_scale = getattr(config, 'ROTATION_SCALE', 0.008)
+                    
+                    # すべての軸の操作をまとめてカメラ位置を更新（カメラへの書き込みは1回）
+                    self.camera_controller.update_camera_motion(motion)
                 
                 # データ処理完了をマーク
                 shared_state.is_dirty = False
-                
-            # ボタン機能の処理
+            elif shared_state.is_motion_neutral or now - shared_state.motion_sample[1] > stale_horizon:
+                # 入力が止まったら閾値未満で蓄積されていた回転を書き込む
+                # （入力スレッドが中立を記録しなかった場合も、最後の入力値が古くなった時点で止まったとみなす）
+                self.camera_controller.flush_pending_rotation()
+
+            # ボタン機能の処理（入力スレッドで判定済みの機能を取り出して実行待ちに積む）
+            resolved_actions = shared_state.drain_actions()
             if config.BUTTON_ENABLED and hasattr(config, 'BUTTON_ASSIGNMENTS'):
-                # 現在のボタン状態を確認
-                current_button_states = getattr(shared_state, 'button_states', {})
-                
-                # デバッグ：ボタン状態のログ出力（押されているボタンがある場合のみ）
-                if config.DEBUG and any(current_button_states.values()):
-                    pressed_buttons = [str(i) for i, pressed in current_button_states.items() if pressed]
-                    futil.log(f"押されているボタン: {', '.join(pressed_buttons) if pressed_buttons else 'なし'}", adsk.core.LogLevels.InfoLogLevel)
-                
-                for button_index, function_name in config.BUTTON_ASSIGNMENTS.items():
-                    if function_name == "none":
+                button_horizon = getattr(config, 'BUTTON_STALE_HORIZON', 1.0)
+                for resolved in resolved_actions:
+                    # 押し続けによる繰り返しは入力と同じ、通常の押下は BUTTON_STALE_HORIZON 秒より古ければ破棄する
+                    age = now - resolved.timestamp
+                    if age > (stale_horizon if resolved.repeat else button_horizon):
+                        futil.log(f"{resolved.trigger} は{age:.3f}秒前の入力のため実行しません。", adsk.core.LogLevels.InfoLogLevel)
                         continue
-                        
-                    # 現在の状態と前回の状態を比較
-                    current_pressed = current_button_states.get(button_index, False)
-                    prev_pressed = self.prev_button_states.get(button_index, False)
-                    
-                    # ボタンが押された瞬間（前回False、今回True）の場合のみ機能を実行
-                    if current_pressed and not prev_pressed:
-                        # ボタン押下を検出
-                        futil.log(f"ボタン {button_index} が押されました。機能コード '{function_name}' を実行します。", adsk.core.LogLevels.InfoLogLevel)
-                        try:
-                            self.camera_controller.execute_button_function(function_name)
-                            futil.log(f"ボタン {button_index} の機能 '{function_name}' の実行が完了しました。", adsk.core.LogLevels.InfoLogLevel)
-                        except Exception as e:
-                            futil.log(f"ボタン {button_index} の機能実行中にエラーが発生: {str(e)}", adsk.core.LogLevels.ErrorLogLevel)
-                
-                # 前回の状態を更新
-                self.prev_button_states = current_button_states.copy()
-
-                # 十字キー機能が有効な場合の処理
-                if getattr(config, 'DPAD_ENABLED', True):
-                    # 現在の十字キー状態を確認
-                    current_dpad_states = getattr(shared_state, 'dpad_states', {})
-                    
-                    # DPAD_ASSIGNMENTSが存在しない場合は空の辞書として処理
-                    dpad_assignments = getattr(config, 'DPAD_ASSIGNMENTS', {})
-                    
-                    for direction, function_name in dpad_assignments.items():
-                        if function_name == "none":
-                            continue
-                            
-                        # 現在の状態と前回の状態を比較
-                        current_pressed = current_dpad_states.get(direction, False)
-                        prev_pressed = self.prev_dpad_states.get(direction, False)
-                        
-                        # 十字キーが押された瞬間（前回False、今回True）の場合のみ機能を実行
-                        if current_pressed and not prev_pressed:
-                            futil.log(f"十字キー {direction} が押されました。機能コード '{function_name}' を実行します。", adsk.core.LogLevels.InfoLogLevel)
-                            self.camera_controller.execute_button_function(function_name)
-                    
-                    # 前回の状態を更新
-                    self.prev_dpad_states = current_dpad_states.copy()
+                    futil.log(f"{resolved.trigger} を検出しました。機能コード '{resolved.function_name}' を{resolved.count}回実行します。", adsk.core.LogLevels.InfoLogLevel)
+                    try:
+                        self.camera_controller.enqueue_function(resolved.function_name, resolved.count, resolved.repeat)
+                    except Exception as e:
+                        futil.log(f"{resolved.trigger} の機能実行中にエラーが発生: {str(e)}", adsk.core.LogLevels.ErrorLogLevel)
             else:
                 # データがない場合はビューポート更新を最小限にする
                 # 必要な場合にのみ更新（10回に1回程度）
                 current_time_ms = int(current_time * 1000)
                 if current_time_ms % 10 == 0:  # 10回に1回程度の頻度で更新
-                    app.activeViewport.refresh()
+                    viewport = self.camera_controller.camera_util.get_viewport()
+                    if viewport:
+                        viewport.refresh()
                 
             # 更新時間を記録
             self.last_update_time = current_time
@@ -165,6 +161,52 @@ class CameraUpdateHandler(adsk.core.CustomEventHandler):
             futil.log(f'Error in CameraUpdateHandler: {e}', adsk.core.LogLevels.ErrorLogLevel)
             futil.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
 
+    def _apply_integrated_motion(self, config, samples, now: float, stale_horizon: float, elapsed: float) -> None:
+        """前回の更新以降の入力値を時間で重み付けして積分し、カメラ位置を更新する"""
+        integrator = self.motion_integrator
+        integrator.reference_interval = getattr(config, 'MOTION_REFERENCE_INTERVAL', 0.032)
+        
+        if samples and now - samples[-1][1] > stale_horizon:
+            # 再計算などで止まっていた間の古い入力は破棄する（積分でも古い区間は除かれる）
+            futil.log(f"古いジョイスティック入力を破棄しました（{now - samples[-1][1]:.3f}秒前）", adsk.core.LogLevels.InfoLogLevel)
+            self.motion_predictor.reset()
+        
+        tail = None
+        if getattr(config, 'PREDICTION_ENABLED', False) and (samples or not integrator.is_idle):
+            # 最後の入力値の取得から現在までの区間は、画面に反映される時点まで外挿した入力値で積分する
+            predictor = self._get_motion_predictor(config)
+            for motion, sample_time in samples:
+                predictor.observe(motion, sample_time)
+            if samples:
+                predictor.record_latency(now - samples[-1][1] + elapsed)
+            tail = predictor.predict()
+        
+        motion = integrator.integrate(samples, now, stale_horizon, tail)
+        if motion is not None:
+            # 最新の回転感度を設定に反映
+            self.camera_controller.rotation_scale = getattr(config, 'ROTATION_SCALE', 0.008)
+            
+            # すべての軸の操作をまとめてカメラ位置を更新（カメラへの書き込みは1回）
+            self.camera_controller.update_camera_motion(motion)
+        else:
+            # 入力が止まったら閾値未満で蓄積されていた回転を書き込む
+            self.camera_controller.flush_pending_rotation()
+        
+        # データ処理完了をマーク
+        shared_state.is_dirty = False
+
+    def _get_motion_predictor(self, config) -> MotionPredictor:
+        """設定が保存/読み込みされていれば反映してから予測器を返す"""
+        if self._settings_generation != config.SETTINGS_GENERATION:
+            self._settings_generation = config.SETTINGS_GENERATION
+            self.motion_predictor.configure(
+                getattr(config, 'PREDICTION_HISTORY', 4),
+                getattr(config, 'PREDICTION_MAX_HORIZON', 0.1),
+                getattr(config, 'PREDICTION_MAX_DELTA', 0.3),
+                getattr(config, 'PREDICTION_EXTRA_LATENCY', 0.0)
+            )
+        return self.motion_predictor
+
 # --- Timer Thread: Fires events at a regular interval --- #
 class TimerThread(threading.Thread):
     def __init__(self, event: adsk.core.CustomEvent):
@@ -251,6 +293,9 @@ def run(context):
         joystick_addin = JoystickAddIn()
         joystick_addin.run(context)
 
+        # ドキュメント/ワークスペース切り替え時にビューポートのキャッシュを無効化する
+        shared_viewport_cache.connect()
+
         # Create the handler for camera updates
         camera_update_handler = CameraUpdateHandler()
 
@@ -297,6 +342,8 @@ def stop(context):
             timer_event.remove(camera_update_handler)
             app.unregisterCustomEvent(TIMER_EVENT_ID)
 
+        shared_viewport_cache.disconnect()
+
         futil.clear_handlers()
         commands.stop()
         futil.log('JoystickCamera Add-in stopped successfully')
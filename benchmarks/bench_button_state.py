@@ -0,0 +1,119 @@
+"""
+ボタン状態の表現（辞書とビットマスク）の1ループあたりのコストを比較するベンチマーク
+
+どちらの方式も同じ生の値（get_button と get_hat の戻り値）から、計測する区間の中で状態を作る。
+
+アドインのルートディレクトリで実行する（Fusion 360 と pygame は不要）:
+    python benchmarks/bench_button_state.py
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from module.SharedState import DPAD_DIRECTIONS, dpad_mask_from_hat, iter_bits  # noqa: E402
+
+NUM_BUTTONS = 16
+NUM_SAMPLES = 1000
+ASSIGNMENTS = {0: "viewcube_front", 1: "smart_rotate_right", 2: "smart_rotate_left", 6: "home_view", 8: "nearest_viewcube"}
+DPAD_ASSIGNMENTS = {direction: "smart_rotate_up" for direction in DPAD_DIRECTIONS}
+
+
+def make_samples(seed: int = 1):
+    """ポーリング結果の列（joystick.get_button(i) の戻り値のリスト、joystick.get_hat(0) の戻り値）を生成する
+    （押下状態はまれに変化する）"""
+    rng = random.Random(seed)
+    buttons = [False] * NUM_BUTTONS
+    hat_x, hat_y = 0, 0
+    samples = []
+    for _ in range(NUM_SAMPLES):
+        if rng.random() < 0.05:
+            i = rng.randrange(NUM_BUTTONS)
+            buttons[i] = not buttons[i]
+        if rng.random() < 0.05:
+            hat_x, hat_y = rng.choice(((0, 0), (0, 1), (0, -1), (-1, 0), (1, 0), (1, 1)))
+        samples.append((list(buttons), (hat_x, hat_y)))
+    return samples
+
+
+def run_dict(samples):
+    """従来の方式: 毎ループ辞書を作り直し、前回のコピーと割り当てごとに比較する"""
+    prev_buttons = {}
+    prev_dpad = {}
+    presses = 0
+    activity = False
+    for buttons, (hat_x, hat_y) in samples:
+        # 入力スレッド
+        get_button = buttons.__getitem__
+        button_states = {i: bool(get_button(i)) for i in range(NUM_BUTTONS)}
+        dpad_states = {
+            "dpad_up": hat_y == 1,
+            "dpad_down": hat_y == -1,
+            "dpad_left": hat_x == -1,
+            "dpad_right": hat_x == 1,
+        }
+        activity = any(button_states.values()) or any(dpad_states.values())
+        # メインスレッド
+        for index in ASSIGNMENTS:
+            if button_states.get(index, False) and not prev_buttons.get(index, False):
+                presses += 1
+        prev_buttons = button_states.copy()
+        for direction in DPAD_ASSIGNMENTS:
+            if dpad_states.get(direction, False) and not prev_dpad.get(direction, False):
+                presses += 1
+        prev_dpad = dpad_states.copy()
+    return presses, activity
+
+
+def run_mask(samples):
+    """ビットマスク方式: 整数にまとめ、XORで変化したビットだけを処理する"""
+    prev_buttons = 0
+    prev_dpad = 0
+    presses = 0
+    activity = False
+    for buttons, (hat_x, hat_y) in samples:
+        # 入力スレッド（JoystickManager.get_button_mask と get_dpad_mask と同じ処理）
+        get_button = buttons.__getitem__
+        button_mask = 0
+        for i in range(NUM_BUTTONS):
+            if get_button(i):
+                button_mask |= 1 << i
+        dpad_mask = dpad_mask_from_hat(hat_x, hat_y)
+        activity = (button_mask | dpad_mask) != 0
+        # メインスレッド
+        changed = button_mask ^ prev_buttons
+        if changed:
+            for index in iter_bits(changed & button_mask):
+                if index in ASSIGNMENTS:
+                    presses += 1
+            prev_buttons = button_mask
+        changed = dpad_mask ^ prev_dpad
+        if changed:
+            for index in iter_bits(changed & dpad_mask):
+                if DPAD_DIRECTIONS[index] in DPAD_ASSIGNMENTS:
+                    presses += 1
+            prev_dpad = dpad_mask
+    return presses, activity
+
+
+def main():
+    samples = make_samples()
+
+    # 両方式で検出した押下の数が一致することを確認
+    assert run_dict(samples) == run_mask(samples), "辞書とビットマスクで結果が一致しません"
+
+    repeat = 200
+    dict_time = min(timeit.repeat(lambda: run_dict(samples), number=1, repeat=repeat))
+    mask_time = min(timeit.repeat(lambda: run_mask(samples), number=1, repeat=repeat))
+
+    print(f"ボタン数 {NUM_BUTTONS}、十字キー {len(DPAD_DIRECTIONS)} 方向、{NUM_SAMPLES} ループ")
+    print(f"  辞書         : {dict_time / NUM_SAMPLES * 1e9:8.1f} ns/ループ")
+    print(f"  ビットマスク : {mask_time / NUM_SAMPLES * 1e9:8.1f} ns/ループ")
+    print(f"  比率         : {dict_time / mask_time:8.1f} 倍")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+入力処理の段（InputPipeline）を入力値ごとに処理する場合と、溜まった入力値を配列でまとめて処理する場合の
+処理速度を比較するベンチマーク（結果が一致することは tests/test_input_pipeline.py で確認する）
+
+アドインのルートディレクトリで実行する（Fusion 360 と pygame は不要。NumPyがない場合はまとめた処理も1件ずつになる）:
+    python benchmarks/bench_input_pipeline.py
+"""
+
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from module.SharedState import CAMERA_DOFS  # noqa: E402
+from module.AxisCalibration import AxisCalibration  # noqa: E402
+from module.InputPipeline import InputFrame, build_input_pipeline, np  # noqa: E402
+
+SAMPLE_COUNTS = (1000, 10000, 100000)
+NUM_AXES = 6
+DEAD_ZONE = 0.15
+
+
+def make_mapping(axis, dof, scale=1.0, curve=1.0, invert=False, trigger=False, device=None):
+    """AxisMapping と同じ属性を持つ対応付け（AxisMapping は Fusion 360 の adsk を読み込むため使用しない）"""
+    return SimpleNamespace(axis=axis, dof=dof, dof_index=CAMERA_DOFS.index(dof), scale=scale, curve=curve,
+                           invert=invert, trigger=trigger, device=device)
+
+
+MAPPINGS = [
+    make_mapping(0, 'yaw', curve=2.0),
+    make_mapping(1, 'pitch', invert=True),
+    make_mapping(2, 'pan_x', scale=0.5, curve=1.5),
+    make_mapping(3, 'pan_y', scale=0.5, curve=1.5, invert=True),
+    make_mapping(4, 'dolly', scale=-1.0, trigger=True),
+    make_mapping(5, 'dolly', trigger=True),
+]
+
+# キャリブレーションした選択中のデバイス（軸5はトリガーなのでキャリブレーションしない）
+CALIBRATIONS = {'bench': [AxisCalibration(0.03, 0.01, 0.004, 0.0125, 0.97),
+                          AxisCalibration(-0.02, 0.015, 0.006, 0.019, 0.98),
+                          AxisCalibration(0.0, 0.005, 0.002, 0.01, 1.0),
+                          AxisCalibration(0.01, 0.005, 0.002, 0.01, 0.99),
+                          AxisCalibration(-1.0, 0.0, 0.0, None)]}
+JOYSTICK_MANAGER = SimpleNamespace(device=SimpleNamespace(key='bench'), devices={})
+
+
+def make_samples(count: int, seed: int = 1):
+    """ポーリング結果の列（取得時刻、すべての軸の値）を生成する（静止、ゆっくりした操作、急な飛びが混ざる）"""
+    rng = random.Random(seed)
+    values = [0.0] * NUM_AXES
+    values[4] = values[5] = -1.0
+    times = []
+    rows = []
+    for i in range(count):
+        for axis in range(NUM_AXES):
+            if rng.random() < 0.02:
+                # 急な飛び（スムージングの対象）
+                values[axis] = rng.uniform(-1.0, 1.0)
+            else:
+                values[axis] = max(-1.0, min(1.0, values[axis] + rng.gauss(0.0, 0.05)))
+        times.append(i * 0.01)
+        rows.append(list(values))
+    return times, rows
+
+
+def build():
+    return build_input_pipeline(MAPPINGS, DEAD_ZONE, CALIBRATIONS, JOYSTICK_MANAGER)
+
+
+def run_scalar(pipeline, times, rows):
+    """入力値ごとに処理する（入力スレッドの通常のポーリングと同じ）"""
+    motions = []
+    active = []
+    for now, row in zip(times, rows):
+        frame = pipeline.run(InputFrame(now, {None: list(row)}))
+        motions.append(frame.motion)
+        active.append(frame.active)
+    return motions, active
+
+
+def run_block(pipeline, times, rows):
+    """溜まった入力値をまとめて処理する"""
+    return pipeline.run_block(times, {None: rows})
+
+
+def max_difference(expected, actual):
+    """入力値ごとの処理とまとめた処理の操作量の最大の差"""
+    return max((abs(x - y) for a, b in zip(expected[0], actual[0]) for x, y in zip(a, b)), default=0.0)
+
+
+def main():
+    print(f"NumPy: {np.__version__ if np is not None else 'なし（まとめた処理も1件ずつ処理する）'}")
+    print(f"入力処理の段: {build()}")
+    for count in SAMPLE_COUNTS:
+        times, rows = make_samples(count)
+
+        scalar_pipeline = build()
+        start = time.perf_counter()
+        expected = run_scalar(scalar_pipeline, times, rows)
+        scalar_time = time.perf_counter() - start
+
+        block_pipeline = build()
+        start = time.perf_counter()
+        actual = run_block(block_pipeline, times, rows)
+        block_time = time.perf_counter() - start
+
+        worst = max_difference(expected, actual)
+
+        print(f"{count:>7} 件: 1件ずつ {scalar_time * 1e3:9.2f} ms ({count / scalar_time:>12,.0f} 件/秒)"
+              f"  まとめて {block_time * 1e3:9.2f} ms ({count / block_time:>12,.0f} 件/秒)"
+              f"  {scalar_time / block_time:6.1f} 倍  最大誤差 {worst:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+UDPの入力元（INPUT_BACKEND = 'udp'）の送信側と遅延の計測
+
+FLAG_ACK_REQUEST を付けたパケットを一定の間隔で送信し、受信側が入力スレッドでパケットを取り出した時に返す応答から、
+送信してから取り出されるまで（と応答が戻るまで）の時間を計測する。
+
+アドインのルートディレクトリで実行する（Fusion 360 と pygame は不要）:
+    python benchmarks/bench_udp_input.py
+        受信側（UdpReceiver）をこのプロセスのスレッドで動かし、ループバックだけで形式の確認と遅延の計測を行う
+    python benchmarks/bench_udp_input.py --target 127.0.0.1:50515
+        起動中のアドインに送信する（左スティックをゆっくり回す動作）
+"""
+
+import argparse
+import math
+import os
+import select
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from module.UdpProtocol import (ACK_SIZE, FLAG_ACK_REQUEST, SEQUENCE_MASK, UdpReceiver,  # noqa: E402
+                                pack_packet, unpack_ack)
+
+
+def check_protocol():
+    """最も新しいシーケンス番号だけが使われ、古いパケットと不正なパケットが捨てられることを確認する"""
+    receiver = UdpReceiver('127.0.0.1', 0, reset_interval=0.2)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    address = receiver.address
+
+    def send_and_read(*packets):
+        for packet in packets:
+            sender.sendto(packet, address)
+        time.sleep(0.02)
+        return receiver.read()
+
+    try:
+        assert send_and_read() is None, "受信前はNoneになりません"
+
+        snapshot = send_and_read(pack_packet(10, 0.0, [0.5, -0.25], 0b11, 4))
+        assert snapshot.sequence == 10 and snapshot.axes == (0.5, -0.25), f"受信した状態が一致しません: {snapshot}"
+        assert snapshot.buttons == 0b11 and snapshot.dpad == 4 and snapshot.device == 'udp'
+
+        # 順番が入れ替わって届いた場合は最も新しいパケットだけを使う
+        snapshot = send_and_read(pack_packet(13, 0.0, [0.3]), pack_packet(12, 0.0, [0.2]), pack_packet(11, 0.0, [0.1]))
+        assert snapshot.sequence == 13 and snapshot.axes == (0.30000001192092896,), f"最新のパケットが使われていません: {snapshot}"
+        assert receiver.dropped == 2, f"古いパケットが捨てられていません: {receiver.dropped}"
+
+        # 後から届いた古いパケットは捨てて前回の状態を返す
+        snapshot = send_and_read(pack_packet(12, 0.0, [0.9]))
+        assert snapshot.sequence == 13, "古いパケットで状態が戻りました"
+
+        # 不正なパケットは数えて捨てる
+        snapshot = send_and_read(b'JCUD', pack_packet(14, 0.0, [0.4])[:-1])
+        assert snapshot.sequence == 13 and receiver.malformed == 2, "不正なパケットが捨てられていません"
+
+        # しばらく受信がなければ送信側が起動し直したとみなす
+        time.sleep(0.25)
+        snapshot = send_and_read(pack_packet(1000000, 0.0, [0.7]))
+        snapshot = send_and_read(pack_packet(1, 0.0, [0.8]))
+        assert snapshot.sequence == 1000000, "受信が続いている間に古いシーケンス番号が使われました"
+        time.sleep(0.25)
+        snapshot = send_and_read(pack_packet(1, 0.0, [0.8]))
+        assert snapshot.sequence == 1, "送信側が起動し直した後のパケットが使われていません"
+
+        # シーケンス番号が一周した場合は新しいとみなす
+        time.sleep(0.25)
+        send_and_read(pack_packet(SEQUENCE_MASK, 0.0, [0.0]))
+        snapshot = send_and_read(pack_packet(0, 0.0, [0.6]))
+        assert snapshot.sequence == 0, "一周したシーケンス番号が使われていません"
+    finally:
+        sender.close()
+        receiver.close()
+    print("形式の確認: OK")
+
+
+def stick_pattern(elapsed: float):
+    """左スティックを4秒で1周ゆっくり回す"""
+    angle = elapsed * math.pi / 2.0
+    return [0.6 * math.cos(angle), 0.6 * math.sin(angle)]
+
+
+def measure_latency(target, rate: float, duration: float):
+    """FLAG_ACK_REQUEST を付けて送信し、応答が戻るまでの時間（秒）の一覧と送信数を返す"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    interval = 1.0 / rate
+    latencies = []
+    sent = 0
+    start = time.monotonic()
+    next_time = start
+    try:
+        while True:
+            now = time.monotonic()
+            if now - start >= duration:
+                break
+            if now >= next_time:
+                sock.sendto(pack_packet(sent, now, stick_pattern(now - start), flags=FLAG_ACK_REQUEST), target)
+                sent += 1
+                next_time += interval
+            # 応答を待ちながら次の送信時刻まで待つ
+            readable, _, _ = select.select([sock], [], [], max(0.0, next_time - time.monotonic()))
+            while readable:
+                try:
+                    data = sock.recv(ACK_SIZE + 1)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError:
+                    continue
+                ack = unpack_ack(data)
+                if ack is not None:
+                    latencies.append(time.monotonic() - ack[1])
+        # 最後に送信したパケットの応答を待つ
+        time.sleep(0.1)
+        while True:
+            try:
+                ack = unpack_ack(sock.recv(ACK_SIZE + 1))
+            except OSError:
+                break
+            if ack is not None:
+                latencies.append(time.monotonic() - ack[1])
+        # 最後にスティックを離した状態を送信する（アドインに送信した場合にカメラが動き続けないように）
+        sock.sendto(pack_packet(sent, time.monotonic(), [0.0, 0.0]), target)
+    finally:
+        sock.close()
+    return latencies, sent
+
+
+def report(latencies, sent: int):
+    if not latencies:
+        print(f"送信 {sent} 件に対して応答がありません（INPUT_BACKEND と UDP_INPUT_PORT を確認してください）")
+        return
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1e3
+
+    # 取り出すまでに新しいパケットが届いた場合は古いパケットの応答は返らない
+    print(f"送信 {sent} 件、応答 {len(latencies)} 件（{len(latencies) / sent:.0%}）")
+    print(f"応答までの時間: 最小 {ordered[0] * 1e3:.3f} ms  中央値 {statistics.median(ordered) * 1e3:.3f} ms"
+          f"  95% {percentile(0.95):.3f} ms  99% {percentile(0.99):.3f} ms  最大 {ordered[-1] * 1e3:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', help='送信先（host:port）。省略した場合はこのプロセスで受信する')
+    parser.add_argument('--rate', type=float, default=250.0, help='送信する頻度（Hz）')
+    parser.add_argument('--duration', type=float, default=3.0, help='送信する時間（秒）')
+    parser.add_argument('--poll', type=float, default=0.005, help='省略時の受信側が取り出す間隔（秒）')
+    args = parser.parse_args()
+
+    if args.target:
+        host, port = args.target.rsplit(':', 1)
+        print(f"{host}:{port} に {args.rate:.0f} Hz で {args.duration:.1f} 秒送信します")
+        report(*measure_latency((host, int(port)), args.rate, args.duration))
+        return
+
+    check_protocol()
+
+    # 入力スレッドと同じように一定の間隔で最新の状態を取り出す
+    receiver = UdpReceiver('127.0.0.1', 0)
+    stop_event = threading.Event()
+
+    def poll():
+        while not stop_event.is_set():
+            receiver.read()
+            stop_event.wait(args.poll)
+
+    thread = threading.Thread(target=poll, daemon=True)
+    thread.start()
+    try:
+        print(f"ループバック: {args.rate:.0f} Hz で送信、{args.poll * 1e3:.1f} ms ごとに取り出し")
+        report(*measure_latency(receiver.address, args.rate, args.duration))
+    finally:
+        stop_event.set()
+        thread.join()
+        receiver.close()
+    print(f"受信 {receiver.received} 件、古いパケットとして破棄 {receiver.dropped} 件、"
+          f"新しいパケットに置き換え {receiver.superseded} 件、不正 {receiver.malformed} 件")
+
+
+if __name__ == "__main__":
+    main()
@@ -90,6 +90,9 @@ def import_and_execute_command(command_name):
             # ファイル実行のためのグローバル名前空間を作成
             namespace = {
                 '__file__': entry_path,
+                # entry.py の相対インポート（from ...lib import ...）を解決できるようにする
+                '__name__': f'{__name__}.{command_name}.entry',
+                '__package__': f'{__name__}.{command_name}',
                 'adsk': adsk
             }
             # コードを実行
@@ -118,6 +121,9 @@ def clean_command(command_name):
             # ファイル実行のためのグローバル名前空間を作成
             namespace = {
                 '__file__': entry_path,
+                # entry.py の相対インポート（from ...lib import ...）を解決できるようにする
+                '__name__': f'{__name__}.{command_name}.entry',
+                '__package__': f'{__name__}.{command_name}',
                 'adsk': adsk
             }
             # コードを実行
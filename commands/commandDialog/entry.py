@@ -4,6 +4,7 @@ import traceback
 from ...lib import fusionAddInUtils as futil
 from ... import config
 from ...module.JoystickManager import JoystickManager
+from ...module.ActionRegistry import action_registry
 
 app = adsk.core.Application.get()
 ui = app.userInterface
@@ -127,7 +128,7 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
         if joysticks:
             for i, joystick in enumerate(joysticks):
                 # 既存の設定があれば、それを選択
-                is_selected = (i == config.SELECTED_JOYSTICK) if i < len(joysticks) else (i == 0)
+                is_selected = (i == joystick_manager.selected_index)
                 joystick_dropdown.listItems.add(joystick.get_name(), is_selected)
             
             # 軸の選択肢を取得
@@ -191,7 +192,7 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
         
         if joysticks and joystick_manager.joystick:
             # ボタン数を取得
-            num_buttons = joystick_manager.joystick.get_numbuttons()
+            num_buttons = joystick_manager.get_button_count()
             
             # 各ボタンに対して機能割り当てドロップダウンを作成
             for i in range(min(num_buttons, 8)):  # 最大8個のボタンまで表示
@@ -204,7 +205,7 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
                 
                 # 利用可能な機能を追加
                 current_function = config.BUTTON_ASSIGNMENTS.get(i, "none")
-                for display_name, function_name in config.AVAILABLE_FUNCTIONS:
+                for display_name, function_name in action_registry.choices():
                     is_selected = (function_name == current_function)
                     button_dropdown.listItems.add(display_name, is_selected)
         else:
@@ -332,6 +333,8 @@ def command_execute(args: adsk.core.CommandEventArgs):
         # 選択されたジョイスティック（コントローラー）のインデックスを保存
         if joystick_dropdown.selectedItem and joystick_dropdown.selectedItem.name != 'コントローラーが見つかりません':
             config.SELECTED_JOYSTICK = joystick_dropdown.selectedItem.index
+            # 接続順が変わっても同じデバイスを使用できるようにGUIDも保存する
+            config.SELECTED_JOYSTICK_GUID = JoystickManager().device_key_at(config.SELECTED_JOYSTICK)
             
         # X軸とY軸の設定を保存
         axis_x_dropdown = inputs.itemById('axis_x_selection')
@@ -359,7 +362,7 @@ def command_execute(args: adsk.core.CommandEventArgs):
                 selected_function = "none"  # デフォルト値
                 
                 # 表示名から内部名を取得
-                for display_name, function_name in config.AVAILABLE_FUNCTIONS:
+                for display_name, function_name in action_registry.choices():
                     if display_name == selected_display_name:
                         selected_function = function_name
                         break
@@ -431,7 +434,7 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
             # 選択されたコントローラーを設定
             joysticks = joystick_manager.get_joysticks()
             if joysticks and selected_index < len(joysticks):
-                joystick_manager.joystick = joysticks[selected_index]
+                joystick_manager.select_device(selected_index)
                 
                 # 軸の選択肢を更新
                 axis_names = joystick_manager.get_axis_names()
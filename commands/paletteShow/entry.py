@@ -3,6 +3,7 @@ import adsk.core
 import os
 from ...lib import fusionAddInUtils as futil
 from ... import config
+from ...module.PaletteInputSource import PALETTE_INPUT_ACTION, post_palette_input
 from datetime import datetime
 
 app = adsk.core.Application.get()
@@ -10,9 +11,9 @@ ui = app.userInterface
 
 # TODO ********************* Change these names *********************
 CMD_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_PalleteShow'
-CMD_NAME = 'Show My Palette'
-CMD_Description = 'A Fusion Add-in Palette'
-PALETTE_NAME = 'My Palette Sample'
+CMD_NAME = 'Virtual Joystick'
+CMD_Description = '画面上のスティックとボタンでカメラを操作するパレットを表示します（INPUT_BACKEND = "palette" の場合）'
+PALETTE_NAME = 'Virtual Joystick'
 IS_PROMOTED = False
 
 # Using "global" variables by referencing values from /config.py
@@ -117,8 +118,8 @@ def command_execute(args: adsk.core.CommandEventArgs):
             isVisible=True,
             showCloseButton=True,
             isResizable=True,
-            width=650,
-            height=600,
+            width=360,
+            height=480,
             useNewWebBrowser=True
         )
         futil.add_handler(palette.closed, palette_closed)
@@ -156,6 +157,13 @@ def palette_navigating(args: adsk.core.NavigationEventArgs):
 
 # Use this to handle events sent from javascript in your palette.
 def palette_incoming(html_args: adsk.core.HTMLEventArgs):
+    # 仮想ジョイスティックの状態は高い頻度で届くので、ログを出さず解析もせずに入力スレッドへ渡す
+    # （入力スレッドがポーリングごとに最新の1件だけを解析する）
+    if html_args.action == PALETTE_INPUT_ACTION:
+        post_palette_input(html_args.data)
+        html_args.returnData = 'OK'
+        return
+
     # General logging for debug.
     futil.log(f'{CMD_NAME}: Palette incoming event.')
 
@@ -167,16 +175,10 @@ def palette_incoming(html_args: adsk.core.HTMLEventArgs):
     log_msg += f"Data: {message_data}"
     futil.log(log_msg, adsk.core.LogLevels.InfoLogLevel)
 
-    # TODO ******** Your palette reaction code here ********
-
-    # Read message sent from palette javascript and react appropriately.
-    if message_action == 'messageFromPalette':
-        arg1 = message_data.get('arg1', 'arg1 not sent')
-        arg2 = message_data.get('arg2', 'arg2 not sent')
-
-        msg = 'An event has been fired from the html to Fusion with the following data:<br/>'
-        msg += f'<b>Action</b>: {message_action}<br/><b>arg1</b>: {arg1}<br/><b>arg2</b>: {arg2}'               
-        ui.messageBox(msg)
+    # パレットを開いた時に、入力元が仮想ジョイスティックになっているかを返す
+    if message_action == 'paletteReady':
+        html_args.returnData = json.dumps({'backend': getattr(config, 'INPUT_BACKEND', 'pygame')})
+        return
 
     # Return value.
     now = datetime.now()
@@ -1,23 +1,153 @@
-function getDateString() {
-    const today = new Date();
-    const date = `${today.getDate()}/${today.getMonth() + 1}/${today.getFullYear()}`;
-    const time = `${today.getHours()}:${today.getMinutes()}:${today.getSeconds()}`;
-    return `Date: ${date}, Time: ${time}`;
-}
-
-function sendInfoToFusion() {
-    const args = {
-        arg1: document.getElementById("sampleData").value,
-        arg2: getDateString()
-    };
-
-    // Send the data to Fusion as a JSON string. The return value is a Promise.
-    adsk.fusionSendData("messageFromPalette", JSON.stringify(args)).then((result) =>
-        document.getElementById("returnValue").innerHTML = `${result}`
+// 仮想ジョイスティックの状態（module/PaletteInputSource.py が解析する）
+// axes: -1.0〜1.0（スティックの下と右が正。ジョイスティックと同じ向き）、buttons: ボタンのビットマスク、dpad: 十字キーのビットマスク
+const state = { axes: [0, 0, 0, 0], buttons: 0, dpad: 0 };
+
+// 押し続けている間に状態を送り直す間隔（ミリ秒）。アドインの INPUT_SOURCE_TIMEOUT より短くする
+const KEEP_ALIVE_INTERVAL = 100;
+
+let dirty = false;
+let frameRequested = false;
+let sending = false;
+
+function isNeutral() {
+    return state.buttons === 0 && state.dpad === 0 && state.axes.every((value) => value === 0);
+}
+
+// 状態の変化はアニメーションフレームごとにまとめ、送信中の場合は応答を待ってから最新の状態だけを送る
+function markDirty() {
+    dirty = true;
+    if (!frameRequested) {
+        frameRequested = true;
+        window.requestAnimationFrame(flush);
+    }
+}
+
+function flush() {
+    frameRequested = false;
+    if (!dirty || sending || typeof adsk === "undefined") {
+        return;
+    }
+    dirty = false;
+    sending = true;
+    adsk.fusionSendData("virtualJoystick", JSON.stringify(state)).then(
+        () => { sending = false; if (dirty) { markDirty(); } },
+        () => { sending = false; }
     );
+}
 
+function setupStick(stick) {
+    const knob = stick.querySelector(".knob");
+    const axisX = Number(stick.dataset.axisX);
+    const axisY = Number(stick.dataset.axisY);
+    let pointerId = null;
+
+    function move(event) {
+        const rect = stick.getBoundingClientRect();
+        const radius = rect.width / 2;
+        let x = (event.clientX - rect.left - radius) / radius;
+        let y = (event.clientY - rect.top - radius) / radius;
+        // 円の外は円周上に制限する
+        const length = Math.hypot(x, y);
+        if (length > 1) {
+            x /= length;
+            y /= length;
+        }
+        state.axes[axisX] = x;
+        state.axes[axisY] = y;
+        knob.style.transform = `translate(${x * radius}px, ${y * radius}px)`;
+        markDirty();
+    }
+
+    function release() {
+        pointerId = null;
+        state.axes[axisX] = 0;
+        state.axes[axisY] = 0;
+        knob.style.transform = "";
+        markDirty();
+    }
+
+    stick.addEventListener("pointerdown", (event) => {
+        pointerId = event.pointerId;
+        stick.setPointerCapture(pointerId);
+        move(event);
+    });
+    stick.addEventListener("pointermove", (event) => {
+        if (event.pointerId === pointerId) {
+            move(event);
+        }
+    });
+    stick.addEventListener("pointerup", release);
+    stick.addEventListener("pointercancel", release);
+    return release;
 }
 
+function setupButton(button, key, bit) {
+    function press(event) {
+        button.setPointerCapture(event.pointerId);
+        button.classList.add("pressed");
+        state[key] |= bit;
+        markDirty();
+    }
+
+    function release() {
+        button.classList.remove("pressed");
+        state[key] &= ~bit;
+        markDirty();
+    }
+
+    button.addEventListener("pointerdown", press);
+    button.addEventListener("pointerup", release);
+    button.addEventListener("pointercancel", release);
+    return release;
+}
+
+function setStatus(message, warning) {
+    const status = document.getElementById("status");
+    status.textContent = message;
+    status.className = warning ? "warning" : "";
+}
+
+// アドインの入力元を確認する（adsk はページの読み込み後に使えるようになる）
+function connect() {
+    if (typeof adsk === "undefined") {
+        window.setTimeout(connect, 500);
+        return;
+    }
+    adsk.fusionSendData("paletteReady", "{}").then((result) => {
+        try {
+            const backend = JSON.parse(result).backend;
+            if (backend === "palette") {
+                setStatus("仮想ジョイスティックでカメラを操作できます", false);
+            } else {
+                setStatus(`入力元が "${backend}" のため操作は反映されません（INPUT_BACKEND を "palette" にしてください）`, true);
+            }
+        } catch (e) {
+            setStatus(`${result}`, true);
+        }
+    });
+}
+
+window.addEventListener("load", () => {
+    const releases = [];
+    document.querySelectorAll(".stick").forEach((stick) => releases.push(setupStick(stick)));
+    document.querySelectorAll("[data-button]").forEach((button) =>
+        releases.push(setupButton(button, "buttons", 1 << Number(button.dataset.button))));
+    document.querySelectorAll("[data-dpad]").forEach((button) =>
+        releases.push(setupButton(button, "dpad", Number(button.dataset.dpad))));
+
+    // パレットからフォーカスが外れたらすべて離す（押したままにならないように）
+    window.addEventListener("blur", () => releases.forEach((release) => release()));
+
+    // 押し続けている間は同じ状態を送り直す（アドインは一定時間更新がない状態を入力なしとみなす）
+    window.setInterval(() => {
+        if (!isNeutral()) {
+            markDirty();
+        }
+    }, KEEP_ALIVE_INTERVAL);
+
+    connect();
+});
+
 function updateMessage(messageString) {
     // Message is sent from the add-in as a JSON string.
     const messageData = JSON.parse(messageString);
@@ -7,6 +7,7 @@ import threading
 from ...lib import fusionAddInUtils as futil
 from ... import config
 from ...module.JoystickManager import JoystickManager
+from ...module.ActionRegistry import action_registry
 from ...module.CameraController import CameraController
 
 # グローバル変数
@@ -184,7 +185,7 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
         
         if joysticks:
             for i, joystick in enumerate(joysticks):
-                is_selected = (i == config.SELECTED_JOYSTICK) if i < len(joysticks) else (i == 0)
+                is_selected = (i == joystick_manager.selected_index)
                 joystick_dropdown.listItems.add(joystick.get_name(), is_selected)
             
             axis_names = joystick_manager.get_axis_names()
@@ -236,25 +237,14 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
         
         if joysticks and joystick_manager.joystick:
             # ボタン数を取得
-            num_buttons = joystick_manager.joystick.get_numbuttons()
+            num_buttons = joystick_manager.get_button_count()
             
             # ボタン機能割り当て設定のヘッダー
             inputs.addTextBoxCommandInput('button_assignment_header', '', '<b>ボタン機能の割り当て</b>', 1, True)
             inputs.addTextBoxCommandInput('button_assignment_info', '', f'検出されたボタン数: {num_buttons}', 1, True)
             
-            # 利用可能な機能のリストを取得（config.pyと同じ形式に統一）
-            available_functions = getattr(config, 'AVAILABLE_FUNCTIONS', [
-                ("機能なし", "none"),
-                ("ホームビュー", "home_view"),
-                ("フィットビュー", "fit_view"),
-                ("ビューキューブ前面", "viewcube_front"),
-                ("ビューキューブ背面", "viewcube_back"),
-                ("ビューキューブ左面", "viewcube_left"),
-                ("ビューキューブ右面", "viewcube_right"),
-                ("ビューキューブ上面", "viewcube_top"),
-                ("ビューキューブ下面", "viewcube_bottom"),
-                ("アイソメトリックビュー", "iso_view")
-            ])
+            # 利用可能な機能のリストを取得
+            available_functions = action_registry.choices()
             
             # 最大10個のボタンまで設定可能
             max_buttons_to_show = min(num_buttons, 10)
@@ -317,7 +307,7 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
             dropdown.tooltip = f'{direction_name} に割り当てる機能を選択してください'
             
             # 利用可能な機能をドロップダウンに追加
-            for display_name, func_id in config.AVAILABLE_FUNCTIONS:
+            for display_name, func_id in action_registry.choices():
                 is_selected = (func_id == current_assignment)
                 dropdown.listItems.add(display_name, is_selected)
                 
@@ -345,6 +335,12 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     deadzone_slider.valueOne = config.DEAD_ZONE
     deadzone_slider.tooltip = '小さな入力を無視する範囲を設定します。手ぶれを防止するために使用します'
     
+    # 軸のキャリブレーション（静止状態のノイズから軸ごとのデッドゾーンを求める）
+    calibration_enabled = inputs.addBoolValueInput('calibration_enabled', 'キャリブレーション結果を使用', True, '', getattr(config, 'CALIBRATION_ENABLED', True))
+    calibration_enabled.tooltip = 'キャリブレーションしたコントローラーでは、デッドゾーンの代わりに軸ごとの推奨デッドゾーンを使用します'
+    calibrate_button = inputs.addBoolValueInput('calibrate_axes', '軸のキャリブレーションを実行', False, '', False)
+    calibrate_button.tooltip = 'OKを押した後、数秒間ジョイスティックに触れずに置いてください。中心のずれとノイズを記録します'
+    
     # 更新頻度の設定（FPSで表示）
     min_fps = 10  # 最小FPS
     max_fps = 100 # 最大FPS
@@ -447,6 +443,10 @@ def command_execute(args: adsk.core.CommandEventArgs):
         config.DEAD_ZONE = deadzone_slider.valueOne
         futil.log(f'デッドゾーンを更新: {old_value} -> {config.DEAD_ZONE}')
     
+    calibration_enabled = inputs.itemById('calibration_enabled')
+    if calibration_enabled:
+        config.CALIBRATION_ENABLED = calibration_enabled.value
+    
     # 更新間隔（FPSから秒に変換）
     fps_slider = inputs.itemById('fps_slider')
     if fps_slider:
@@ -475,6 +475,8 @@ def command_execute(args: adsk.core.CommandEventArgs):
         # 選択されたジョイスティック（コントローラー）のインデックスを保存
         if joystick_dropdown.selectedItem and joystick_dropdown.selectedItem.name != 'コントローラーが見つかりません':
             config.SELECTED_JOYSTICK = joystick_dropdown.selectedItem.index
+            # 接続順が変わっても同じデバイスを使用できるようにGUIDも保存する
+            config.SELECTED_JOYSTICK_GUID = JoystickManager().device_key_at(config.SELECTED_JOYSTICK)
             
         # X軸とY軸の設定を保存
         axis_x_dropdown = inputs.itemById('axis_x_selection')
@@ -521,19 +523,8 @@ def command_execute(args: adsk.core.CommandEventArgs):
         # ボタン機能の割り当て設定を更新
         new_button_assignments = {}
         
-        # 利用可能な機能のリストを取得（config.pyと統一）
-        available_functions = getattr(config, 'AVAILABLE_FUNCTIONS', [
-            ("機能なし", "none"),
-            ("ホームビュー", "home_view"),
-            ("フィットビュー", "fit_view"),
-            ("ビューキューブ前面", "viewcube_front"),
-            ("ビューキューブ背面", "viewcube_back"),
-            ("ビューキューブ左面", "viewcube_left"),
-            ("ビューキューブ右面", "viewcube_right"),
-            ("ビューキューブ上面", "viewcube_top"),
-            ("ビューキューブ下面", "viewcube_bottom"),
-            ("アイソメトリックビュー", "iso_view")
-        ])
+        # 利用可能な機能のリストを取得
+        available_functions = action_registry.choices()
         
         # 最大10個のボタンの設定を確認
         for i in range(10):
@@ -629,6 +620,18 @@ def command_execute(args: adsk.core.CommandEventArgs):
         # 設定をファイルに保存（メッセージボックスなし）
         if not config.save_settings():
             ui.messageBox('設定の保存に失敗しました。')
+        
+        # キャリブレーションボタンがオンになっていたら入力スレッドで静止状態を記録する（結果は記録後に保存される）
+        calibrate_button = inputs.itemById('calibrate_axes')
+        if calibrate_button and calibrate_button.value:
+            from ...module.JoystickAddIn import JoystickAddIn
+            joystick_thread = JoystickAddIn().joystick_thread
+            if joystick_thread and joystick_thread.is_alive():
+                joystick_thread.request_calibration()
+                ui.messageBox(f'{config.CALIBRATION_DURATION:.0f}秒間、ジョイスティックに触れずに置いてください。\n'
+                              '記録が終わると軸ごとのデッドゾーンが保存されます。', '軸のキャリブレーション')
+            else:
+                ui.messageBox('ジョイスティックが動作していないため、キャリブレーションできません。', '軸のキャリブレーション')
     except Exception as e:
         futil.log(f'エラー: {str(e)}', adsk.core.LogLevels.ErrorLogLevel)
         ui.messageBox(f'エラーが発生しました: {str(e)}')
@@ -736,7 +739,7 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
             # 選択されたコントローラーを設定
             joysticks = joystick_manager.get_joysticks()
             if joysticks and selected_index < len(joysticks):
-                joystick_manager.joystick = joysticks[selected_index]
+                joystick_manager.select_device(selected_index)
                 
                 # 軸の選択肢を更新
                 axis_names = joystick_manager.get_axis_names()
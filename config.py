@@ -6,6 +6,8 @@ import os
 import json
 import adsk.core
 from .lib import fusionAddInUtils as futil
+from .module.ActionRegistry import action_registry
+from .lib.cameraUtils.camera_transition import EASING_FUNCTIONS
 
 # Flag that indicates to run in Debug mode or not. When running in Debug mode
 # more information is written to the Text Command window. Generally, it's useful
@@ -29,13 +31,62 @@ ROTATION_SCALE = 0.008  # 回転感度（低めの値で設定）
 DEAD_ZONE = 0.15        # デッドゾーン（少し大きめに設定して小さな入力を無視）
 UPDATE_RATE = 0.032     # カメラ更新間隔（秒）、~30 FPS（遅めに設定して安定性を高める）
 SELECTED_JOYSTICK = 0   # 選択されたジョイスティック（コントローラー）のインデックス
+SELECTED_JOYSTICK_GUID = ""  # 選択されたジョイスティックのGUID（接続順が変わっても同じデバイスを選択する。空の場合はインデックスを使用）
 AXIS_X = 0              # X軸として使用するジョイスティック軸のインデックス
 AXIS_Y = 1              # Y軸として使用するジョイスティック軸のインデックス
+# 軸とカメラ操作の対応付け（空の場合は AXIS_X で水平回転、AXIS_Y で垂直回転）
+# dof: 'yaw'（水平回転）、'pitch'（垂直回転）、'roll'（視線軸周りの回転）、'pan_x'/'pan_y'（左右/上下移動）、'dolly'（前後移動）
+# trigger: アナログトリガー（離した状態が -1.0）の場合は True
+# device: 軸を読み取るジョイスティックのGUIDまたはインデックス（MULTI_DEVICE_ENABLED の場合のみ有効、省略時は選択されたジョイスティック）
+AXIS_MAPPINGS = [
+    # {"axis": 0, "dof": "yaw", "scale": 1.0, "curve": 1.0},
+    # {"axis": 1, "dof": "pitch", "scale": 1.0, "curve": 1.0},
+    # {"axis": 2, "dof": "pan_x", "scale": 0.5, "curve": 1.5},
+    # {"axis": 3, "dof": "pan_y", "scale": 0.5, "curve": 1.5, "invert": True},
+    # {"axis": 4, "dof": "dolly", "scale": -1.0, "trigger": True},
+    # {"axis": 5, "dof": "dolly", "scale": 1.0, "trigger": True},
+    # {"axis": 2, "dof": "dolly", "scale": 1.0, "device": 1},    # 2台目のデバイス（ペダルなど）で前後移動
+]
+MULTI_DEVICE_ENABLED = False  # 複数のジョイスティックを同時に使用するかどうか（AXIS_MAPPINGS の device で指定）
+# 軸のキャリブレーション結果（GUID → 軸ごとの offset、noise、std、dead_zone、outer）。設定画面のキャリブレーションで記録する
+# キャリブレーションしたデバイスでは DEAD_ZONE の代わりに軸ごとの推奨デッドゾーンを使用する
+AXIS_CALIBRATIONS = {}
+CALIBRATION_ENABLED = True    # キャリブレーション結果を適用するかどうか
+CALIBRATION_DURATION = 3.0    # キャリブレーションで静止状態を記録する時間（秒）
+CALIBRATION_MARGIN = 1.25     # 記録したノイズに掛ける余裕（推奨デッドゾーン = ノイズ × 余裕）
+INPUT_PIPELINE_TIMING = False # 入力処理の段ごとの処理時間を計測してログに出力するかどうか
+INPUT_BACKEND = 'pygame'     # 入力元（'pygame': アドイン内で読み取る、'process': 別のプロセスで読み取り共有メモリで受け取る、'udp': ローカルのUDPポートで受け取る、'palette': パレットの仮想ジョイスティック）
+INPUT_HELPER_PYTHON = ""     # 補助プロセスを実行するPythonのパス（空の場合は自動で探す）
+INPUT_HELPER_RATE = 250.0    # 補助プロセスがジョイスティックを読み取る頻度（Hz）
+INPUT_SOURCE_TIMEOUT = 0.5   # 入力元の状態がこの秒数以上更新されなければ入力なしとする
+UDP_INPUT_HOST = '127.0.0.1' # UDPの入力を待ち受けるアドレス（他のPCから受け取る場合は '0.0.0.0'）
+UDP_INPUT_PORT = 50515       # UDPの入力を待ち受けるポート
+UDP_INPUT_RESET_INTERVAL = 1.0  # この秒数以上受信がなければ送信側が起動し直したとみなしてシーケンス番号を比較しない
 RESPONSE_CURVE = 1.0    # ジョイスティック反応曲線（1.0は線形、2.0は二乗カーブ、0.5は平方根カーブ）
 USE_Z_AXIS_ROTATION = False  # Z軸回転モードを使用するかどうか（新しい操作パターン）
 SHOW_WELCOME_MESSAGE = False  # 起動時のウェルカムメッセージを表示するかどうか
 AUTO_RESET_ENABLED = False    # 定期的な自動リセットを有効にするかどうか
 AUTO_RESET_INTERVAL = 60      # 自動リセットの間隔（分）
+ROTATION_EPSILON = 0.0005     # カメラに書き込む最小回転角（ラジアン）。これ未満の回転は蓄積してまとめて書き込む
+ROTATION_EPSILON_PIXELS = 0.5 # 0より大きい場合、画面上でこのピクセル数に相当する角度をビューポートサイズと画角から求めて閾値にする（移動の閾値にも使用）
+TRANSLATION_EPSILON = 0.0005  # カメラに書き込む最小の移動量（注視点までの距離に対する割合）。これ未満の平行移動と前後移動は蓄積してまとめて書き込む
+ACTION_COALESCE_WINDOW = 0.15 # 続けて押された回転ボタンを1回の回転にまとめるまでの待ち時間（秒）
+INPUT_STALE_HORIZON = 0.25    # これより古いジョイスティック入力と繰り返しは適用しない（秒）
+BUTTON_STALE_HORIZON = 1.0    # これより古いボタンの押下は実行しない（秒）
+MAX_FRAME_ROTATION = 0.05     # 1回の書き込みで回転する最大の角度（ラジアン）。0の場合は制限しない
+MAX_FRAME_TRANSLATION = 0.05  # 1回の書き込みの最大の平行移動量と前後移動量（注視点までの距離に対する割合）。0の場合は制限しない
+
+# 入力の予測設定（入力の取得から画面に反映されるまでの遅延の分だけ先の入力値を外挿する）
+PREDICTION_ENABLED = False       # 入力の予測を使用するかどうか
+PREDICTION_HISTORY = 4           # 速度を求めるのに使用する入力値の数
+PREDICTION_MAX_HORIZON = 0.1     # 外挿する最大の時間（秒）
+PREDICTION_MAX_DELTA = 0.3       # 予測で加える入力値の変化量の上限
+PREDICTION_EXTRA_LATENCY = 0.0   # 実測できない遅延（描画など）として加える時間（秒）
+# 前回のカメラ更新以降のすべての入力値を時間で重み付けして積分する（入力とカメラの更新間隔を変えても操作感が変わらない）
+MOTION_INTEGRATION_ENABLED = True
+MOTION_REFERENCE_INTERVAL = 0.032  # 積分した操作量をこの時間あたりの操作量に換算する（秒）。この間隔の更新で従来と同じ操作量になる
+TRANSITION_DURATION = 0.25    # ビュー遷移アニメーションの時間（秒）。0の場合はFusionの滑らかな遷移を使用
+TRANSITION_EASING = 'ease_in_out'  # ビュー遷移アニメーションのイージング（'linear'、'ease_in_out'、'ease_out'）
 
 # ボタン機能の割り当て設定
 BUTTON_ASSIGNMENTS = {
@@ -57,41 +108,44 @@ DPAD_ASSIGNMENTS = {
 }
 DPAD_ENABLED = True      # 十字キー機能を有効にするかどうか
 
+# 長押し・ダブルタップ・同時押しの割り当て設定
+# キーの形式: "3:long"（ボタン3の長押し）、"dpad_up:double"（十字キー上のダブルタップ）、"L1+A"（同時押し）
+# 入力名にはボタン番号、十字キーの方向、または BUTTON_NAMES に登録した名前を使用できる
+GESTURE_ASSIGNMENTS = {
+    # "6:long": "fit_view",          # ボタン6の長押し
+    # "1+2": "iso_view",             # ボタン1とボタン2の同時押し
+}
+BUTTON_NAMES = {
+    # "A": 0,                        # ボタン名 → ボタン番号
+    # "L1": 4,
+}
+LONG_PRESS_TIME = 0.5    # 長押しと判定するまでの時間（秒）
+DOUBLE_TAP_WINDOW = 0.3  # ダブルタップと判定する2回目のタップまでの時間（秒）
+CHORD_WINDOW = 0.08      # 同時押しと判定するボタンの押下の時間差（秒）
+
+# 押し続けた時の繰り返し設定（相対回転の機能のみ）
+AUTO_REPEAT_ENABLED = True       # 押し続けた時に繰り返すかどうか
+AUTO_REPEAT_DELAY = 0.5          # 繰り返しを開始するまでの時間（秒）
+AUTO_REPEAT_RATE = 4.0           # 繰り返しの開始時の速さ（回/秒）
+AUTO_REPEAT_ACCELERATION = 2.0   # 押し続けた時間あたりの繰り返しの加速（回/秒²）
+AUTO_REPEAT_MAX_RATE = 10.0      # 繰り返しの最大の速さ（回/秒）
+
 # 古い設定との互換性のために保持（内部的には使用されない）
 HOME_VIEW_BUTTON = 0     # 旧形式の設定との互換性用
 
-# 利用可能な機能リスト（ボタンに割り当て可能な機能）
-AVAILABLE_FUNCTIONS = [
-    ("機能なし", "none"),
-    ("ホームビュー", "home_view"),  
-    ("フィットビュー", "fit_view"),
-    ("最寄りのビューキューブ面", "nearest_viewcube"),
-    ("ビューキューブ前面", "viewcube_front"),
-    ("ビューキューブ背面", "viewcube_back"),
-    ("ビューキューブ左面", "viewcube_left"),
-    ("ビューキューブ右面", "viewcube_right"),
-    ("ビューキューブ上面", "viewcube_top"),
-    ("ビューキューブ下面", "viewcube_bottom"),
-    ("アイソメトリックビュー", "iso_view"),
-    ("画面右回転90度", "rotate_screen_right"),
-    ("画面左回転90度", "rotate_screen_left"),
-    ("スマート右回転90度", "smart_rotate_right"),
-    ("スマート左回転90度", "smart_rotate_left"),
-    ("画面上回転90度", "rotate_screen_up"),
-    ("画面下回転90度", "rotate_screen_down"),
-    ("スマート上回転90度", "smart_rotate_up"),
-    ("スマート下回転90度", "smart_rotate_down"),
-    ("画面垂直時計回り90度", "rotate_screen_clockwise"),
-    ("画面垂直反時計回り90度", "rotate_screen_counter_clockwise"),
-    ("スマート垂直時計回り90度", "smart_rotate_clockwise"),
-    ("スマート垂直反時計回り90度", "smart_rotate_counter_clockwise"),
-]
+# 利用可能な機能（ボタンに割り当て可能な機能）は module/ActionRegistry.py の action_registry に登録されている
+# 旧形式の AVAILABLE_FUNCTIONS は __getattr__ で action_registry.choices() を返す
+
+# 設定を保存・読み込みするたびに増える世代番号（ボタン割り当ての再解決に使用）
+SETTINGS_GENERATION = 0
 
 # 設定ファイルのパス
 SETTINGS_FILE_PATH = os.path.join(os.path.dirname(__file__), 'joystick_settings.json')
 
 # 設定を保存する関数
 def save_settings():
+    global SETTINGS_GENERATION
+    SETTINGS_GENERATION += 1
     try:
         # 数値型で直接保存する
         settings = {
@@ -100,17 +154,59 @@ def save_settings():
             'DEAD_ZONE': float(DEAD_ZONE),  # 明示的に数値型で保存
             'UPDATE_RATE': float(UPDATE_RATE),  # 明示的に数値型で保存
             'SELECTED_JOYSTICK': int(SELECTED_JOYSTICK),  # 確実に整数として保存
+            'SELECTED_JOYSTICK_GUID': str(SELECTED_JOYSTICK_GUID),  # 選択されたジョイスティックのGUID
             'AXIS_X': int(AXIS_X),  # X軸のインデックス
             'AXIS_Y': int(AXIS_Y),  # Y軸のインデックス
+            'AXIS_MAPPINGS': [dict(mapping) for mapping in AXIS_MAPPINGS],  # 軸とカメラ操作の対応付け
+            'MULTI_DEVICE_ENABLED': bool(MULTI_DEVICE_ENABLED),  # 複数デバイスの同時使用
+            'AXIS_CALIBRATIONS': {key: [dict(entry) for entry in entries] for key, entries in AXIS_CALIBRATIONS.items()},  # 軸のキャリブレーション結果
+            'CALIBRATION_ENABLED': bool(CALIBRATION_ENABLED),  # キャリブレーション結果の適用
+            'CALIBRATION_DURATION': float(CALIBRATION_DURATION),  # 静止状態を記録する時間（秒）
+            'CALIBRATION_MARGIN': float(CALIBRATION_MARGIN),  # ノイズに掛ける余裕
+            'INPUT_PIPELINE_TIMING': bool(INPUT_PIPELINE_TIMING),  # 入力処理の段ごとの処理時間の計測
+            'INPUT_BACKEND': str(INPUT_BACKEND),  # 入力元
+            'INPUT_HELPER_PYTHON': str(INPUT_HELPER_PYTHON),  # 補助プロセスを実行するPython
+            'INPUT_HELPER_RATE': float(INPUT_HELPER_RATE),  # 補助プロセスの読み取り頻度
+            'INPUT_SOURCE_TIMEOUT': float(INPUT_SOURCE_TIMEOUT),  # 入力元の状態の有効期間（秒）
+            'UDP_INPUT_HOST': str(UDP_INPUT_HOST),  # UDPの入力を待ち受けるアドレス
+            'UDP_INPUT_PORT': int(UDP_INPUT_PORT),  # UDPの入力を待ち受けるポート
+            'UDP_INPUT_RESET_INTERVAL': float(UDP_INPUT_RESET_INTERVAL),  # シーケンス番号をリセットするまでの時間
             'RESPONSE_CURVE': float(RESPONSE_CURVE),  # 反応曲線設定も数値型で保存
             'USE_Z_AXIS_ROTATION': bool(USE_Z_AXIS_ROTATION),  # Z軸回転モードの設定
             'SHOW_WELCOME_MESSAGE': bool(SHOW_WELCOME_MESSAGE),  # ウェルカムメッセージの表示設定
             'AUTO_RESET_ENABLED': bool(AUTO_RESET_ENABLED),  # 自動リセットの有効/無効
             'AUTO_RESET_INTERVAL': int(AUTO_RESET_INTERVAL),  # 自動リセットの間隔（分）
+            'ROTATION_EPSILON': float(ROTATION_EPSILON),  # カメラ書き込みの最小回転角（ラジアン）
+            'ROTATION_EPSILON_PIXELS': float(ROTATION_EPSILON_PIXELS),  # 最小回転角を画面上のピクセル数で指定
+            'TRANSLATION_EPSILON': float(TRANSLATION_EPSILON),  # カメラ書き込みの最小移動量（距離に対する割合）
+            'ACTION_COALESCE_WINDOW': float(ACTION_COALESCE_WINDOW),  # 回転ボタンをまとめる待ち時間（秒）
+            'INPUT_STALE_HORIZON': float(INPUT_STALE_HORIZON),  # 古いジョイスティック入力を破棄する時間（秒）
+            'BUTTON_STALE_HORIZON': float(BUTTON_STALE_HORIZON),  # 古いボタンの押下を破棄する時間（秒）
+            'MAX_FRAME_ROTATION': float(MAX_FRAME_ROTATION),  # 1回の書き込みの最大回転角（ラジアン）
+            'MAX_FRAME_TRANSLATION': float(MAX_FRAME_TRANSLATION),  # 1回の書き込みの最大移動量（距離に対する割合）
+            'PREDICTION_ENABLED': bool(PREDICTION_ENABLED),  # 入力の予測の有効/無効
+            'PREDICTION_HISTORY': int(PREDICTION_HISTORY),  # 速度を求める入力値の数
+            'PREDICTION_MAX_HORIZON': float(PREDICTION_MAX_HORIZON),  # 外挿する最大の時間（秒）
+            'PREDICTION_MAX_DELTA': float(PREDICTION_MAX_DELTA),  # 予測で加える変化量の上限
+            'PREDICTION_EXTRA_LATENCY': float(PREDICTION_EXTRA_LATENCY),  # 追加の遅延（秒）
+            'MOTION_INTEGRATION_ENABLED': bool(MOTION_INTEGRATION_ENABLED),  # 入力値の積分の有効/無効
+            'MOTION_REFERENCE_INTERVAL': float(MOTION_REFERENCE_INTERVAL),  # 積分した操作量の換算の基準時間（秒）
+            'TRANSITION_DURATION': float(TRANSITION_DURATION),  # ビュー遷移アニメーションの時間（秒）
+            'TRANSITION_EASING': str(TRANSITION_EASING),  # ビュー遷移アニメーションのイージング
             'BUTTON_ASSIGNMENTS': dict(BUTTON_ASSIGNMENTS),  # ボタン機能の割り当て設定
             'BUTTON_ENABLED': bool(BUTTON_ENABLED),  # ボタン機能の有効/無効
             'DPAD_ASSIGNMENTS': dict(DPAD_ASSIGNMENTS),  # 十字キー機能の割り当て設定
-            'DPAD_ENABLED': bool(DPAD_ENABLED)  # 十字キー機能の有効/無効
+            'DPAD_ENABLED': bool(DPAD_ENABLED),  # 十字キー機能の有効/無効
+            'GESTURE_ASSIGNMENTS': dict(GESTURE_ASSIGNMENTS),  # 長押し・ダブルタップ・同時押しの割り当て設定
+            'BUTTON_NAMES': dict(BUTTON_NAMES),  # ボタン名とボタン番号の対応
+            'LONG_PRESS_TIME': float(LONG_PRESS_TIME),  # 長押しと判定するまでの時間（秒）
+            'DOUBLE_TAP_WINDOW': float(DOUBLE_TAP_WINDOW),  # ダブルタップの待ち時間（秒）
+            'CHORD_WINDOW': float(CHORD_WINDOW),  # 同時押しの時間差（秒）
+            'AUTO_REPEAT_ENABLED': bool(AUTO_REPEAT_ENABLED),  # 押し続けた時の繰り返しの有効/無効
+            'AUTO_REPEAT_DELAY': float(AUTO_REPEAT_DELAY),  # 繰り返しを開始するまでの時間（秒）
+            'AUTO_REPEAT_RATE': float(AUTO_REPEAT_RATE),  # 繰り返しの開始時の速さ（回/秒）
+            'AUTO_REPEAT_ACCELERATION': float(AUTO_REPEAT_ACCELERATION),  # 繰り返しの加速（回/秒²）
+            'AUTO_REPEAT_MAX_RATE': float(AUTO_REPEAT_MAX_RATE)  # 繰り返しの最大の速さ（回/秒）
         }
         
         # 設定ファイルのディレクトリが存在するか確認し、存在しなければ作成
@@ -131,7 +227,8 @@ def save_settings():
 
 # 設定を読み込む関数
 def load_settings():
-    global DEBUG, LOG_LEVEL, ROTATION_SCALE, DEAD_ZONE, UPDATE_RATE, SELECTED_JOYSTICK, AXIS_X, AXIS_Y, RESPONSE_CURVE, USE_Z_AXIS_ROTATION, SHOW_WELCOME_MESSAGE, AUTO_RESET_ENABLED, AUTO_RESET_INTERVAL, BUTTON_ASSIGNMENTS, BUTTON_ENABLED, DPAD_ASSIGNMENTS, DPAD_ENABLED
+    global DEBUG, LOG_LEVEL, ROTATION_SCALE, DEAD_ZONE, UPDATE_RATE, SELECTED_JOYSTICK, SELECTED_JOYSTICK_GUID, AXIS_X, AXIS_Y, AXIS_MAPPINGS, MULTI_DEVICE_ENABLED, AXIS_CALIBRATIONS, CALIBRATION_ENABLED, CALIBRATION_DURATION, CALIBRATION_MARGIN, INPUT_PIPELINE_TIMING, INPUT_BACKEND, INPUT_HELPER_PYTHON, INPUT_HELPER_RATE, INPUT_SOURCE_TIMEOUT, UDP_INPUT_HOST, UDP_INPUT_PORT, UDP_INPUT_RESET_INTERVAL, RESPONSE_CURVE, USE_Z_AXIS_ROTATION, SHOW_WELCOME_MESSAGE, AUTO_RESET_ENABLED, AUTO_RESET_INTERVAL, ROTATION_EPSILON, ROTATION_EPSILON_PIXELS, TRANSLATION_EPSILON, ACTION_COALESCE_WINDOW, INPUT_STALE_HORIZON, BUTTON_STALE_HORIZON, MAX_FRAME_ROTATION, MAX_FRAME_TRANSLATION, PREDICTION_ENABLED, PREDICTION_HISTORY, PREDICTION_MAX_HORIZON, PREDICTION_MAX_DELTA, PREDICTION_EXTRA_LATENCY, MOTION_INTEGRATION_ENABLED, MOTION_REFERENCE_INTERVAL, TRANSITION_DURATION, TRANSITION_EASING, BUTTON_ASSIGNMENTS, BUTTON_ENABLED, DPAD_ASSIGNMENTS, DPAD_ENABLED, GESTURE_ASSIGNMENTS, BUTTON_NAMES, LONG_PRESS_TIME, DOUBLE_TAP_WINDOW, CHORD_WINDOW, AUTO_REPEAT_ENABLED, AUTO_REPEAT_DELAY, AUTO_REPEAT_RATE, AUTO_REPEAT_ACCELERATION, AUTO_REPEAT_MAX_RATE, SETTINGS_GENERATION
+    SETTINGS_GENERATION += 1
     
     try:
         if os.path.exists(SETTINGS_FILE_PATH):
@@ -189,8 +286,9 @@ def load_settings():
             
             try:
                 SELECTED_JOYSTICK = int(settings.get('SELECTED_JOYSTICK', SELECTED_JOYSTICK))
+                SELECTED_JOYSTICK_GUID = str(settings.get('SELECTED_JOYSTICK_GUID', SELECTED_JOYSTICK_GUID) or "")
                 if 'futil' in globals():
-                    futil.log(f'選択ジョイスティックを読み込みました: {SELECTED_JOYSTICK}')
+                    futil.log(f'選択ジョイスティックを読み込みました: {SELECTED_JOYSTICK} (GUID: {SELECTED_JOYSTICK_GUID})')
             except (ValueError, TypeError):
                 if 'futil' in globals():
                     futil.log('選択ジョイスティックの値が無効です。デフォルト値を使用します。', adsk.core.LogLevels.WarningLogLevel)
@@ -204,7 +302,49 @@ def load_settings():
             except (ValueError, TypeError):
                 if 'futil' in globals():
                     futil.log('軸設定の値が無効です。デフォルト値を使用します。', adsk.core.LogLevels.WarningLogLevel)
-                    
+            
+            # 軸とカメラ操作の対応付けを読み込む（項目ごとの検証は入力スレッドで行う）
+            axis_mappings_data = settings.get('AXIS_MAPPINGS', [])
+            if isinstance(axis_mappings_data, list):
+                AXIS_MAPPINGS = [dict(mapping) for mapping in axis_mappings_data if isinstance(mapping, dict)]
+                if 'futil' in globals():
+                    futil.log(f'軸の割り当てを読み込みました: {len(AXIS_MAPPINGS)}件')
+            else:
+                if 'futil' in globals():
+                    futil.log('軸の割り当ての形式が無効です。デフォルト値を使用します。', adsk.core.LogLevels.WarningLogLevel)
+            MULTI_DEVICE_ENABLED = bool(settings.get('MULTI_DEVICE_ENABLED', MULTI_DEVICE_ENABLED))
+            
+            # 軸のキャリブレーション結果を読み込む
+            try:
+                calibrations_data = settings.get('AXIS_CALIBRATIONS', {})
+                if isinstance(calibrations_data, dict):
+                    AXIS_CALIBRATIONS = {str(key): [dict(entry) for entry in entries if isinstance(entry, dict)]
+                                         for key, entries in calibrations_data.items() if isinstance(entries, list)}
+                CALIBRATION_ENABLED = bool(settings.get('CALIBRATION_ENABLED', CALIBRATION_ENABLED))
+                CALIBRATION_DURATION = max(0.5, float(settings.get('CALIBRATION_DURATION', CALIBRATION_DURATION)))
+                CALIBRATION_MARGIN = max(1.0, float(settings.get('CALIBRATION_MARGIN', CALIBRATION_MARGIN)))
+                INPUT_PIPELINE_TIMING = bool(settings.get('INPUT_PIPELINE_TIMING', INPUT_PIPELINE_TIMING))
+                if 'futil' in globals():
+                    futil.log(f'軸のキャリブレーション結果を読み込みました: {len(AXIS_CALIBRATIONS)}台')
+            except Exception as e:
+                if 'futil' in globals():
+                    futil.log(f'軸のキャリブレーション結果の読み込みに失敗しました: {str(e)}', adsk.core.LogLevels.WarningLogLevel)
+
+            # 入力元の設定を読み込む
+            try:
+                INPUT_BACKEND = str(settings.get('INPUT_BACKEND', INPUT_BACKEND))
+                INPUT_HELPER_PYTHON = str(settings.get('INPUT_HELPER_PYTHON', INPUT_HELPER_PYTHON))
+                INPUT_HELPER_RATE = min(1000.0, max(10.0, float(settings.get('INPUT_HELPER_RATE', INPUT_HELPER_RATE))))
+                INPUT_SOURCE_TIMEOUT = max(0.05, float(settings.get('INPUT_SOURCE_TIMEOUT', INPUT_SOURCE_TIMEOUT)))
+                UDP_INPUT_HOST = str(settings.get('UDP_INPUT_HOST', UDP_INPUT_HOST))
+                UDP_INPUT_PORT = min(65535, max(0, int(settings.get('UDP_INPUT_PORT', UDP_INPUT_PORT))))
+                UDP_INPUT_RESET_INTERVAL = max(0.0, float(settings.get('UDP_INPUT_RESET_INTERVAL', UDP_INPUT_RESET_INTERVAL)))
+                if 'futil' in globals():
+                    futil.log(f'入力元: {INPUT_BACKEND}')
+            except Exception as e:
+                if 'futil' in globals():
+                    futil.log(f'入力元の設定の読み込みに失敗しました: {str(e)}', adsk.core.LogLevels.WarningLogLevel)
+
             # 反応曲線の設定を読み込む
             try:
                 value = settings.get('RESPONSE_CURVE', None)
@@ -248,6 +388,75 @@ def load_settings():
                 if 'futil' in globals():
                     futil.log('自動リセット設定の値が無効です。デフォルト値を使用します。', adsk.core.LogLevels.WarningLogLevel)
             
+            # カメラ書き込みの最小回転角を読み込む
+            try:
+                ROTATION_EPSILON = float(settings.get('ROTATION_EPSILON', ROTATION_EPSILON))
+                ROTATION_EPSILON_PIXELS = float(settings.get('ROTATION_EPSILON_PIXELS', ROTATION_EPSILON_PIXELS))
+                TRANSLATION_EPSILON = max(0.0, float(settings.get('TRANSLATION_EPSILON', TRANSLATION_EPSILON)))
+                if 'futil' in globals():
+                    futil.log(f'最小回転角を読み込みました: {ROTATION_EPSILON}rad, {ROTATION_EPSILON_PIXELS}px, 最小移動量: {TRANSLATION_EPSILON}')
+            except (ValueError, TypeError):
+                if 'futil' in globals():
+                    futil.log('最小回転角の値が無効です。デフォルト値を使用します。', adsk.core.LogLevels.WarningLogLevel)
+            
+            # 回転ボタンをまとめる待ち時間を読み込む
+            try:
+                ACTION_COALESCE_WINDOW = max(0.0, float(settings.get('ACTION_COALESCE_WINDOW', ACTION_COALESCE_WINDOW)))
+                if 'futil' in globals():
+                    futil.log(f'回転ボタンをまとめる待ち時間を読み込みました: {ACTION_COALESCE_WINDOW}秒')
+            except (ValueError, TypeError):
+                if 'futil' in globals():
+                    futil.log('回転ボタンをまとめる待ち時間の値が無効です。デフォルト値を使用します。', adsk.core.LogLevels.WarningLogLevel)
+            
+            # 古い入力を破棄する時間と1回の書き込みの最大回転角を読み込む
+            try:
+                INPUT_STALE_HORIZON = max(0.01, float(settings.get('INPUT_STALE_HORIZON', INPUT_STALE_HORIZON)))
+                BUTTON_STALE_HORIZON = max(0.01, float(settings.get('BUTTON_STALE_HORIZON', BUTTON_STALE_HORIZON)))
+                MAX_FRAME_ROTATION = max(0.0, float(settings.get('MAX_FRAME_ROTATION', MAX_FRAME_ROTATION)))
+                MAX_FRAME_TRANSLATION = max(0.0, float(settings.get('MAX_FRAME_TRANSLATION', MAX_FRAME_TRANSLATION)))
+                if 'futil' in globals():
+                    futil.log(f'古い入力の破棄設定を読み込みました: ジョイスティック={INPUT_STALE_HORIZON}秒, ボタン={BUTTON_STALE_HORIZON}秒, 最大回転角={MAX_FRAME_ROTATION}, 最大移動量={MAX_FRAME_TRANSLATION}')
+            except (ValueError, TypeError):
+                if 'futil' in globals():
+                    futil.log('古い入力の破棄設定の値が無効です。デフォルト値を使用します。', adsk.core.LogLevels.WarningLogLevel)
+            
+            # 入力の予測設定を読み込む
+            try:
+                PREDICTION_ENABLED = bool(settings.get('PREDICTION_ENABLED', PREDICTION_ENABLED))
+                PREDICTION_HISTORY = max(2, int(settings.get('PREDICTION_HISTORY', PREDICTION_HISTORY)))
+                PREDICTION_MAX_HORIZON = max(0.0, float(settings.get('PREDICTION_MAX_HORIZON', PREDICTION_MAX_HORIZON)))
+                PREDICTION_MAX_DELTA = max(0.0, float(settings.get('PREDICTION_MAX_DELTA', PREDICTION_MAX_DELTA)))
+                PREDICTION_EXTRA_LATENCY = max(0.0, float(settings.get('PREDICTION_EXTRA_LATENCY', PREDICTION_EXTRA_LATENCY)))
+                if 'futil' in globals():
+                    futil.log(f'入力の予測設定を読み込みました: 有効={PREDICTION_ENABLED}, 履歴={PREDICTION_HISTORY}, 最大時間={PREDICTION_MAX_HORIZON}秒')
+            except (ValueError, TypeError):
+                if 'futil' in globals():
+                    futil.log('入力の予測設定の値が無効です。デフォルト値を使用します。', adsk.core.LogLevels.WarningLogLevel)
+
+            # 入力値の積分の設定を読み込む
+            try:
+                MOTION_INTEGRATION_ENABLED = bool(settings.get('MOTION_INTEGRATION_ENABLED', MOTION_INTEGRATION_ENABLED))
+                MOTION_REFERENCE_INTERVAL = max(0.001, float(settings.get('MOTION_REFERENCE_INTERVAL', MOTION_REFERENCE_INTERVAL)))
+                if 'futil' in globals():
+                    futil.log(f'入力値の積分設定を読み込みました: 有効={MOTION_INTEGRATION_ENABLED}, 基準時間={MOTION_REFERENCE_INTERVAL}秒')
+            except (ValueError, TypeError):
+                if 'futil' in globals():
+                    futil.log('入力値の積分設定の値が無効です。デフォルト値を使用します。', adsk.core.LogLevels.WarningLogLevel)
+
+            # ビュー遷移アニメーションの設定を読み込む
+            try:
+                TRANSITION_DURATION = max(0.0, float(settings.get('TRANSITION_DURATION', TRANSITION_DURATION)))
+                easing = str(settings.get('TRANSITION_EASING', TRANSITION_EASING))
+                if easing in EASING_FUNCTIONS:
+                    TRANSITION_EASING = easing
+                elif 'futil' in globals():
+                    futil.log(f'ビュー遷移のイージングが無効です: {easing}', adsk.core.LogLevels.WarningLogLevel)
+                if 'futil' in globals():
+                    futil.log(f'ビュー遷移の設定を読み込みました: 時間={TRANSITION_DURATION}秒, イージング={TRANSITION_EASING}')
+            except (ValueError, TypeError):
+                if 'futil' in globals():
+                    futil.log('ビュー遷移の設定の値が無効です。デフォルト値を使用します。', adsk.core.LogLevels.WarningLogLevel)
+            
             # ボタン設定を読み込む
             try:
                 # 新しいボタン設定方式の読み込み
@@ -256,19 +465,14 @@ def load_settings():
                     # 辞書の各キーを整数に変換し、値も正しい機能名に変換する
                     BUTTON_ASSIGNMENTS = {}
                     
-                    # 日本語表示名から機能名への変換マップ
-                    display_name_to_function = {display: func for display, func in AVAILABLE_FUNCTIONS}
-                    
                     for k, v in button_assignments_data.items():
                         button_index = int(k)
-                        # 値が既に正しい機能名の場合はそのまま使用
-                        if v in [func for _, func in AVAILABLE_FUNCTIONS]:
-                            BUTTON_ASSIGNMENTS[button_index] = v
-                        # 値が日本語表示名の場合は機能名に変換
-                        elif v in display_name_to_function:
-                            BUTTON_ASSIGNMENTS[button_index] = display_name_to_function[v]
-                            if 'futil' in globals():
-                                futil.log(f'ボタン{button_index}の設定を変換: {v} -> {display_name_to_function[v]}')
+                        # 値が機能名でも日本語表示名でも登録済みの機能名に変換する
+                        function_name = action_registry.function_name_for(v)
+                        if function_name is not None:
+                            BUTTON_ASSIGNMENTS[button_index] = function_name
+                            if function_name != v and 'futil' in globals():
+                                futil.log(f'ボタン{button_index}の設定を変換: {v} -> {function_name}')
                         else:
                             if 'futil' in globals():
                                 futil.log(f'ボタン{button_index}の設定が無効です: {v}', adsk.core.LogLevels.WarningLogLevel)
@@ -291,19 +495,14 @@ def load_settings():
             try:
                 dpad_assignments_data = settings.get('DPAD_ASSIGNMENTS', {})
                 if isinstance(dpad_assignments_data, dict):
-                    # 日本語表示名から機能名への変換辞書
-                    display_name_to_function = {display_name: func_name for display_name, func_name in AVAILABLE_FUNCTIONS}
-                    
                     DPAD_ASSIGNMENTS = {}
                     for direction, v in dpad_assignments_data.items():
-                        # 値が既に正しい機能名の場合はそのまま使用
-                        if v in [func for _, func in AVAILABLE_FUNCTIONS]:
-                            DPAD_ASSIGNMENTS[direction] = v
-                        # 値が日本語表示名の場合は機能名に変換
-                        elif v in display_name_to_function:
-                            DPAD_ASSIGNMENTS[direction] = display_name_to_function[v]
-                            if 'futil' in globals():
-                                futil.log(f'十字キー{direction}の設定を変換: {v} -> {display_name_to_function[v]}')
+                        # 値が機能名でも日本語表示名でも登録済みの機能名に変換する
+                        function_name = action_registry.function_name_for(v)
+                        if function_name is not None:
+                            DPAD_ASSIGNMENTS[direction] = function_name
+                            if function_name != v and 'futil' in globals():
+                                futil.log(f'十字キー{direction}の設定を変換: {v} -> {function_name}')
                         else:
                             if 'futil' in globals():
                                 futil.log(f'十字キー{direction}の設定が無効です: {v}', adsk.core.LogLevels.WarningLogLevel)
@@ -315,6 +514,45 @@ def load_settings():
                 if 'futil' in globals():
                     futil.log('十字キー設定の値が無効です。デフォルト値を使用します。', adsk.core.LogLevels.WarningLogLevel)
             
+            # 長押し・ダブルタップ・同時押しの設定の読み込み
+            try:
+                button_names_data = settings.get('BUTTON_NAMES', {})
+                if isinstance(button_names_data, dict):
+                    BUTTON_NAMES = {str(name): int(index) for name, index in button_names_data.items()}
+                
+                gesture_assignments_data = settings.get('GESTURE_ASSIGNMENTS', {})
+                if isinstance(gesture_assignments_data, dict):
+                    GESTURE_ASSIGNMENTS = {}
+                    for binding, v in gesture_assignments_data.items():
+                        function_name = action_registry.function_name_for(v)
+                        if function_name is not None:
+                            GESTURE_ASSIGNMENTS[str(binding)] = function_name
+                        else:
+                            if 'futil' in globals():
+                                futil.log(f'ジェスチャー{binding}の設定が無効です: {v}', adsk.core.LogLevels.WarningLogLevel)
+                
+                LONG_PRESS_TIME = max(0.05, float(settings.get('LONG_PRESS_TIME', LONG_PRESS_TIME)))
+                DOUBLE_TAP_WINDOW = max(0.05, float(settings.get('DOUBLE_TAP_WINDOW', DOUBLE_TAP_WINDOW)))
+                CHORD_WINDOW = max(0.0, float(settings.get('CHORD_WINDOW', CHORD_WINDOW)))
+                if 'futil' in globals():
+                    futil.log(f'ジェスチャー設定を読み込みました: 割り当て={GESTURE_ASSIGNMENTS}, 長押し={LONG_PRESS_TIME}秒, ダブルタップ={DOUBLE_TAP_WINDOW}秒, 同時押し={CHORD_WINDOW}秒')
+            except (ValueError, TypeError):
+                if 'futil' in globals():
+                    futil.log('ジェスチャー設定の値が無効です。デフォルト値を使用します。', adsk.core.LogLevels.WarningLogLevel)
+            
+            # 押し続けた時の繰り返し設定の読み込み
+            try:
+                AUTO_REPEAT_ENABLED = bool(settings.get('AUTO_REPEAT_ENABLED', AUTO_REPEAT_ENABLED))
+                AUTO_REPEAT_DELAY = max(0.0, float(settings.get('AUTO_REPEAT_DELAY', AUTO_REPEAT_DELAY)))
+                AUTO_REPEAT_RATE = max(0.1, float(settings.get('AUTO_REPEAT_RATE', AUTO_REPEAT_RATE)))
+                AUTO_REPEAT_ACCELERATION = max(0.0, float(settings.get('AUTO_REPEAT_ACCELERATION', AUTO_REPEAT_ACCELERATION)))
+                AUTO_REPEAT_MAX_RATE = max(AUTO_REPEAT_RATE, float(settings.get('AUTO_REPEAT_MAX_RATE', AUTO_REPEAT_MAX_RATE)))
+                if 'futil' in globals():
+                    futil.log(f'繰り返し設定を読み込みました: 有効={AUTO_REPEAT_ENABLED}, 開始={AUTO_REPEAT_DELAY}秒, 速さ={AUTO_REPEAT_RATE}〜{AUTO_REPEAT_MAX_RATE}回/秒')
+            except (ValueError, TypeError):
+                if 'futil' in globals():
+                    futil.log('繰り返し設定の値が無効です。デフォルト値を使用します。', adsk.core.LogLevels.WarningLogLevel)
+            
             # ログレベルの更新
             LOG_LEVEL = adsk.core.LogLevels.InfoLogLevel if DEBUG else adsk.core.LogLevels.WarningLogLevel
             
@@ -336,3 +574,10 @@ COMPANY_NAME = 'JoystickCamera'
 
 # Palettes
 sample_palette_id = f'{COMPANY_NAME}_{ADDIN_NAME}_palette_id'
+
+
+def __getattr__(name):
+    # 旧形式の機能リスト（他のスクリプトとの互換性用）
+    if name == 'AVAILABLE_FUNCTIONS':
+        return action_registry.choices()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
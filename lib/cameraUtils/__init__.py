@@ -6,5 +6,8 @@
 from .quaternion import Quaternion
 from .camera_utility import CameraUtility
 from .camera_rotations import CameraRotations
+from .camera_sequence import CameraSequencer
+from .camera_transition import CameraPose, CameraTransition, EASING_FUNCTIONS
+from .viewport_cache import ViewportCache, shared_viewport_cache
 
-__all__ = ['Quaternion', 'CameraUtility', 'CameraRotations']
\ No newline at end of file
+__all__ = ['Quaternion', 'CameraUtility', 'CameraRotations', 'CameraSequencer', 'CameraPose', 'CameraTransition', 'EASING_FUNCTIONS', 'ViewportCache', 'shared_viewport_cache']
\ No newline at end of file
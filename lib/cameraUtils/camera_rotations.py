@@ -8,10 +8,79 @@ import math
 from typing import Dict, Optional, Tuple
 from .camera_utility import CameraUtility
 from .quaternion import Quaternion
+from .camera_sequence import CameraSequencer
 
 # Fusionアプリケーション インスタンス
 app: adsk.core.Application = adsk.core.Application.get()
 
+# ViewCube面の方向（targetからeyeへの方向）と名前
+_FACE_DIRECTIONS: Tuple[Tuple[Tuple[float, float, float], str], ...] = (
+    ((0.0, -1.0, 0.0), "前面"),  # -Y方向
+    ((0.0, 1.0, 0.0), "背面"),   # +Y方向
+    ((-1.0, 0.0, 0.0), "左面"),  # -X方向
+    ((1.0, 0.0, 0.0), "右面"),   # +X方向
+    ((0.0, 0.0, 1.0), "上面"),   # +Z方向
+    ((0.0, 0.0, -1.0), "下面"),  # -Z方向
+)
+
+_AXIS_NAMES: Dict[Tuple[float, float, float], str] = {
+    (1.0, 0.0, 0.0): "+X", (-1.0, 0.0, 0.0): "-X",
+    (0.0, 1.0, 0.0): "+Y", (0.0, -1.0, 0.0): "-Y",
+    (0.0, 0.0, 1.0): "+Z", (0.0, 0.0, -1.0): "-Z",
+}
+
+
+def _build_snap_orientations() -> Tuple[Tuple[Tuple[float, float, float], Tuple[float, float, float], str], ...]:
+    """軸に揃った24通りのカメラの向き（視線方向×直交する上方向）を列挙する"""
+    orientations = []
+    for direction, face_name in _FACE_DIRECTIONS:
+        for up, _ in _FACE_DIRECTIONS:
+            if direction[0] * up[0] + direction[1] * up[1] + direction[2] * up[2] == 0.0:
+                orientations.append((direction, up, f"{face_name}（上方向 {_AXIS_NAMES[up]}）"))
+    return tuple(orientations)
+
+
+# 軸に揃った24通りのカメラの向き: (targetからeyeへの方向, 上方向, 名前)
+SNAP_ORIENTATIONS = _build_snap_orientations()
+
+
+def find_nearest_orientation(forward: Tuple[float, float, float], 
+                             up: Tuple[float, float, float]) -> Tuple[int, float]:
+    """視線方向と上方向の両方に最も近い軸に揃った向きを探す
+    
+    Parameters:
+        forward: targetからeyeへの単位ベクトル (x, y, z)
+        up: 上方向の単位ベクトル (x, y, z)
+        
+    Returns:
+        tuple: (SNAP_ORIENTATIONS のインデックス, 類似度（視線方向と上方向の内積の和、最大2.0）)
+    """
+    fx, fy, fz = forward
+    ux, uy, uz = up
+    best_index = 0
+    best_score = -3.0
+    for index, ((dx, dy, dz), (vx, vy, vz), _) in enumerate(SNAP_ORIENTATIONS):
+        score = fx * dx + fy * dy + fz * dz + ux * vx + uy * vy + uz * vz
+        if score > best_score:
+            best_score = score
+            best_index = index
+    return best_index, best_score
+
+
+def _normalize(vector: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    """タプルのベクトルを正規化する"""
+    x, y, z = vector
+    length = math.sqrt(x * x + y * y + z * z)
+    if length < 1e-12:
+        return vector
+    return (x / length, y / length, z / length)
+
+
+def _cross(a: Tuple[float, float, float], b: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    """タプルのベクトルの外積"""
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+
 class CameraRotations:
     """
     カメラ回転に関する高度な機能を提供するユーティリティクラス
@@ -23,29 +92,51 @@ class CameraRotations:
             camera_util: ベースのカメラユーティリティインスタンス
         """
         self.camera_util = camera_util
+        
+        # 複数ステップの操作をカメラ更新の周期に分けて実行する
+        self.sequencer = CameraSequencer(camera_util)
     
-    def _is_on_viewcube_face(self) -> bool:
-        """現在のカメラがViewCubeの標準面を向いているかをチェック
+    def _read_camera_frame(self, camera: adsk.core.Camera) -> Tuple[Tuple[float, float, float], float, Tuple[float, float, float], Tuple[float, float, float]]:
+        """カメラの注視点、距離、視線方向（targetからeye）、上方向を浮動小数点のタプルで取得する
         
-        Returns:
-            bool: 標準面を向いている場合はTrue、任意の向きの場合はFalse
+        ビュー遷移アニメーションの実行中は遷移の終了時の値を返す（続けて操作した場合に遷移先を基準にする）
         """
-        try:
-            viewport = app.activeViewport
-            if not viewport or not viewport.camera:
-                return False
-            
-            camera = viewport.camera
-            return camera.viewOrientation != adsk.core.ViewOrientations.ArbitraryViewOrientation
-            
-        except Exception as e:
-            self.camera_util.log(f'ViewCube面チェック中にエラーが発生しました: {str(e)}', adsk.core.LogLevels.ErrorLogLevel)
-            return False
+        transition_target = self.camera_util.get_transition_target()
+        if transition_target is not None:
+            eye_xyz, target_xyz, up_xyz = transition_target
+        else:
+            eye = camera.eye
+            target = camera.target
+            up = camera.upVector
+            self.camera_util.observe_camera(eye, target, up)
+            eye_xyz = (eye.x, eye.y, eye.z)
+            target_xyz = (target.x, target.y, target.z)
+            up_xyz = (up.x, up.y, up.z)
+        
+        offset = (eye_xyz[0] - target_xyz[0], eye_xyz[1] - target_xyz[1], eye_xyz[2] - target_xyz[2])
+        distance = math.sqrt(offset[0] * offset[0] + offset[1] * offset[1] + offset[2] * offset[2])
+        return target_xyz, distance, _normalize(offset), _normalize(up_xyz)
+    
+    def _apply_camera_frame(self, 
+                            target: Tuple[float, float, float], 
+                            distance: float, 
+                            forward: Tuple[float, float, float], 
+                            up: Tuple[float, float, float]) -> None:
+        """注視点を中心に、視線方向と上方向をカメラに1回のビュー遷移で適用する"""
+        new_eye = (
+            target[0] + forward[0] * distance,
+            target[1] + forward[1] * distance,
+            target[2] + forward[2] * distance
+        )
+        self.camera_util.animate_to(new_eye, target, up)
     
     def move_to_nearest_viewcube_face(self) -> None:
-        """現在のカメラ視点から最も近いViewCube面に移動する"""
+        """現在のカメラ視点から最も近いViewCube面に移動する
+        
+        視線方向だけでなく上方向（ロール）も最も近い軸に揃え、1回のトランジションで移動する
+        """
         try:
-            viewport = app.activeViewport
+            viewport = self.camera_util.get_viewport()
             if not viewport:
                 self.camera_util.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
                 return
@@ -55,65 +146,43 @@ class CameraRotations:
                 self.camera_util.log("No active camera found.", adsk.core.LogLevels.WarningLogLevel)
                 return
             
-            # 現在のviewOrientationを表示
-            current_orientation = camera.viewOrientation
-            orientation_names = {
-                adsk.core.ViewOrientations.ArbitraryViewOrientation: "任意の向き",
-                adsk.core.ViewOrientations.BackViewOrientation: "背面",
-                adsk.core.ViewOrientations.BottomViewOrientation: "下面", 
-                adsk.core.ViewOrientations.FrontViewOrientation: "前面",
-                adsk.core.ViewOrientations.IsoBottomLeftViewOrientation: "アイソ下左",
-                adsk.core.ViewOrientations.IsoBottomRightViewOrientation: "アイソ下右",
-                adsk.core.ViewOrientations.IsoTopLeftViewOrientation: "アイソ上左",
-                adsk.core.ViewOrientations.IsoTopRightViewOrientation: "アイソ上右",
-                adsk.core.ViewOrientations.LeftViewOrientation: "左面",
-                adsk.core.ViewOrientations.RightViewOrientation: "右面",
-                adsk.core.ViewOrientations.TopViewOrientation: "上面"
-            }
-            current_orientation_name = orientation_names.get(current_orientation, f"不明({current_orientation})")
-            self.camera_util.log(f"現在のviewOrientation: {current_orientation_name}({current_orientation})", adsk.core.LogLevels.InfoLogLevel)
-
-            # カメラの視線方向ベクトルを取得（eyeからtargetへの方向）
-            eye = camera.eye
-            target = camera.target
-            view_direction = target.vectorTo(eye)
-            view_direction.normalize()
-            
-            # 標準的なViewCube面の方向ベクトルを定義
-            viewcube_directions = {
-                adsk.core.ViewOrientations.FrontViewOrientation: adsk.core.Vector3D.create(0, -1, 0),  # 前面（-Y方向）
-                adsk.core.ViewOrientations.BackViewOrientation: adsk.core.Vector3D.create(0, 1, 0),   # 背面（+Y方向）
-                adsk.core.ViewOrientations.LeftViewOrientation: adsk.core.Vector3D.create(-1, 0, 0),  # 左面（-X方向）
-                adsk.core.ViewOrientations.RightViewOrientation: adsk.core.Vector3D.create(1, 0, 0),  # 右面（+X方向）
-                adsk.core.ViewOrientations.TopViewOrientation: adsk.core.Vector3D.create(0, 0, 1),    # 上面（+Z方向）
-                adsk.core.ViewOrientations.BottomViewOrientation: adsk.core.Vector3D.create(0, 0, -1) # 下面（-Z方向）
-            }
-            
-            # 現在の視線方向と各ViewCube面の方向との内積を計算して最も近い面を見つける
-            max_dot_product = -2.0  # 初期値は-2（内積の最小値-1より小さい値）
-            nearest_orientation = adsk.core.ViewOrientations.FrontViewOrientation  # デフォルト
-            
-            for orientation, direction in viewcube_directions.items():
-                dot_product = view_direction.dotProduct(direction)
-                if dot_product > max_dot_product:
-                    max_dot_product = dot_product
-                    nearest_orientation = orientation
+            target, distance, forward, up = self._read_camera_frame(camera)
+            index, score = find_nearest_orientation(forward, up)
+            snap_forward, snap_up, name = SNAP_ORIENTATIONS[index]
             
             # デバッグ情報をログ出力
-            selected_name = orientation_names.get(nearest_orientation, "不明")
-            self.camera_util.log(f"現在の視線方向: [{view_direction.x:.3f}, {view_direction.y:.3f}, {view_direction.z:.3f}]", adsk.core.LogLevels.InfoLogLevel)
-            self.camera_util.log(f"最寄りのViewCube面: {selected_name} (類似度: {max_dot_product:.3f})", adsk.core.LogLevels.InfoLogLevel)
+            self.camera_util.log(f"現在の視線方向: [{forward[0]:.3f}, {forward[1]:.3f}, {forward[2]:.3f}]", adsk.core.LogLevels.InfoLogLevel)
+            self.camera_util.log(f"最寄りのViewCube面: {name} (類似度: {score:.3f})", adsk.core.LogLevels.InfoLogLevel)
             
             # 最寄りの面に移動
-            self.camera_util.log(f"最寄りのViewCube面 '{selected_name}' に移動を実行します", adsk.core.LogLevels.InfoLogLevel)
-            self.camera_util.set_viewcube_orientation(nearest_orientation)
-            self.camera_util.log(f"ViewCube面 '{selected_name}' への移動が完了しました", adsk.core.LogLevels.InfoLogLevel)
+            self._apply_camera_frame(target, distance, snap_forward, snap_up)
             
         except Exception as e:
             self.camera_util.log(f'最寄りのViewCube面への移動に失敗しました: {str(e)}', adsk.core.LogLevels.ErrorLogLevel)
             if self.camera_util.debug:
                 self.camera_util.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
     
+    def _rotate_screen(self, kind: str, angle_degrees: float) -> None:
+        """現在の向きから画面の軸で回転した向きに移動する
+        
+        Parameters:
+            kind: 'horizontal'、'vertical'、'axial' のいずれか
+            angle_degrees: 回転角度（度）
+        """
+        viewport = self.camera_util.get_viewport()
+        if not viewport:
+            self.camera_util.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
+            return
+        
+        camera = viewport.camera
+        if not camera:
+            self.camera_util.log("No active camera found.", adsk.core.LogLevels.WarningLogLevel)
+            return
+        
+        target, distance, forward, up = self._read_camera_frame(camera)
+        new_forward, new_up = self._rotate_frame(kind, forward, up, angle_degrees)
+        self._apply_camera_frame(target, distance, new_forward, new_up)
+    
     def rotate_screen_horizontal(self, angle_degrees: float) -> None:
         """画面の垂直軸で水平方向に回転（右が正、左が負）
         
@@ -121,41 +190,7 @@ class CameraRotations:
             angle_degrees: 回転角度（度）
         """
         try:
-            viewport = app.activeViewport
-            if not viewport:
-                self.camera_util.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
-                return
-            
-            camera = viewport.camera
-            if not camera:
-                self.camera_util.log("No active camera found.", adsk.core.LogLevels.WarningLogLevel)
-                return
-            
-            # カメラの滑らかな遷移を有効にする
-            camera.isSmoothTransition = True
-            
-            # 上方向ベクトルを回転軸として使用
-            up_vector = camera.upVector.copy()
-            up_vector.normalize()
-            
-            # 角度をラジアンに変換（マイナスで反転して直感的な回転方向にする）
-            angle_radians = math.radians(-angle_degrees)
-            
-            # クォータニオンを使用して回転
-            rotation_quaternion = Quaternion.from_axis_angle(up_vector, angle_radians)
-            
-            # 視点（eye）位置を回転
-            eye_vector = camera.target.vectorTo(camera.eye)
-            rotated_eye_vector = rotation_quaternion.transform_vector(eye_vector)
-            
-            new_eye = camera.target.copy()
-            new_eye.translateBy(rotated_eye_vector)
-            camera.eye = new_eye
-            
-            # カメラをビューポートに適用
-            viewport.camera = camera
-            viewport.refresh()
-            
+            self._rotate_screen('horizontal', angle_degrees)
         except Exception as e:
             self.camera_util.log(f'水平画面回転に失敗しました: {str(e)}', adsk.core.LogLevels.ErrorLogLevel)
             if self.camera_util.debug:
@@ -168,52 +203,7 @@ class CameraRotations:
             angle_degrees: 回転角度（度）
         """
         try:
-            viewport = app.activeViewport
-            if not viewport:
-                self.camera_util.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
-                return
-            
-            camera = viewport.camera
-            if not camera:
-                self.camera_util.log("No active camera found.", adsk.core.LogLevels.WarningLogLevel)
-                return
-            
-            # カメラの滑らかな遷移を有効にする
-            camera.isSmoothTransition = True
-            
-            # 視線方向と上方向から右方向ベクトルを計算
-            eye_to_target = camera.eye.vectorTo(camera.target)
-            eye_to_target.normalize()
-            
-            up_vector = camera.upVector.copy()
-            up_vector.normalize()
-            
-            right_vector = eye_to_target.crossProduct(up_vector)
-            right_vector.normalize()
-            
-            # 角度をラジアンに変換
-            angle_radians = math.radians(angle_degrees)
-            
-            # クォータニオンを使用して回転
-            rotation_quaternion = Quaternion.from_axis_angle(right_vector, angle_radians)
-            
-            # 視点（eye）位置を回転
-            eye_vector = camera.target.vectorTo(camera.eye)
-            rotated_eye_vector = rotation_quaternion.transform_vector(eye_vector)
-            
-            # 上ベクトルを回転
-            rotated_up = rotation_quaternion.transform_vector(up_vector)
-            
-            # カメラを更新
-            new_eye = camera.target.copy()
-            new_eye.translateBy(rotated_eye_vector)
-            camera.eye = new_eye
-            camera.upVector = rotated_up
-            
-            # カメラをビューポートに適用
-            viewport.camera = camera
-            viewport.refresh()
-            
+            self._rotate_screen('vertical', angle_degrees)
         except Exception as e:
             self.camera_util.log(f'垂直画面回転に失敗しました: {str(e)}', adsk.core.LogLevels.ErrorLogLevel)
             if self.camera_util.debug:
@@ -226,7 +216,54 @@ class CameraRotations:
             angle_degrees: 回転角度（度）
         """
         try:
-            viewport = app.activeViewport
+            self._rotate_screen('axial', angle_degrees)
+        except Exception as e:
+            self.camera_util.log(f'軸方向画面回転に失敗しました: {str(e)}', adsk.core.LogLevels.ErrorLogLevel)
+            if self.camera_util.debug:
+                self.camera_util.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
+    
+    def tick(self) -> None:
+        """スケジュールされたカメラ操作を進める（カメラ更新の周期ごとに呼び出す）"""
+        self.sequencer.tick()
+    
+    @staticmethod
+    def _rotate_frame(kind: str, 
+                      forward: Tuple[float, float, float], 
+                      up: Tuple[float, float, float], 
+                      angle_degrees: float) -> Tuple[Tuple[float, float, float], Tuple[float, float, float]]:
+        """視線方向と上方向を rotate_screen_* と同じ規則で回転する（浮動小数点のみで計算）
+        
+        Parameters:
+            kind: 'horizontal'、'vertical'、'axial' のいずれか
+            forward: targetからeyeへの単位ベクトル
+            up: 上方向の単位ベクトル
+            angle_degrees: 回転角度（度）
+            
+        Returns:
+            tuple: 回転後の (forward, up)
+        """
+        if kind == 'horizontal':
+            # 上方向ベクトルを軸に回転（マイナスで反転して直感的な回転方向にする）
+            q = Quaternion.from_axis_angle(up, math.radians(-angle_degrees))
+            return _normalize(q.transform_tuple(forward)), up
+        if kind == 'vertical':
+            # 視線方向（eyeからtarget）と上方向から求めた右方向を軸に回転
+            right = _normalize(_cross((-forward[0], -forward[1], -forward[2]), up))
+            q = Quaternion.from_axis_angle(right, math.radians(angle_degrees))
+            return _normalize(q.transform_tuple(forward)), _normalize(q.transform_tuple(up))
+        # 視線方向を軸に上方向を回転
+        q = Quaternion.from_axis_angle(forward, math.radians(angle_degrees))
+        return forward, _normalize(q.transform_tuple(up))
+    
+    def _smart_rotate(self, kind: str, angle_degrees: float) -> None:
+        """最寄りの軸に揃った向きにスナップしてから回転した向きに、1回のトランジションで移動する
+        
+        Parameters:
+            kind: 'horizontal'、'vertical'、'axial' のいずれか
+            angle_degrees: 回転角度（度）
+        """
+        try:
+            viewport = self.camera_util.get_viewport()
             if not viewport:
                 self.camera_util.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
                 return
@@ -236,82 +273,59 @@ class CameraRotations:
                 self.camera_util.log("No active camera found.", adsk.core.LogLevels.WarningLogLevel)
                 return
             
-            # カメラの滑らかな遷移を有効にする
-            camera.isSmoothTransition = True
+            target, distance, forward, up = self._read_camera_frame(camera)
+            index, score = find_nearest_orientation(forward, up)
+            snap_forward, snap_up, name = SNAP_ORIENTATIONS[index]
+            if score < 1.999:
+                self.camera_util.log(f"現在任意の向きのため、最寄りの向き '{name}' にスナップして回転します", adsk.core.LogLevels.InfoLogLevel)
             
-            # 視線方向を計算
-            view_direction = camera.target.vectorTo(camera.eye)
-            view_direction.normalize()
-            
-            # 角度をラジアンに変換
-            angle_radians = math.radians(angle_degrees)
-            
-            # クォータニオンを使用して回転
-            rotation_quaternion = Quaternion.from_axis_angle(view_direction, angle_radians)
-            
-            # 上ベクトルを回転
-            up_vector = camera.upVector.copy()
-            rotated_up = rotation_quaternion.transform_vector(up_vector)
-            
-            # カメラを更新
-            camera.upVector = rotated_up
-            
-            # カメラをビューポートに適用
-            viewport.camera = camera
-            viewport.refresh()
+            new_forward, new_up = self._rotate_frame(kind, snap_forward, snap_up, angle_degrees)
+            self._apply_camera_frame(target, distance, new_forward, new_up)
             
         except Exception as e:
-            self.camera_util.log(f'軸方向画面回転に失敗しました: {str(e)}', adsk.core.LogLevels.ErrorLogLevel)
+            self.camera_util.log(f'スマート回転に失敗しました: {str(e)}', adsk.core.LogLevels.ErrorLogLevel)
             if self.camera_util.debug:
                 self.camera_util.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
     
     def smart_rotate_horizontal(self, angle_degrees: float) -> None:
-        """スマート水平回転：任意の向きの場合は最寄り面に移動してから回転
+        """スマート水平回転：最寄りの軸に揃った向きから回転した向きに1回のトランジションで移動
         
         Parameters:
             angle_degrees: 回転角度（度）
         """
-        is_on_face = self._is_on_viewcube_face()
-        if not is_on_face:
-            self.camera_util.log("現在任意の向き（ArbitraryViewOrientation）のため、最寄りViewCube面に移動してから回転します", adsk.core.LogLevels.InfoLogLevel)
-            self.move_to_nearest_viewcube_face()
-            # 少し待ってから回転（カメラの移動完了を待つ）
-            import time
-            time.sleep(0.1)
-        else:
-            self.camera_util.log("現在標準ViewCube面を向いているため、直接回転します", adsk.core.LogLevels.InfoLogLevel)
-        self.rotate_screen_horizontal(angle_degrees)
+        self._smart_rotate('horizontal', angle_degrees)
     
     def smart_rotate_vertical(self, angle_degrees: float) -> None:
-        """スマート垂直回転：任意の向きの場合は最寄り面に移動してから回転
+        """スマート垂直回転：最寄りの軸に揃った向きから回転した向きに1回のトランジションで移動
         
         Parameters:
             angle_degrees: 回転角度（度）
         """
-        is_on_face = self._is_on_viewcube_face()
-        if not is_on_face:
-            self.camera_util.log("現在任意の向き（ArbitraryViewOrientation）のため、最寄りViewCube面に移動してから回転します", adsk.core.LogLevels.InfoLogLevel)
-            self.move_to_nearest_viewcube_face()
-            # 少し待ってから回転（カメラの移動完了を待つ）
-            import time
-            time.sleep(0.1)
-        else:
-            self.camera_util.log("現在標準ViewCube面を向いているため、直接回転します", adsk.core.LogLevels.InfoLogLevel)
-        self.rotate_screen_vertical(angle_degrees)
+        self._smart_rotate('vertical', angle_degrees)
     
     def smart_rotate_axial(self, angle_degrees: float) -> None:
-        """スマート軸回転：任意の向きの場合は最寄り面に移動してから回転
+        """スマート軸回転：最寄りの軸に揃った向きから回転した向きに1回のトランジションで移動
+        
+        Parameters:
+            angle_degrees: 回転角度（度）
+        """
+        self._smart_rotate('axial', angle_degrees)
+    
+    def rotate(self, kind: str, angle_degrees: float, smart: bool = False) -> None:
+        """回転の種類を指定して画面回転またはスマート回転を実行する
         
         Parameters:
+            kind: 'horizontal'、'vertical'、'axial' のいずれか
             angle_degrees: 回転角度（度）
+            smart: Trueの場合はスマート回転（最寄りの軸に揃った向きから回転）
         """
-        is_on_face = self._is_on_viewcube_face()
-        if not is_on_face:
-            self.camera_util.log("現在任意の向き（ArbitraryViewOrientation）のため、最寄りViewCube面に移動してから回転します", adsk.core.LogLevels.InfoLogLevel)
-            self.move_to_nearest_viewcube_face()
-            # 少し待ってから回転（カメラの移動完了を待つ）
-            import time
-            time.sleep(0.1)
+        if smart:
+            self._smart_rotate(kind, angle_degrees)
+        elif kind == 'horizontal':
+            self.rotate_screen_horizontal(angle_degrees)
+        elif kind == 'vertical':
+            self.rotate_screen_vertical(angle_degrees)
+        elif kind == 'axial':
+            self.rotate_screen_axial(angle_degrees)
         else:
-            self.camera_util.log("現在標準ViewCube面を向いているため、直接回転します", adsk.core.LogLevels.InfoLogLevel)
-        self.rotate_screen_axial(angle_degrees)
\ No newline at end of file
+            self.camera_util.log(f'未知の回転の種類: {kind}', adsk.core.LogLevels.WarningLogLevel)
@@ -0,0 +1,125 @@
+"""
+複数ステップのカメラ操作をカメラ更新の周期に分けて実行するモジュール
+メインスレッドでスリープせずに、前のトランジションが落ち着くのを待ってから次のステップを実行する
+"""
+
+import adsk.core
+import time
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple, Union
+
+from .camera_utility import CameraUtility
+
+
+class CameraSequencer:
+    """カメラ操作のステップを順番に実行するスケジューラ
+
+    schedule() で登録したステップは tick() の呼び出しごとに進む。
+    WAIT_FOR_SETTLE を挟むと、カメラの位置と向きが SETTLE_TICKS 回続けて変化しなくなるまで
+    （またはタイムアウトまで）次のステップを待つ。
+    """
+
+    # トランジション完了待ちを表すステップ
+    WAIT_FOR_SETTLE = object()
+
+    # トランジション完了待ちの最大時間（秒）
+    SETTLE_TIMEOUT: float = 1.0
+    
+    # 位置と向きが何回続けて変化しなければ完了とみなすか
+    # （書き込んだ直後の tick では Fusion のアニメーションがまだ始まっていないことがあるので2回にする）
+    SETTLE_TICKS: int = 2
+
+    def __init__(self, camera_util: CameraUtility):
+        """
+        Parameters:
+            camera_util: ベースのカメラユーティリティインスタンス
+        """
+        self.camera_util = camera_util
+        self._steps: Deque[Union[Callable[[], None], object]] = deque()
+        self._wait_started: Optional[float] = None
+        self._last_pose: Optional[Tuple[float, ...]] = None
+        self._stable_ticks = 0
+        self._in_tick = False
+
+    @property
+    def is_busy(self) -> bool:
+        """実行待ちのステップがあるか"""
+        return bool(self._steps)
+
+    def schedule(self, *steps: Union[Callable[[], None], object]) -> None:
+        """ステップを登録して、実行できるところまですぐに実行する
+
+        Parameters:
+            steps: 引数なしの呼び出し可能オブジェクト、または WAIT_FOR_SETTLE
+        """
+        self._steps.extend(steps)
+        if not self._in_tick:
+            self.tick()
+
+    def cancel(self) -> None:
+        """実行待ちのステップをすべて破棄する"""
+        self._steps.clear()
+        self._wait_started = None
+        self._last_pose = None
+        self._stable_ticks = 0
+
+    def tick(self, now: float = None) -> None:
+        """実行できるステップを実行する（カメラ更新の周期ごとに呼び出す）
+
+        Parameters:
+            now: 現在時刻（秒）、Noneの場合は time.time() を使用
+        """
+        self._in_tick = True
+        try:
+            while self._steps:
+                step = self._steps[0]
+                if step is self.WAIT_FOR_SETTLE:
+                    if not self._is_settled(time.time() if now is None else now):
+                        return
+                    self._steps.popleft()
+                    continue
+
+                self._steps.popleft()
+                try:
+                    step()
+                except Exception as e:
+                    self.camera_util.log(f'カメラ操作ステップの実行に失敗しました: {str(e)}', adsk.core.LogLevels.ErrorLogLevel)
+                    self.cancel()
+                    return
+        finally:
+            self._in_tick = False
+
+    def _is_settled(self, now: float) -> bool:
+        """前のトランジションが完了したかを判定する
+
+        判定の規則は1つだけで、カメラの位置と向きが SETTLE_TICKS 回続けて前回の tick と同じであれば完了とする。
+        ただし CameraUtility のビュー遷移アニメーション中は位置が同じでも変化中とみなし、
+        待ち始めてから SETTLE_TIMEOUT 秒が経過した場合は落ち着いていなくても完了とする。
+        """
+        if self._wait_started is None:
+            self._wait_started = now
+            self._last_pose = None
+            self._stable_ticks = 0
+
+        pose = self._read_pose()
+        if pose == self._last_pose and not self.camera_util.is_transitioning:
+            self._stable_ticks += 1
+        else:
+            self._stable_ticks = 0
+        self._last_pose = pose
+
+        settled = self._stable_ticks >= self.SETTLE_TICKS or now - self._wait_started >= self.SETTLE_TIMEOUT
+        if settled:
+            self._wait_started = None
+            self._last_pose = None
+        return settled
+
+    def _read_pose(self) -> Optional[Tuple[float, ...]]:
+        """現在のカメラの位置と向きを取得する"""
+        viewport = self.camera_util.get_viewport()
+        if not viewport:
+            return None
+        camera = viewport.camera
+        eye = camera.eye
+        up = camera.upVector
+        return (eye.x, eye.y, eye.z, up.x, up.y, up.z)
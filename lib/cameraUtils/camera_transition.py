@@ -0,0 +1,121 @@
+"""
+カメラのビュー遷移アニメーション
+Fusionの isSmoothTransition に頼らず、向きの球面線形補間（slerp）と注視点・距離の補間を
+時間ベースで計算する（Fusion APIのオブジェクトは使用しない）
+"""
+
+import math
+from typing import Callable, Dict, Optional, Tuple
+
+from .quaternion import Quaternion
+
+Vector = Tuple[float, float, float]
+
+
+def _ease_in_out(t: float) -> float:
+    # 3次のスムーズステップ
+    return t * t * (3.0 - 2.0 * t)
+
+
+def _ease_out(t: float) -> float:
+    u = 1.0 - t
+    return 1.0 - u * u * u
+
+
+# 利用可能なイージング関数（0.0〜1.0 の経過割合を補間係数に変換する）
+EASING_FUNCTIONS: Dict[str, Callable[[float], float]] = {
+    'linear': lambda t: t,
+    'ease_in_out': _ease_in_out,
+    'ease_out': _ease_out,
+}
+
+
+def _normalize(vector: Vector) -> Vector:
+    x, y, z = vector
+    length = math.sqrt(x * x + y * y + z * z)
+    if length < 1e-12:
+        return vector
+    return (x / length, y / length, z / length)
+
+
+def _orthogonal_up(forward: Vector, up: Vector) -> Vector:
+    """上方向から視線方向の成分を取り除いて正規化する"""
+    d = forward[0] * up[0] + forward[1] * up[1] + forward[2] * up[2]
+    return _normalize((up[0] - forward[0] * d, up[1] - forward[1] * d, up[2] - forward[2] * d))
+
+
+class CameraPose:
+    """カメラの位置と向き（注視点、距離、向きのクォータニオン）"""
+    __slots__ = ('target', 'distance', 'orientation')
+
+    def __init__(self, target: Vector, distance: float, orientation: Quaternion):
+        self.target = target
+        self.distance = distance
+        self.orientation = orientation
+
+    @classmethod
+    def from_eye_target_up(cls, eye: Vector, target: Vector, up: Vector) -> 'CameraPose':
+        """eye、target、upVector の値から生成する"""
+        offset = (eye[0] - target[0], eye[1] - target[1], eye[2] - target[2])
+        distance = math.sqrt(offset[0] * offset[0] + offset[1] * offset[1] + offset[2] * offset[2])
+        forward = _normalize(offset)
+        return cls(target, distance, Quaternion.from_frame(forward, _orthogonal_up(forward, up)))
+
+    def to_eye_target_up(self) -> Tuple[Vector, Vector, Vector]:
+        """eye、target、upVector の値に変換する"""
+        forward = self.orientation.transform_tuple((0.0, 0.0, 1.0))
+        up = self.orientation.transform_tuple((0.0, 1.0, 0.0))
+        target = self.target
+        eye = (
+            target[0] + forward[0] * self.distance,
+            target[1] + forward[1] * self.distance,
+            target[2] + forward[2] * self.distance
+        )
+        return eye, target, up
+
+
+class CameraTransition:
+    """開始と終了のカメラの位置と向きを時間ベースで補間する"""
+
+    def __init__(self,
+                 start: CameraPose,
+                 end: CameraPose,
+                 start_time: float,
+                 duration: float,
+                 easing: str = 'ease_in_out'):
+        """
+        Parameters:
+            start: 開始時のカメラの位置と向き
+            end: 終了時のカメラの位置と向き
+            start_time: 開始時刻（秒）
+            duration: 遷移時間（秒）
+            easing: イージング関数の名前（EASING_FUNCTIONS のキー、未知の場合は 'linear'）
+        """
+        self.start = start
+        self.end = end
+        self.start_time = start_time
+        self.duration = max(duration, 1e-6)
+        self._easing = EASING_FUNCTIONS.get(easing, EASING_FUNCTIONS['linear'])
+
+    def progress(self, now: float) -> float:
+        """経過割合（0.0〜1.0）"""
+        return min(max((now - self.start_time) / self.duration, 0.0), 1.0)
+
+    def is_finished(self, now: float) -> bool:
+        """遷移が完了したか"""
+        return now - self.start_time >= self.duration
+
+    def pose_at(self, now: float) -> CameraPose:
+        """指定時刻のカメラの位置と向きを求める"""
+        t = self._easing(self.progress(now))
+        if t >= 1.0:
+            return self.end
+
+        start, end = self.start, self.end
+        target = (
+            start.target[0] + (end.target[0] - start.target[0]) * t,
+            start.target[1] + (end.target[1] - start.target[1]) * t,
+            start.target[2] + (end.target[2] - start.target[2]) * t
+        )
+        distance = start.distance + (end.distance - start.distance) * t
+        return CameraPose(target, distance, Quaternion.slerp(start.orientation, end.orientation, t))
@@ -7,13 +7,36 @@ import adsk.core
 import adsk.fusion
 import traceback
 import math
+import time
 from typing import List, ClassVar, Dict, Any, Optional, Tuple, Union
 from .quaternion import Quaternion
+from .camera_transition import CameraPose, CameraTransition
+from .viewport_cache import ViewportCache, shared_viewport_cache
 
 # Fusionアプリケーション インスタンス
 app: adsk.core.Application = adsk.core.Application.get()
 ui: adsk.core.UserInterface = app.userInterface
 
+# 書き込みキャッシュで同一とみなす座標値の許容誤差
+_CAMERA_VALUE_TOLERANCE = 1e-9
+
+
+def _camera_value_key(value: Any) -> Any:
+    """カメラプロパティの値をキャッシュ比較用の値に変換する（Point3D/Vector3Dは座標のタプル）"""
+    if hasattr(value, 'x') and hasattr(value, 'y') and hasattr(value, 'z'):
+        return (value.x, value.y, value.z)
+    return value
+
+
+def _camera_values_equal(a: Any, b: Any) -> bool:
+    """キャッシュ比較用の値が等しいかを判定する"""
+    if isinstance(a, tuple) and isinstance(b, tuple):
+        return (abs(a[0] - b[0]) <= _CAMERA_VALUE_TOLERANCE and
+                abs(a[1] - b[1]) <= _CAMERA_VALUE_TOLERANCE and
+                abs(a[2] - b[2]) <= _CAMERA_VALUE_TOLERANCE)
+    return a == b
+
+
 class CameraUtility:
     """カメラ操作ユーティリティクラス
     
@@ -24,23 +47,56 @@ class CameraUtility:
     DEFAULT_ROTATION_SCALE: ClassVar[float] = 0.01
     DEFAULT_DEBUG: ClassVar[bool] = False
     DEFAULT_USE_Z_AXIS_ROTATION: ClassVar[bool] = False
+    DEFAULT_TRANSITION_DURATION: ClassVar[float] = 0.25
+    DEFAULT_TRANSITION_EASING: ClassVar[str] = 'ease_in_out'
+    
+    # 書き込みキャッシュの対象となるカメラプロパティ（同じカメラのコピーから observe_camera で読み取った値と比較する）
+    GEOMETRY_PROPERTIES: ClassVar[Tuple[str, ...]] = ('eye', 'target', 'upVector')
+    # キャッシュせず、カメラのコピーごとにそのコピーの値と比較して設定するプロパティ
+    # （viewport.camera は毎回新しいコピーを返し、前のコピーに設定した値は引き継がれないため）
+    SETTING_PROPERTIES: ClassVar[Tuple[str, ...]] = ('isSmoothTransition', 'cameraType', 'perspectiveAngle')
+    # 適用の仕方だけを指定するプロパティ（これだけが変わってもビューポートには適用しない）
+    TRANSITION_PROPERTIES: ClassVar[Tuple[str, ...]] = ('isSmoothTransition',)
     
     def __init__(self, 
                  rotation_scale: float = DEFAULT_ROTATION_SCALE, 
                  debug: bool = DEFAULT_DEBUG,
                  use_z_axis_rotation: bool = DEFAULT_USE_Z_AXIS_ROTATION,
-                 log_function: callable = None):
+                 log_function: callable = None,
+                 viewport_cache: ViewportCache = None,
+                 transition_duration: float = DEFAULT_TRANSITION_DURATION,
+                 transition_easing: str = DEFAULT_TRANSITION_EASING):
         """
         Parameters:
             rotation_scale: カメラ回転のスケール係数
             debug: デバッグモードフラグ
             use_z_axis_rotation: Z軸回転モード使用フラグ
             log_function: ログ出力関数（None の場合は内部でシンプルなログ処理を行う）
+            viewport_cache: ビューポートのキャッシュ（None の場合は共有インスタンスを使用）
+            transition_duration: ビュー遷移アニメーションの時間（秒）、0 以下の場合はFusionの滑らかな遷移を使用
+            transition_easing: ビュー遷移アニメーションのイージング（'linear'、'ease_in_out'、'ease_out'）
         """
         self.rotation_scale = rotation_scale
         self.debug = debug
         self.use_z_axis_rotation = use_z_axis_rotation
         self._log_function = log_function
+        self.viewport_cache = viewport_cache if viewport_cache is not None else shared_viewport_cache
+        self._viewport_generation = self.viewport_cache.generation
+        self.transition_duration = transition_duration
+        self.transition_easing = transition_easing
+        
+        # 実行中のビュー遷移アニメーションと、最後に書き込んだeye位置（外部でのカメラ変更の検出用）
+        self._transition: Optional[CameraTransition] = None
+        self._transition_eye: Optional[Tuple[float, float, float]] = None
+        
+        # ビューポートのカメラに最後に書き込んだ（または読み取った）プロパティ値
+        self._camera_state: Dict[str, Any] = {}
+        
+        # プロパティごとの書き込み回数と、値が変わらないため省略した回数
+        # 'camera' は viewport.camera への適用回数
+        self.write_counts: Dict[str, int] = {}
+        self.elided_write_counts: Dict[str, int] = {}
+        self.reset_write_stats()
     
     def log(self, message: str, level: adsk.core.LogLevels = adsk.core.LogLevels.InfoLogLevel) -> None:
         """ログ出力関数
@@ -65,11 +121,106 @@ class CameraUtility:
         self.rotation_scale = value
         self.log(f'Rotation scale set to: {value}')
     
+    def get_viewport(self) -> Optional[adsk.core.Viewport]:
+        """アクティブなビューポートを取得する（キャッシュを使用）
+        
+        ビューポートが切り替わった場合はカメラの書き込みキャッシュも破棄する
+        
+        Returns:
+            adsk.core.Viewport: アクティブなビューポート（存在しない場合はNone）
+        """
+        viewport = self.viewport_cache.get()
+        if self.viewport_cache.generation != self._viewport_generation:
+            self._viewport_generation = self.viewport_cache.generation
+            self.invalidate_camera_cache()
+        return viewport
+    
+    def set_camera_property(self, camera: adsk.core.Camera, name: str, value: Any) -> bool:
+        """カメラのプロパティを設定する（現在の値と同じ場合は設定を省略）
+        
+        eye、target、upVector は同じコピーから observe_camera で読み取った値（またはその後に設定した値）と比較する。
+        isSmoothTransition などの設定値はキャッシュせず、渡されたコピーの値を読み取って比較する。
+        
+        Parameters:
+            camera: 設定対象のカメラ（viewport.camera で取得したコピー）
+            name: プロパティ名（eye, target, upVector, isSmoothTransition, cameraType, perspectiveAngle）
+            value: 設定する値
+            
+        Returns:
+            bool: ビューポートへの適用が必要な変更をした場合はTrue
+        """
+        key = _camera_value_key(value)
+        if name in self.SETTING_PROPERTIES:
+            if _camera_values_equal(_camera_value_key(getattr(camera, name)), key):
+                self.elided_write_counts[name] = self.elided_write_counts.get(name, 0) + 1
+                return False
+            setattr(camera, name, value)
+            self.write_counts[name] = self.write_counts.get(name, 0) + 1
+            return name not in self.TRANSITION_PROPERTIES
+        
+        cached = self._camera_state.get(name)
+        if cached is not None and _camera_values_equal(cached, key):
+            self.elided_write_counts[name] = self.elided_write_counts.get(name, 0) + 1
+            return False
+        
+        setattr(camera, name, value)
+        self._camera_state[name] = key
+        self.write_counts[name] = self.write_counts.get(name, 0) + 1
+        return True
+    
+    def apply_camera(self, viewport: adsk.core.Viewport, camera: adsk.core.Camera, changed: bool) -> bool:
+        """変更があった場合のみカメラをビューポートに適用する
+        
+        Parameters:
+            viewport: 適用先のビューポート
+            camera: 適用するカメラ
+            changed: set_camera_property で実際に設定したプロパティがあるか
+            
+        Returns:
+            bool: 適用した場合はTrue
+        """
+        if not changed:
+            self.elided_write_counts['camera'] = self.elided_write_counts.get('camera', 0) + 1
+            return False
+        
+        viewport.camera = camera
+        self.write_counts['camera'] = self.write_counts.get('camera', 0) + 1
+        return True
+    
+    def observe_camera(self, eye: adsk.core.Point3D = None, target: adsk.core.Point3D = None, up: adsk.core.Vector3D = None) -> None:
+        """カメラのコピーから読み取った値を書き込みキャッシュに反映する
+        
+        viewport.camera でコピーを取得したら、set_camera_property の前に呼び出す
+        （マウス操作など外部でカメラが変更されていても、そのコピーの値と比較して書き込みを省略する）
+        """
+        for name, value in (('eye', eye), ('target', target), ('upVector', up)):
+            if value is None:
+                continue
+            self._camera_state[name] = (value.x, value.y, value.z)
+    
+    def invalidate_camera_cache(self) -> None:
+        """書き込みキャッシュを破棄する（ビュー方向の変更などカメラがAPI外で変わる操作の後に呼び出す）"""
+        self._camera_state.clear()
+    
+    def get_write_stats(self) -> Dict[str, Dict[str, int]]:
+        """カメラプロパティの書き込み回数と省略回数を取得する
+        
+        Returns:
+            dict: {'written': {プロパティ名: 回数}, 'elided': {プロパティ名: 回数}}
+        """
+        return {'written': dict(self.write_counts), 'elided': dict(self.elided_write_counts)}
+    
+    def reset_write_stats(self) -> None:
+        """書き込み回数と省略回数をリセットする"""
+        names = ('camera',) + self.GEOMETRY_PROPERTIES + self.SETTING_PROPERTIES
+        self.write_counts = {name: 0 for name in names}
+        self.elided_write_counts = {name: 0 for name in names}
+    
     def navigate_to_home_view(self) -> None:
         """カメラをホームビュー（正面図）に移動する"""
         try:
             # アクティブなビューポートを取得
-            viewport = app.activeViewport
+            viewport = self.get_viewport()
             if not viewport:
                 self.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
                 return
@@ -80,7 +231,10 @@ class CameraUtility:
                 transition = True  # True: スムーズな移動、False: 直接ジャンプ
                 
                 # goHome メソッドを実行
+                # Fusionが管理する遷移と重ならないように実行中のビュー遷移アニメーションを止める
+                self.cancel_transition()
                 result = viewport.goHome(transition)
+                self.invalidate_camera_cache()
                 
                 if result:
                     self.log("ホームビューに正常に移動しました", adsk.core.LogLevels.InfoLogLevel)
@@ -110,12 +264,15 @@ class CameraUtility:
     def fit_view(self) -> None:
         """現在のビューをフィットさせる"""
         try:
-            viewport = app.activeViewport
+            viewport = self.get_viewport()
             if not viewport:
                 self.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
                 return
                 
+            # Fusionが管理する遷移と重ならないように実行中のビュー遷移アニメーションを止める
+            self.cancel_transition()
             viewport.fit()
+            self.invalidate_camera_cache()
             self.log("フィットビューを実行しました", adsk.core.LogLevels.InfoLogLevel)
         except Exception as e:
             self.log(f"フィットビュー実行中にエラーが発生しました: {str(e)}", adsk.core.LogLevels.ErrorLogLevel)
@@ -128,8 +285,23 @@ class CameraUtility:
         Parameters:
             rotation_quaternion: 回転を表すQuaternion
         """
+        self.move_camera(rotation_quaternion)
+    
+    def move_camera(self,
+                    rotation_quaternion: Optional[Quaternion] = None,
+                    pan_x: float = 0.0,
+                    pan_y: float = 0.0,
+                    dolly: float = 0.0) -> None:
+        """注視点周りの回転、平行移動、前後移動をまとめて1回のカメラ書き込みで適用する
+        
+        Parameters:
+            rotation_quaternion: 注視点周りの回転（Noneの場合は回転しない）
+            pan_x: 画面右方向への移動量（注視点までの距離に対する割合）
+            pan_y: 画面上方向への移動量（注視点までの距離に対する割合）
+            dolly: 前後移動量（正で近づく。注視点までの距離を exp(-dolly) 倍にする。平行投影では表示範囲を縮める）
+        """
         try:
-            viewport = app.activeViewport
+            viewport = self.get_viewport()
             if not viewport:
                 self.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
                 return
@@ -138,33 +310,63 @@ class CameraUtility:
             if not camera:
                 return
 
-            # カメラの滑らかな遷移を無効化
-            camera.isSmoothTransition = False
-            
             eye: adsk.core.Point3D = camera.eye
             target: adsk.core.Point3D = camera.target
             up: adsk.core.Vector3D = camera.upVector
+            self.observe_camera(eye, target, up)
+            
+            # カメラの滑らかな遷移を無効化
+            changed = self.set_camera_property(camera, 'isSmoothTransition', False)
 
-            # eye位置の回転
+            # eye位置とupベクトルの回転
             eye_vector: adsk.core.Vector3D = target.vectorTo(eye)
-            rotated_eye_vector: adsk.core.Vector3D = rotation_quaternion.transform_vector(eye_vector)
-            new_eye: adsk.core.Point3D = target.copy()
-            new_eye.translateBy(rotated_eye_vector)
-
-            # upベクトルの回転
-            rotated_up: adsk.core.Vector3D = rotation_quaternion.transform_vector(up)
+            if rotation_quaternion is not None:
+                eye_vector = rotation_quaternion.transform_vector(eye_vector)
+                up = rotation_quaternion.transform_vector(up)
+            
+            # 前後移動（平行投影では距離を変えても表示が変わらないので表示範囲を変える）
+            if dolly != 0.0:
+                factor = math.exp(-dolly)
+                if camera.cameraType == adsk.core.CameraTypes.OrthographicCameraType:
+                    camera.viewExtents = camera.viewExtents * factor
+                    self.write_counts['viewExtents'] = self.write_counts.get('viewExtents', 0) + 1
+                    changed = True
+                else:
+                    eye_vector.scaleBy(factor)
+            
+            # 平行移動（eyeと注視点を同じだけ動かす）
+            new_target: adsk.core.Point3D = target.copy()
+            if pan_x != 0.0 or pan_y != 0.0:
+                distance = eye_vector.length
+                view_direction = eye_vector.copy()
+                view_direction.scaleBy(-1.0)
+                screen_right = view_direction.crossProduct(up)
+                screen_up = up.copy()
+                if screen_right.length > 1e-9 and screen_up.length > 1e-9:
+                    screen_right.normalize()
+                    screen_up.normalize()
+                    screen_right.scaleBy(pan_x * distance)
+                    screen_up.scaleBy(pan_y * distance)
+                    new_target.translateBy(screen_right)
+                    new_target.translateBy(screen_up)
+                    changed = self.set_camera_property(camera, 'target', new_target) or changed
+            
+            new_eye: adsk.core.Point3D = new_target.copy()
+            new_eye.translateBy(eye_vector)
 
-            # カメラの新しい位置と向きを設定
-            camera.eye = new_eye
-            camera.upVector = rotated_up
-            viewport.camera = camera
+            # カメラの新しい位置と向きを設定（変化のないプロパティは書き込まない）
+            changed = self.set_camera_property(camera, 'eye', new_eye) or changed
+            changed = self.set_camera_property(camera, 'upVector', up) or changed
+            if not self.apply_camera(viewport, camera, changed):
+                return
             
             # 画面更新
             viewport.refresh()
 
         except Exception as e:
+            self.invalidate_camera_cache()
             # エラーログ
-            self.log(f'Camera rotation error: {str(e)}', adsk.core.LogLevels.ErrorLogLevel)
+            self.log(f'Camera move error: {str(e)}', adsk.core.LogLevels.ErrorLogLevel)
             if self.debug:
                 self.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
                 
@@ -175,7 +377,7 @@ class CameraUtility:
             tuple: (forward, right, up) - それぞれのベクトル
         """
         try:
-            viewport = app.activeViewport
+            viewport = self.get_viewport()
             if not viewport:
                 self.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
                 return None, None, None
@@ -214,15 +416,17 @@ class CameraUtility:
             orientation: 設定するビューの向き (adsk.core.ViewOrientations)
         """
         try:
-            viewport = app.activeViewport
+            viewport = self.get_viewport()
             if not viewport:
                 self.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
                 return
                 
-            # カメラの向きを設定
-            camera = viewport.camera
-            camera.isSmoothTransition = True
+            # カメラの向きを設定（viewOrientation はビューポートに直接適用されるため、
+            # カメラのコピーに isSmoothTransition を設定しても効果がないので設定しない）
+            # Fusionが管理する遷移と重ならないように実行中のビュー遷移アニメーションを止める
+            self.cancel_transition()
             viewport.viewOrientation = orientation
+            self.invalidate_camera_cache()
             viewport.refresh()
             
         except Exception as e:
@@ -233,25 +437,13 @@ class CameraUtility:
     def set_isometric_view(self) -> None:
         """アイソメトリック（等角投影）ビューに設定"""
         try:
-            viewport = app.activeViewport
+            viewport = self.get_viewport()
             if not viewport:
                 self.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
                 return
                 
-            # アイソメトリックビューに設定
-            camera = viewport.camera
-            
-            # アイソメトリックビュー移動時は滑らかな遷移を有効にする
-            camera.isSmoothTransition = True
-            
-            eye = adsk.core.Point3D.create(10, -10, 10)
-            target = adsk.core.Point3D.create(0, 0, 0)
-            up = adsk.core.Vector3D.create(0, 0, 1)
-            camera.eye = eye
-            camera.target = target
-            camera.upVector = up
-            viewport.camera = camera
-            viewport.refresh()
+            # アイソメトリックビューに設定（遷移アニメーション付き）
+            self.animate_to((10.0, -10.0, 10.0), (0.0, 0.0, 0.0), (0.0, 0.0, 1.0))
             self.log("アイソメトリックビューを実行しました", adsk.core.LogLevels.InfoLogLevel)
             
         except Exception as e:
@@ -271,17 +463,19 @@ class CameraUtility:
             smooth: 滑らかな遷移を使用するか
         """
         try:
-            viewport = app.activeViewport
+            viewport = self.get_viewport()
             if not viewport:
                 self.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
                 return
                 
             camera = viewport.camera
-            camera.isSmoothTransition = smooth
             
             eye = camera.eye
             target = camera.target
             up = camera.upVector
+            self.observe_camera(eye, target, up)
+            
+            changed = self.set_camera_property(camera, 'isSmoothTransition', smooth)
             
             # 回転角度をラジアンに変換
             angle_rad = math.radians(angle_degrees)
@@ -299,12 +493,183 @@ class CameraUtility:
             rotated_up = q.transform_vector(up)
             
             # カメラの更新
-            camera.eye = new_eye
-            camera.upVector = rotated_up
-            viewport.camera = camera
-            viewport.refresh()
+            changed = self.set_camera_property(camera, 'eye', new_eye) or changed
+            changed = self.set_camera_property(camera, 'upVector', rotated_up) or changed
+            if self.apply_camera(viewport, camera, changed):
+                viewport.refresh()
             
         except Exception as e:
             self.log(f"カメラ回転中にエラーが発生しました: {str(e)}", adsk.core.LogLevels.ErrorLogLevel)
             if self.debug:
-                self.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
\ No newline at end of file
+                self.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
+    
+    def set_camera_projection(self, 
+                              camera_type: Optional[adsk.core.CameraTypes] = None, 
+                              perspective_angle: Optional[float] = None) -> None:
+        """カメラの投影方法（透視/平行投影）と画角を設定
+        
+        Parameters:
+            camera_type: カメラの種類 (adsk.core.CameraTypes)、Noneの場合は変更しない
+            perspective_angle: 透視投影の画角（ラジアン）、Noneの場合は変更しない
+        """
+        try:
+            viewport = self.get_viewport()
+            if not viewport:
+                self.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
+                return
+                
+            camera = viewport.camera
+            self.observe_camera(camera.eye, camera.target, camera.upVector)
+            
+            changed = False
+            if camera_type is not None:
+                changed = self.set_camera_property(camera, 'cameraType', camera_type) or changed
+            if perspective_angle is not None:
+                changed = self.set_camera_property(camera, 'perspectiveAngle', perspective_angle) or changed
+            if self.apply_camera(viewport, camera, changed):
+                viewport.refresh()
+            
+        except Exception as e:
+            self.invalidate_camera_cache()
+            self.log(f"投影方法の設定中にエラーが発生しました: {str(e)}", adsk.core.LogLevels.ErrorLogLevel)
+            if self.debug:
+                self.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
+    
+    @property
+    def is_transitioning(self) -> bool:
+        """ビュー遷移アニメーションの実行中か"""
+        return self._transition is not None
+    
+    def get_transition_target(self) -> Optional[Tuple[Tuple[float, float, float], Tuple[float, float, float], Tuple[float, float, float]]]:
+        """実行中のビュー遷移アニメーションの終了時の (eye, target, upVector) を取得する（実行中でない場合はNone）"""
+        if self._transition is None:
+            return None
+        return self._transition.end.to_eye_target_up()
+    
+    def animate_to(self, 
+                   eye: Tuple[float, float, float], 
+                   target: Tuple[float, float, float], 
+                   up: Tuple[float, float, float], 
+                   duration: Optional[float] = None, 
+                   easing: Optional[str] = None, 
+                   now: Optional[float] = None) -> None:
+        """カメラを指定の位置と向きに遷移アニメーションで移動する
+        
+        遷移は advance_transition() の呼び出しごとに進む。実行中の遷移がある場合は
+        現在の位置と向きから新しい目標に向けて遷移し直す
+        
+        Parameters:
+            eye: 終了時の視点 (x, y, z)
+            target: 終了時の注視点 (x, y, z)
+            up: 終了時の上方向 (x, y, z)
+            duration: 遷移時間（秒）、Noneの場合は transition_duration、0 以下の場合はFusionの滑らかな遷移を使用
+            easing: イージングの名前、Noneの場合は transition_easing
+            now: 現在時刻（秒）、Noneの場合は time.time() を使用
+        """
+        try:
+            viewport = self.get_viewport()
+            if not viewport:
+                self.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
+                return
+            
+            camera = viewport.camera
+            current_eye = camera.eye
+            current_target = camera.target
+            current_up = camera.upVector
+            self.observe_camera(current_eye, current_target, current_up)
+            
+            duration = self.transition_duration if duration is None else duration
+            if duration <= 0.0:
+                # Fusionの滑らかな遷移で移動する
+                self.cancel_transition()
+                changed = self.set_camera_property(camera, 'isSmoothTransition', True)
+                changed = self.set_camera_property(camera, 'eye', adsk.core.Point3D.create(*eye)) or changed
+                changed = self.set_camera_property(camera, 'target', adsk.core.Point3D.create(*target)) or changed
+                changed = self.set_camera_property(camera, 'upVector', adsk.core.Vector3D.create(*up)) or changed
+                if self.apply_camera(viewport, camera, changed):
+                    viewport.refresh()
+                return
+            
+            start = CameraPose.from_eye_target_up(
+                (current_eye.x, current_eye.y, current_eye.z),
+                (current_target.x, current_target.y, current_target.z),
+                (current_up.x, current_up.y, current_up.z)
+            )
+            end = CameraPose.from_eye_target_up(eye, target, up)
+            self._transition = CameraTransition(
+                start, end,
+                time.time() if now is None else now,
+                duration,
+                self.transition_easing if easing is None else easing
+            )
+            self._transition_eye = (current_eye.x, current_eye.y, current_eye.z)
+            
+        except Exception as e:
+            self.cancel_transition()
+            self.log(f"ビュー遷移の開始に失敗しました: {str(e)}", adsk.core.LogLevels.ErrorLogLevel)
+            if self.debug:
+                self.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
+    
+    def advance_transition(self, now: Optional[float] = None) -> bool:
+        """実行中のビュー遷移アニメーションを進めてカメラに書き込む（カメラ更新の周期ごとに呼び出す）
+        
+        マウス操作などでカメラが外部から変更された場合は遷移を中止する
+        
+        Parameters:
+            now: 現在時刻（秒）、Noneの場合は time.time() を使用
+            
+        Returns:
+            bool: 遷移がまだ続いている場合はTrue
+        """
+        transition = self._transition
+        if transition is None:
+            return False
+        
+        try:
+            viewport = self.get_viewport()
+            if not viewport:
+                self.cancel_transition()
+                return False
+            
+            camera = viewport.camera
+            eye = camera.eye
+            last_eye = self._transition_eye
+            if last_eye is not None:
+                tolerance = 1e-6 + 1e-4 * max(transition.start.distance, transition.end.distance)
+                if (abs(eye.x - last_eye[0]) > tolerance or abs(eye.y - last_eye[1]) > tolerance
+                        or abs(eye.z - last_eye[2]) > tolerance):
+                    self.log("カメラが外部で変更されたため、ビュー遷移を中止しました", adsk.core.LogLevels.InfoLogLevel)
+                    self.cancel_transition()
+                    self.invalidate_camera_cache()
+                    return False
+            
+            self.observe_camera(eye, camera.target, camera.upVector)
+            
+            now = time.time() if now is None else now
+            new_eye, new_target, new_up = transition.pose_at(now).to_eye_target_up()
+            
+            changed = self.set_camera_property(camera, 'isSmoothTransition', False)
+            changed = self.set_camera_property(camera, 'eye', adsk.core.Point3D.create(*new_eye)) or changed
+            changed = self.set_camera_property(camera, 'target', adsk.core.Point3D.create(*new_target)) or changed
+            changed = self.set_camera_property(camera, 'upVector', adsk.core.Vector3D.create(*new_up)) or changed
+            if self.apply_camera(viewport, camera, changed):
+                viewport.refresh()
+            self._transition_eye = new_eye
+            
+            if transition.is_finished(now):
+                self.cancel_transition()
+                return False
+            return True
+            
+        except Exception as e:
+            self.cancel_transition()
+            self.invalidate_camera_cache()
+            self.log(f"ビュー遷移の更新に失敗しました: {str(e)}", adsk.core.LogLevels.ErrorLogLevel)
+            if self.debug:
+                self.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
+            return False
+    
+    def cancel_transition(self) -> None:
+        """実行中のビュー遷移アニメーションをその時点の位置と向きで止める"""
+        self._transition = None
+        self._transition_eye = None
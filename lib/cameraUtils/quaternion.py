@@ -19,7 +19,7 @@ class Quaternion:
         軸と角度からクォータニオンを生成
         
         Parameters:
-            axis: 回転軸ベクトル (adsk.core.Vector3D)
+            axis: 回転軸ベクトル (adsk.core.Vector3D または (x, y, z) のタプル)
             angle: 回転角度（ラジアン）
             
         Returns:
@@ -27,11 +27,15 @@ class Quaternion:
         """
         half_angle = angle / 2
         sin_half_angle = math.sin(half_angle)
+        if isinstance(axis, tuple):
+            axis_x, axis_y, axis_z = axis
+        else:
+            axis_x, axis_y, axis_z = axis.x, axis.y, axis.z
         return Quaternion(
             math.cos(half_angle),
-            axis.x * sin_half_angle,
-            axis.y * sin_half_angle,
-            axis.z * sin_half_angle
+            axis_x * sin_half_angle,
+            axis_y * sin_half_angle,
+            axis_z * sin_half_angle
         )
 
     def __mul__(self, other):
@@ -88,4 +92,129 @@ class Quaternion:
         q_vector = Quaternion(0, vector.x, vector.y, vector.z)
         q_conjugate = Quaternion(self.w, -self.x, -self.y, -self.z)
         q_result = self * q_vector * q_conjugate
-        return adsk.core.Vector3D.create(q_result.x, q_result.y, q_result.z)
\ No newline at end of file
+        return adsk.core.Vector3D.create(q_result.x, q_result.y, q_result.z)
+
+    def transform_tuple(self, vector):
+        """
+        (x, y, z) のタプルをこのクォータニオンで回転（Fusion APIのオブジェクトを生成しない）
+        
+        Parameters:
+            vector: 回転するベクトル (x, y, z)
+            
+        Returns:
+            tuple: 回転後のベクトル (x, y, z)
+        """
+        vx, vy, vz = vector
+        w, x, y, z = self.w, self.x, self.y, self.z
+        # t = 2 * (q.xyz × v)
+        tx = 2.0 * (y * vz - z * vy)
+        ty = 2.0 * (z * vx - x * vz)
+        tz = 2.0 * (x * vy - y * vx)
+        # v' = v + w * t + q.xyz × t
+        return (
+            vx + w * tx + (y * tz - z * ty),
+            vy + w * ty + (z * tx - x * tz),
+            vz + w * tz + (x * ty - y * tx)
+        )
+
+    def dot(self, other):
+        """
+        クォータニオンの内積
+        
+        Parameters:
+            other: 別のクォータニオン
+            
+        Returns:
+            float: 内積
+        """
+        return self.w * other.w + self.x * other.x + self.y * other.y + self.z * other.z
+
+    def normalized(self):
+        """
+        正規化したクォータニオンを返す
+        
+        Returns:
+            Quaternion: 長さ1のクォータニオン
+        """
+        length = math.sqrt(self.dot(self))
+        if length < 1e-12:
+            return Quaternion(1.0, 0.0, 0.0, 0.0)
+        return Quaternion(self.w / length, self.x / length, self.y / length, self.z / length)
+
+    @staticmethod
+    def from_frame(forward, up):
+        """
+        カメラの向き（視線方向と上方向）を表すクォータニオンを生成
+        
+        Z軸を forward、Y軸を up に移す回転を返す（transform_tuple((0, 0, 1)) で forward、
+        transform_tuple((0, 1, 0)) で up が得られる）
+        
+        Parameters:
+            forward: targetからeyeへの単位ベクトル (x, y, z)
+            up: forward に直交する上方向の単位ベクトル (x, y, z)
+            
+        Returns:
+            Quaternion: 生成されたクォータニオン
+        """
+        fx, fy, fz = forward
+        ux, uy, uz = up
+        # right = up × forward
+        rx, ry, rz = uy * fz - uz * fy, uz * fx - ux * fz, ux * fy - uy * fx
+        
+        # 回転行列の列 (right, up, forward) からクォータニオンを求める
+        m00, m01, m02 = rx, ux, fx
+        m10, m11, m12 = ry, uy, fy
+        m20, m21, m22 = rz, uz, fz
+        trace = m00 + m11 + m22
+        if trace > 0.0:
+            s = math.sqrt(trace + 1.0) * 2.0
+            q = Quaternion(0.25 * s, (m21 - m12) / s, (m02 - m20) / s, (m10 - m01) / s)
+        elif m00 > m11 and m00 > m22:
+            s = math.sqrt(1.0 + m00 - m11 - m22) * 2.0
+            q = Quaternion((m21 - m12) / s, 0.25 * s, (m01 + m10) / s, (m02 + m20) / s)
+        elif m11 > m22:
+            s = math.sqrt(1.0 + m11 - m00 - m22) * 2.0
+            q = Quaternion((m02 - m20) / s, (m01 + m10) / s, 0.25 * s, (m12 + m21) / s)
+        else:
+            s = math.sqrt(1.0 + m22 - m00 - m11) * 2.0
+            q = Quaternion((m10 - m01) / s, (m02 + m20) / s, (m12 + m21) / s, 0.25 * s)
+        return q.normalized()
+
+    @staticmethod
+    def slerp(start, end, t):
+        """
+        2つのクォータニオンの球面線形補間
+        
+        Parameters:
+            start: 開始のクォータニオン
+            end: 終了のクォータニオン
+            t: 補間係数（0.0 で start、1.0 で end）
+            
+        Returns:
+            Quaternion: 補間されたクォータニオン
+        """
+        cos_theta = start.dot(end)
+        # 短い方の経路で補間する
+        if cos_theta < 0.0:
+            end = Quaternion(-end.w, -end.x, -end.y, -end.z)
+            cos_theta = -cos_theta
+        
+        if cos_theta > 0.9995:
+            # ほぼ同じ向きの場合は線形補間
+            return Quaternion(
+                start.w + (end.w - start.w) * t,
+                start.x + (end.x - start.x) * t,
+                start.y + (end.y - start.y) * t,
+                start.z + (end.z - start.z) * t
+            ).normalized()
+        
+        theta = math.acos(cos_theta)
+        sin_theta = math.sin(theta)
+        a = math.sin((1.0 - t) * theta) / sin_theta
+        b = math.sin(t * theta) / sin_theta
+        return Quaternion(
+            start.w * a + end.w * b,
+            start.x * a + end.x * b,
+            start.y * a + end.y * b,
+            start.z * a + end.z * b
+        )
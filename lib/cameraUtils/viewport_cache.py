@@ -0,0 +1,124 @@
+"""
+アクティブビューポートのキャッシュ
+ドキュメント/ワークスペースの切り替えイベントと、カメラ更新の周期ごとのアクティブビューポートの確認で無効化し、
+カメラ操作のたびに app.activeViewport を参照するのを省く
+"""
+
+import adsk.core
+from typing import List, Optional
+
+# Fusionアプリケーション インスタンス
+app: adsk.core.Application = adsk.core.Application.get()
+ui: adsk.core.UserInterface = app.userInterface
+
+
+class _DocumentEventHandler(adsk.core.DocumentEventHandler):
+    def __init__(self, cache: 'ViewportCache'):
+        super().__init__()
+        self.cache = cache
+
+    def notify(self, args: adsk.core.DocumentEventArgs):
+        self.cache.invalidate()
+
+
+class _WorkspaceEventHandler(adsk.core.WorkspaceEventHandler):
+    def __init__(self, cache: 'ViewportCache'):
+        super().__init__()
+        self.cache = cache
+
+    def notify(self, args: adsk.core.WorkspaceEventArgs):
+        self.cache.invalidate()
+
+
+class ViewportCache:
+    """アクティブビューポートのキャッシュ
+
+    connect() でイベントに接続している間は、取得したビューポートを保持して
+    isValid の確認だけで返す。接続していない場合は毎回 app.activeViewport を返す。
+    分割表示などで同じドキュメントの別のビューポートに切り替えた場合はイベントが発生しないので、
+    カメラ更新の周期ごとに check_active() を呼び出して確認する。
+    """
+
+    def __init__(self):
+        self._viewport: Optional[adsk.core.Viewport] = None
+        self._handlers: List = []
+        self._events: List = []
+        self.is_connected = False
+
+        # 無効化されるたびに増える世代番号（利用側のキャッシュ破棄の判定に使用）
+        self.generation = 0
+
+        # 統計（キャッシュから返した回数、APIを参照した回数）
+        self.hits = 0
+        self.lookups = 0
+
+    def connect(self) -> None:
+        """ドキュメント/ワークスペースの切り替えイベントに接続する"""
+        if self.is_connected:
+            return
+
+        document_events = (app.documentActivated, app.documentDeactivated, app.documentClosed)
+        for event in document_events:
+            handler = _DocumentEventHandler(self)
+            event.add(handler)
+            self._events.append(event)
+            self._handlers.append(handler)
+
+        handler = _WorkspaceEventHandler(self)
+        ui.workspaceActivated.add(handler)
+        self._events.append(ui.workspaceActivated)
+        self._handlers.append(handler)
+
+        self.is_connected = True
+        self.invalidate()
+
+    def disconnect(self) -> None:
+        """イベントから切断してキャッシュを破棄する"""
+        for event, handler in zip(self._events, self._handlers):
+            try:
+                event.remove(handler)
+            except Exception:
+                pass
+        self._events = []
+        self._handlers = []
+        self.is_connected = False
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """キャッシュしているビューポートを破棄する"""
+        self._viewport = None
+        self.generation += 1
+
+    def check_active(self) -> None:
+        """アクティブなビューポートが切り替わっていればキャッシュを破棄する（カメラ更新の周期ごとに1回呼び出す）"""
+        viewport = self._viewport
+        if viewport is None:
+            return
+        self.lookups += 1
+        active = app.activeViewport
+        if active is None or active != viewport:
+            self.invalidate()
+
+    def get(self) -> Optional[adsk.core.Viewport]:
+        """アクティブなビューポートを取得する
+
+        Returns:
+            adsk.core.Viewport: アクティブなビューポート（存在しない場合はNone）
+        """
+        viewport = self._viewport
+        if viewport is not None and viewport.isValid:
+            self.hits += 1
+            return viewport
+
+        self.lookups += 1
+        viewport = app.activeViewport
+        if self.is_connected:
+            if self._viewport is not None:
+                # 保持していたビューポートが無効になった
+                self.generation += 1
+            self._viewport = viewport
+        return viewport
+
+
+# 共有インスタンス（モジュール名と区別するため shared_ を付ける）
+shared_viewport_cache = ViewportCache()
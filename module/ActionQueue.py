@@ -0,0 +1,156 @@
+import adsk.core
+import time
+import traceback
+from collections import deque
+from typing import Deque, Optional
+from ..lib import fusionAddInUtils as futil
+from .ActionRegistry import Action
+from .. import config
+
+
+class _PendingAction:
+    """実行待ちの機能（相対回転は合算した角度と回数を保持する）"""
+    __slots__ = ('action', 'angle', 'count', 'repeating')
+
+    def __init__(self, action: Action, count: int = 1, repeating: bool = False):
+        self.action = action
+        self.angle = _normalize_angle(action.rotation[1] * count) if action.rotation else 0.0
+        self.count = count
+        self.repeating = repeating     # 押し続けによる繰り返しを含むか
+
+    def can_merge(self, action: Action) -> bool:
+        """同じ種類の相対回転（軸とスマート回転かが同じ）なら合算できる"""
+        if not self.action.rotation or not action.rotation:
+            return False
+        kind, _, smart = self.action.rotation
+        other_kind, _, other_smart = action.rotation
+        return kind == other_kind and smart == other_smart
+
+
+def _normalize_angle(angle: float) -> float:
+    """角度を (-180, 180] の範囲に正規化する"""
+    angle = angle % 360.0
+    if angle > 180.0:
+        angle -= 360.0
+    return angle
+
+
+class ActionQueue:
+    """ボタンの機能を実行待ちに積み、まとめられる操作をまとめてから実行するキュー
+
+    - 同じ種類の相対回転が続いた場合は角度を合算して1回の回転にする（90度×3 → 270度）
+    - 決まった視点に移動する機能（ホームビュー、ビューキューブなど）が来た場合は実行待ちの操作と実行中のトランジションを
+      破棄し、トランジションの完了を待たずにすぐ実行する
+    - カメラのトランジション中は次の操作を実行せずに待ち、その間に来た操作をまとめる
+    - 相対回転は ACTION_COALESCE_WINDOW 秒の間、続けて押された分をまとめてから実行する
+    - 押し続けによる繰り返しは回数付きで積まれ、待たずに次のカメラ更新で実行する
+    """
+
+    # 合算した回転角がこれ未満の場合は何もしない（度）
+    ZERO_ANGLE: float = 1e-6
+
+    def __init__(self, controller):
+        """
+        Parameters:
+            controller: 機能を実行する CameraController
+        """
+        self.controller = controller
+        self._pending: Deque[_PendingAction] = deque()
+        self._last_enqueue_time = 0.0
+
+        # 統計（受け付けた数、合算・破棄した数、実行した数）
+        self.enqueued = 0
+        self.merged = 0
+        self.dropped = 0
+        self.dispatched = 0
+
+    @property
+    def is_empty(self) -> bool:
+        """実行待ちの操作がないか"""
+        return not self._pending
+
+    def enqueue(self, action: Action, now: Optional[float] = None, count: int = 1, repeating: bool = False) -> None:
+        """機能を実行待ちに追加する（実行は tick() で行う。決まった視点への移動だけはすぐに実行する）
+
+        Parameters:
+            action: 実行する機能
+            now: 追加した時刻
+            count: 実行する回数（相対回転は角度に掛けて合算する）
+            repeating: 押し続けによる繰り返しか
+        """
+        now = time.time() if now is None else now
+        self.enqueued += 1
+        self._last_enqueue_time = now
+
+        if action.absolute:
+            # 決まった視点への移動が来たら、それまでの操作と実行中のトランジションは結果に影響しないので破棄し、
+            # トランジションの完了を待たずに新しい視点へ移動する（同じ視点への移動を繰り返しても結果は同じなので1回だけ実行する）
+            self.dropped += len(self._pending) + count - 1
+            self._pending.clear()
+            self.controller.camera_util.cancel_transition()
+            self.controller.rotations.sequencer.cancel()
+            self._dispatch(_PendingAction(action, 1, repeating))
+            return
+
+        last = self._pending[-1] if self._pending else None
+        if last is not None and last.can_merge(action):
+            last.angle = _normalize_angle(last.angle + action.rotation[1] * count)
+            last.count += count
+            last.repeating = last.repeating or repeating
+            self.merged += 1
+            if abs(last.angle) < self.ZERO_ANGLE:
+                # 打ち消し合って回転しない場合は操作ごと破棄する
+                self._pending.pop()
+                self.dropped += last.count
+            return
+
+        if action.rotation or count == 1:
+            self._pending.append(_PendingAction(action, count, repeating))
+        else:
+            # 相対回転以外は回数分を個別に実行する
+            for _ in range(count):
+                self._pending.append(_PendingAction(action))
+
+    def clear(self) -> None:
+        """実行待ちの操作をすべて破棄する"""
+        self.dropped += len(self._pending)
+        self._pending.clear()
+
+    def tick(self, now: Optional[float] = None) -> None:
+        """実行できる操作を1つ実行する（カメラ更新の周期ごとに呼び出す）"""
+        if not self._pending:
+            return
+
+        # 前の操作のトランジションが終わるまで待つ（待っている間に来た操作はまとめられる）
+        sequencer = self.controller.rotations.sequencer
+        if sequencer.is_busy:
+            return
+
+        now = time.time() if now is None else now
+        head = self._pending[0]
+        if head.action.rotation and not head.repeating and len(self._pending) == 1:
+            # 続けて押される回転をまとめるため、最後の入力から一定時間待つ
+            window = getattr(config, "ACTION_COALESCE_WINDOW", 0.0)
+            if now - self._last_enqueue_time < window:
+                return
+
+        self._pending.popleft()
+        self._dispatch(head)
+
+    def _dispatch(self, pending: _PendingAction) -> None:
+        """まとめた操作を実行し、トランジションを伴う場合は完了待ちを登録する"""
+        action = pending.action
+        self.dispatched += 1
+        try:
+            if pending.count > 1:
+                kind, _, smart = action.rotation
+                self.controller.execute_rotation(action, kind, pending.angle, smart, pending.count)
+            else:
+                self.controller.execute_action(action)
+
+            if action.animates:
+                sequencer = self.controller.rotations.sequencer
+                sequencer.schedule(sequencer.WAIT_FOR_SETTLE)
+        except Exception as e:
+            futil.log(f"ボタン機能の実行に失敗しました ({action.name}): {str(e)}", adsk.core.LogLevels.ErrorLogLevel)
+            futil.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
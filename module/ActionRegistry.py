@@ -0,0 +1,163 @@
+import adsk.core
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 「機能なし」を表す機能名（割り当てに保存されても何も実行しない）
+NO_ACTION = "none"
+
+
+class Action:
+    """ボタンに割り当て可能な機能
+
+    handler は CameraController を引数に取る呼び出し可能オブジェクト
+    """
+    __slots__ = ('name', 'display_name', 'handler', 'animates', 'needs_refresh', 'log_message', 'rotation', 'absolute')
+
+    def __init__(self,
+                 name: str,
+                 display_name: str,
+                 handler: Callable,
+                 animates: bool = False,
+                 needs_refresh: bool = True,
+                 log_message: Optional[str] = None,
+                 rotation: Optional[Tuple[str, float, bool]] = None,
+                 absolute: bool = False):
+        self.name = name
+        self.display_name = display_name
+        self.handler = handler
+        self.animates = animates                # カメラのトランジションを伴うか
+        self.needs_refresh = needs_refresh      # 実行後にビューポートの更新が必要か
+        self.log_message = log_message if log_message is not None else f"{display_name}を実行しました"
+        
+        # 相対回転の場合は (回転の種類, 角度（度）, スマート回転か)。同じ種類の回転は実行待ちの間に合算できる
+        self.rotation = rotation
+        # 現在の向きに関係なく決まった視点に移動するか（実行待ちの前の操作は不要になる）
+        self.absolute = absolute
+
+    def __repr__(self) -> str:
+        return f"Action({self.name!r}, {self.display_name!r})"
+
+
+class ActionRegistry:
+    """ボタンに割り当て可能な機能の登録先
+
+    他のアドインやユーザースクリプトからも register() で機能を追加できる。
+    登録内容が変わるたびに version が増えるので、利用側は割り当ての再解決に使用する。
+    """
+
+    def __init__(self):
+        self._actions: Dict[str, Action] = {}
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def register(self,
+                 name: str,
+                 display_name: str,
+                 handler: Callable,
+                 animates: bool = False,
+                 needs_refresh: bool = True,
+                 log_message: Optional[str] = None,
+                 rotation: Optional[Tuple[str, float, bool]] = None,
+                 absolute: bool = False,
+                 replace: bool = False) -> Action:
+        """機能を登録する
+
+        Parameters:
+            name: 設定ファイルに保存される機能名
+            display_name: 設定画面に表示する名前
+            handler: CameraController を引数に取る呼び出し可能オブジェクト
+            animates: カメラのトランジションを伴うか
+            needs_refresh: 実行後にビューポートの更新が必要か
+            log_message: 実行時のログメッセージ（省略時は表示名から生成）
+            rotation: 相対回転の場合は (回転の種類, 角度（度）, スマート回転か)
+            absolute: 現在の向きに関係なく決まった視点に移動するか
+            replace: 同名の機能が登録済みの場合に置き換えるか
+
+        Returns:
+            Action: 登録した機能
+        """
+        if name == NO_ACTION:
+            raise ValueError(f"'{NO_ACTION}' は予約された機能名です")
+
+        action = Action(name, display_name, handler, animates, needs_refresh, log_message, rotation, absolute)
+        with self._lock:
+            if name in self._actions and not replace:
+                raise ValueError(f"機能 '{name}' は既に登録されています")
+            self._actions[name] = action
+            self.version += 1
+        return action
+
+    def unregister(self, name: str) -> bool:
+        """機能の登録を解除する
+
+        Returns:
+            bool: 登録されていた場合はTrue
+        """
+        with self._lock:
+            if self._actions.pop(name, None) is None:
+                return False
+            self.version += 1
+            return True
+
+    def get(self, name: str) -> Optional[Action]:
+        """機能名から機能を取得する（未登録の場合はNone）"""
+        return self._actions.get(name)
+
+    def names(self) -> List[str]:
+        """登録されている機能名の一覧（「機能なし」を含む）"""
+        return [NO_ACTION] + list(self._actions)
+
+    def choices(self) -> List[Tuple[str, str]]:
+        """設定画面用の (表示名, 機能名) の一覧（先頭は「機能なし」）"""
+        return [("機能なし", NO_ACTION)] + [(action.display_name, action.name) for action in self._actions.values()]
+
+    def function_name_for(self, value: str) -> Optional[str]:
+        """機能名または表示名から機能名を取得する（旧形式の設定の変換用、該当しない場合はNone）"""
+        if value == NO_ACTION or value in self._actions:
+            return value
+        for display_name, name in self.choices():
+            if display_name == value:
+                return name
+        return None
+
+
+def _set_orientation(orientation_name: str) -> Callable:
+    def handler(controller) -> None:
+        controller.camera_util.set_viewcube_orientation(getattr(adsk.core.ViewOrientations, orientation_name))
+    return handler
+
+
+def _register_rotation(registry: ActionRegistry, name: str, display_name: str, kind: str, angle: float, smart: bool) -> None:
+    registry.register(name, display_name, lambda c: c.rotations.rotate(kind, angle, smart),
+                      animates=True, rotation=(kind, angle, smart))
+
+
+def _register_builtin_actions(registry: ActionRegistry) -> None:
+    """アドイン標準の機能を登録する"""
+    registry.register("home_view", "ホームビュー", lambda c: c.navigate_to_home_view(), animates=True, absolute=True)
+    registry.register("fit_view", "フィットビュー", lambda c: c.camera_util.fit_view(), animates=True)
+    registry.register("nearest_viewcube", "最寄りのビューキューブ面", lambda c: c.rotations.move_to_nearest_viewcube_face(), animates=True)
+    registry.register("viewcube_front", "ビューキューブ前面", _set_orientation("FrontViewOrientation"), animates=True, absolute=True)
+    registry.register("viewcube_back", "ビューキューブ背面", _set_orientation("BackViewOrientation"), animates=True, absolute=True)
+    registry.register("viewcube_left", "ビューキューブ左面", _set_orientation("LeftViewOrientation"), animates=True, absolute=True)
+    registry.register("viewcube_right", "ビューキューブ右面", _set_orientation("RightViewOrientation"), animates=True, absolute=True)
+    registry.register("viewcube_top", "ビューキューブ上面", _set_orientation("TopViewOrientation"), animates=True, absolute=True)
+    registry.register("viewcube_bottom", "ビューキューブ下面", _set_orientation("BottomViewOrientation"), animates=True, absolute=True)
+    registry.register("iso_view", "アイソメトリックビュー", lambda c: c.camera_util.set_isometric_view(), animates=True, absolute=True)
+    _register_rotation(registry, "rotate_screen_right", "画面右回転90度", 'horizontal', 90.0, False)
+    _register_rotation(registry, "rotate_screen_left", "画面左回転90度", 'horizontal', -90.0, False)
+    _register_rotation(registry, "smart_rotate_right", "スマート右回転90度", 'horizontal', 90.0, True)
+    _register_rotation(registry, "smart_rotate_left", "スマート左回転90度", 'horizontal', -90.0, True)
+    _register_rotation(registry, "rotate_screen_up", "画面上回転90度", 'vertical', 90.0, False)
+    _register_rotation(registry, "rotate_screen_down", "画面下回転90度", 'vertical', -90.0, False)
+    _register_rotation(registry, "smart_rotate_up", "スマート上回転90度", 'vertical', 90.0, True)
+    _register_rotation(registry, "smart_rotate_down", "スマート下回転90度", 'vertical', -90.0, True)
+    _register_rotation(registry, "rotate_screen_clockwise", "画面垂直時計回り90度", 'axial', 90.0, False)
+    _register_rotation(registry, "rotate_screen_counter_clockwise", "画面垂直反時計回り90度", 'axial', -90.0, False)
+    _register_rotation(registry, "smart_rotate_clockwise", "スマート垂直時計回り90度", 'axial', 90.0, True)
+    _register_rotation(registry, "smart_rotate_counter_clockwise", "スマート垂直反時計回り90度", 'axial', -90.0, True)
+
+
+# Global instance
+action_registry = ActionRegistry()
+_register_builtin_actions(action_registry)
@@ -0,0 +1,154 @@
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+# NumPyがある場合は記録した入力値をまとめて計算する（Fusionの同梱Pythonにはないことがあるので、なければPythonで計算する）
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class AxisCalibration:
+    """1つの軸のキャリブレーション結果（中心のずれ、静止時のノイズ、推奨デッドゾーン、最大の振れ幅）"""
+    __slots__ = ('offset', 'noise', 'std', 'dead_zone', 'outer')
+
+    def __init__(self, offset: float = 0.0, noise: float = 0.0, std: float = 0.0,
+                 dead_zone: Optional[float] = None, outer: float = 1.0):
+        """
+        Parameters:
+            offset: 静止時の中心のずれ（この値を引いてから使用する）
+            noise: 静止時の中心からの最大のずれ（ノイズの大きさ）
+            std: 静止時の標準偏差
+            dead_zone: 推奨デッドゾーン（None の場合はキャリブレーションを適用しない。トリガーなど）
+            outer: 中心のずれを引いた後に到達できる最大の値（これを 1.0 とみなす）
+        """
+        self.offset = float(offset)
+        self.noise = float(noise)
+        self.std = float(std)
+        self.dead_zone = None if dead_zone is None else float(dead_zone)
+        self.outer = float(outer)
+
+    @property
+    def is_valid(self) -> bool:
+        """入力値に適用するか（静止位置が端にある軸は適用しない）"""
+        return self.dead_zone is not None
+
+    def apply(self, value: float) -> float:
+        """中心のずれを引き、デッドゾーン以下を 0、デッドゾーンから最大の振れ幅までを 0.0〜1.0 に変換する"""
+        if self.dead_zone is None:
+            return value
+        value -= self.offset
+        magnitude = abs(value)
+        if magnitude <= self.dead_zone:
+            return 0.0
+        span = self.outer - self.dead_zone
+        scaled = (magnitude - self.dead_zone) / span if span > 1e-6 else 1.0
+        return math.copysign(min(scaled, 1.0), value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """設定ファイルに保存する形式に変換する"""
+        return {'offset': self.offset, 'noise': self.noise, 'std': self.std,
+                'dead_zone': self.dead_zone, 'outer': self.outer}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AxisCalibration':
+        return cls(data.get('offset', 0.0), data.get('noise', 0.0), data.get('std', 0.0),
+                   data.get('dead_zone'), data.get('outer', 1.0))
+
+    def __repr__(self) -> str:
+        if self.dead_zone is None:
+            return f"AxisCalibration(offset={self.offset:.4f}, unused)"
+        return f"AxisCalibration(offset={self.offset:.4f}, noise={self.noise:.4f}, dead_zone={self.dead_zone:.4f})"
+
+
+# 静止時の値がこれより中心から離れている軸（離した状態が -1.0 のトリガーなど）はキャリブレーションしない
+MAX_CENTER_OFFSET = 0.5
+# 推奨デッドゾーンの下限（記録中にノイズが出なかった軸でも、わずかな揺れで書き込みが起きないように）
+MIN_DEAD_ZONE = 0.01
+
+
+def compute_calibration(samples: Sequence[Sequence[float]], margin: float = 1.25) -> List[AxisCalibration]:
+    """静止状態で記録した入力値から軸ごとのキャリブレーションを求める
+
+    中心のずれは中央値、ノイズは中央値からの最大のずれとし、推奨デッドゾーンはノイズに余裕を掛けた値にする。
+    静止状態で記録したすべての入力値がデッドゾーン以下になるため、静止時にカメラへの書き込みが起きない最小の値になる。
+
+    Parameters:
+        samples: ポーリングごとのすべての軸の値（行がポーリング、列が軸）
+        margin: ノイズに掛ける余裕（記録中に出なかった大きさのノイズに備える）
+
+    Returns:
+        list: 軸ごとのキャリブレーション結果（入力値がない場合は空）
+    """
+    if not samples:
+        return []
+    num_axes = min(len(row) for row in samples)
+    if num_axes == 0:
+        return []
+
+    if np is not None:
+        data = np.asarray([row[:num_axes] for row in samples], dtype=float)
+        offsets = np.median(data, axis=0)
+        noises = np.abs(data - offsets).max(axis=0)
+        stds = data.std(axis=0)
+        stats = zip(offsets.tolist(), noises.tolist(), stds.tolist())
+    else:
+        stats = [_column_stats([row[axis] for row in samples]) for axis in range(num_axes)]
+
+    calibrations = []
+    for offset, noise, std in stats:
+        if abs(offset) > MAX_CENTER_OFFSET:
+            calibrations.append(AxisCalibration(offset, noise, std, None))
+            continue
+        dead_zone = max(noise * margin, MIN_DEAD_ZONE)
+        # 中心がずれている分、片側は 1.0 まで届かないので、届く方の端までを最大の振れ幅にする
+        outer = 1.0 - abs(offset)
+        calibrations.append(AxisCalibration(offset, noise, std, min(dead_zone, outer * 0.5), outer))
+    return calibrations
+
+
+def _column_stats(column: List[float]):
+    """1つの軸の中央値、中央値からの最大のずれ、標準偏差（NumPyがない場合）"""
+    n = len(column)
+    ordered = sorted(column)
+    middle = n // 2
+    median = ordered[middle] if n % 2 else (ordered[middle - 1] + ordered[middle]) * 0.5
+    noise = max(ordered[-1] - median, median - ordered[0])
+    mean = sum(column) / n
+    std = math.sqrt(sum((value - mean) ** 2 for value in column) / n)
+    return median, noise, std
+
+
+def parse_calibrations(data: Optional[Dict[str, Any]]) -> Dict[str, List[AxisCalibration]]:
+    """設定ファイルの AXIS_CALIBRATIONS を GUID ごとのキャリブレーション結果に変換する（無効な項目は無視する）"""
+    calibrations = {}
+    for key, entries in (data or {}).items():
+        try:
+            calibrations[key] = [AxisCalibration.from_dict(entry) for entry in entries]
+        except (ValueError, TypeError, AttributeError):
+            continue
+    return calibrations
+
+
+def apply_calibration(values: Sequence[float], calibrations: Sequence[AxisCalibration]) -> List[float]:
+    """すべての軸の値にキャリブレーションを適用する（キャリブレーションのない軸はそのまま）"""
+    count = len(calibrations)
+    return [calibrations[i].apply(value) if i < count else value for i, value in enumerate(values)]
+
+
+class CalibrationRecorder:
+    """一定時間、静止状態の入力値をデバイスごとに記録する"""
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        self.samples: Dict[str, List[List[float]]] = {}
+
+    def add(self, device_values: Dict[Any, Sequence[float]]) -> None:
+        """JoystickManager.get_all_axis_values の結果を記録する（GUIDのキーのみ使用）"""
+        for key, values in device_values.items():
+            if isinstance(key, str) and values:
+                self.samples.setdefault(key, []).append(list(values))
+
+    def finish(self, margin: float) -> Dict[str, List[AxisCalibration]]:
+        """記録した入力値からデバイスごとのキャリブレーション結果を求める"""
+        return {key: compute_calibration(rows, margin) for key, rows in self.samples.items() if rows}
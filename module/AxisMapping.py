@@ -0,0 +1,109 @@
+import adsk.core
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from ..lib import fusionAddInUtils as futil
+from .SharedState import CAMERA_DOFS
+
+
+class AxisMapping:
+    """ジョイスティックの1つの軸とカメラ操作（自由度）の対応付け"""
+    __slots__ = ('axis', 'dof', 'dof_index', 'scale', 'curve', 'invert', 'trigger', 'device')
+
+    def __init__(self,
+                 axis: int,
+                 dof: str,
+                 scale: float = 1.0,
+                 curve: float = 1.0,
+                 invert: bool = False,
+                 trigger: bool = False,
+                 device: Optional[int] = None):
+        """
+        Parameters:
+            axis: 軸のインデックス
+            dof: カメラ操作（CAMERA_DOFS のいずれか）
+            scale: 操作量の倍率
+            curve: 反応曲線（1.0は線形、2.0は二乗カーブ）
+            invert: 符号を反転するか
+            trigger: アナログトリガー（離した状態が -1.0、押し込んだ状態が 1.0）の場合は 0.0〜1.0 に変換する
+            device: 軸を読み取るジョイスティック（Noneの場合は選択されたジョイスティック、複数デバイスモードでのみ有効）
+        """
+        if dof not in CAMERA_DOFS:
+            raise ValueError(f"未知のカメラ操作です: {dof}")
+        self.axis = int(axis)
+        self.dof = dof
+        self.dof_index = CAMERA_DOFS.index(dof)
+        self.scale = float(scale)
+        self.curve = float(curve)
+        self.invert = bool(invert)
+        self.trigger = bool(trigger)
+        self.device = device
+
+    def to_dict(self) -> Dict[str, Any]:
+        """設定ファイルに保存する形式に変換する"""
+        data = {'axis': self.axis, 'dof': self.dof, 'scale': self.scale, 'curve': self.curve,
+                'invert': self.invert, 'trigger': self.trigger}
+        if self.device is not None:
+            data['device'] = self.device
+        return data
+
+    def __repr__(self) -> str:
+        if self.device is not None:
+            return f"AxisMapping({self.axis}, {self.dof!r}, device={self.device!r})"
+        return f"AxisMapping({self.axis}, {self.dof!r})"
+
+
+def default_axis_mappings(axis_x: int, axis_y: int, curve: float) -> List[AxisMapping]:
+    """AXIS_X、AXIS_Y の設定に相当する対応付け（左右で水平回転、上下で垂直回転）"""
+    return [AxisMapping(axis_x, 'yaw', curve=curve), AxisMapping(axis_y, 'pitch', curve=curve)]
+
+
+def parse_axis_mappings(entries: Optional[Sequence[Dict[str, Any]]], default_curve: float) -> List[AxisMapping]:
+    """設定ファイルの AXIS_MAPPINGS を対応付けの一覧に変換する（無効な項目はログに記録して無視する）"""
+    mappings = []
+    for entry in entries or ():
+        try:
+            mappings.append(AxisMapping(
+                entry['axis'],
+                entry['dof'],
+                entry.get('scale', 1.0),
+                entry.get('curve', default_curve),
+                entry.get('invert', False),
+                entry.get('trigger', False),
+                entry.get('device')
+            ))
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            futil.log(f'軸の割り当てが無効です ({entry}): {str(e)}', adsk.core.LogLevels.WarningLogLevel)
+    return mappings
+
+
+def apply_axis_mappings(mappings: Sequence[AxisMapping],
+                        device_values: Mapping[Any, Sequence[float]],
+                        dead_zone: float,
+                        dead_zones: Optional[Mapping[Any, float]] = None) -> List[float]:
+    """軸の値からカメラ操作ごとの操作量を求める（同じカメラ操作に割り当てた軸は、デバイスが異なっても合算する）
+
+    Parameters:
+        mappings: 軸の対応付けの一覧
+        device_values: デバイスごとのすべての軸の値（キー None は選択されたジョイスティック）
+        dead_zone: デッドゾーン（これ未満の値は 0 とみなす）
+        dead_zones: デバイスごとのデッドゾーン（キャリブレーションを適用済みのデバイスは 0.0）
+
+    Returns:
+        list: CAMERA_DOFS の順の操作量
+    """
+    dofs = [0.0] * len(CAMERA_DOFS)
+    for mapping in mappings:
+        values = device_values.get(mapping.device)
+        if values is None or mapping.axis >= len(values):
+            continue
+        value = values[mapping.axis]
+        if mapping.trigger:
+            value = (value + 1.0) * 0.5
+        magnitude = abs(value)
+        if magnitude < (dead_zones.get(mapping.device, dead_zone) if dead_zones else dead_zone):
+            continue
+        if mapping.curve != 1.0:
+            magnitude = magnitude ** mapping.curve
+        if (value < 0.0) != mapping.invert:
+            magnitude = -magnitude
+        dofs[mapping.dof_index] += magnitude * mapping.scale
+    return dofs
@@ -1,10 +1,15 @@
 ﻿import adsk.core
 import adsk.fusion
 import traceback
+import math
+import time
 from typing import List, ClassVar
 from ..lib import fusionAddInUtils as futil
 from ..lib.cameraUtils import CameraUtility, CameraRotations
 from .. import config
+from .ActionRegistry import Action, NO_ACTION, action_registry
+from .ActionQueue import ActionQueue
+from .SharedState import NEUTRAL_MOTION
 
 app: adsk.core.Application = adsk.core.Application.get()
 ui: adsk.core.UserInterface = app.userInterface
@@ -16,17 +21,36 @@ class CameraController:
     """
     rotation_scale: ClassVar[float] = getattr(config, "ROTATION_SCALE", 0.01)
     
+    # ビューポートサイズと画角から求めた1ピクセルあたりの角度を再計算する間隔（秒）
+    PIXEL_ANGLE_REFRESH_INTERVAL: ClassVar[float] = 1.0
+    
     def __init__(self):
         # CameraUtilityのインスタンスを作成、ログ関数を渡す
         self.camera_util = CameraUtility(
             rotation_scale=self.rotation_scale,
             debug=getattr(config, "DEBUG", False),
             use_z_axis_rotation=getattr(config, "USE_Z_AXIS_ROTATION", False),
-            log_function=futil.log
+            log_function=futil.log,
+            transition_duration=getattr(config, "TRANSITION_DURATION", CameraUtility.DEFAULT_TRANSITION_DURATION),
+            transition_easing=getattr(config, "TRANSITION_EASING", CameraUtility.DEFAULT_TRANSITION_EASING)
         )
+        self._settings_generation = getattr(config, "SETTINGS_GENERATION", 0)
         
         # 回転操作用のヘルパークラスを初期化
         self.rotations = CameraRotations(self.camera_util)
+        
+        # 閾値未満のためまだカメラに書き込んでいない操作量（CAMERA_DOFS の順。回転はラジアン）
+        self._pending_motion = list(NEUTRAL_MOTION)
+        self._pixel_angle = 0.0
+        self._pixel_angle_time = 0.0
+        
+        # カメラ書き込みの統計（書き込んだ回数、閾値未満で見送った回数、上限で制限した回数）
+        self.applied_updates = 0
+        self.skipped_updates = 0
+        self.clamped_updates = 0
+        
+        # ボタンの機能は実行待ちに積み、まとめられる操作をまとめてから実行する
+        self.action_queue = ActionQueue(self)
     
     @classmethod
     def set_rotation_scale(cls, value: float) -> None:
@@ -39,30 +63,125 @@ class CameraController:
         # ライブラリの機能を使用してホームビューに移動
         self.camera_util.navigate_to_home_view()
     
+    def tick(self) -> None:
+        """カメラ更新の周期ごとに呼び出し、ビュー遷移アニメーション、スケジュールされた複数ステップのカメラ操作、
+        実行待ちの機能を進める"""
+        generation = getattr(config, "SETTINGS_GENERATION", 0)
+        if generation != self._settings_generation:
+            # 設定が保存/読み込みされたらビュー遷移の設定を反映する
+            self._settings_generation = generation
+            self.camera_util.transition_duration = getattr(config, "TRANSITION_DURATION", CameraUtility.DEFAULT_TRANSITION_DURATION)
+            self.camera_util.transition_easing = getattr(config, "TRANSITION_EASING", CameraUtility.DEFAULT_TRANSITION_EASING)
+        
+        # 分割表示などでアクティブなビューポートが切り替わっていれば、以降の書き込みを新しいビューポートに向ける
+        self.camera_util.viewport_cache.check_active()
+        
+        self.camera_util.advance_transition()
+        self.rotations.tick()
+        self.action_queue.tick()
+    
     def update_camera_position(self, joystick_x: float, joystick_y: float) -> None:
-        """ジョイスティックの入力に基づいてカメラ位置を更新
+        """ジョイスティックの入力に基づいてカメラ位置を更新（水平回転と垂直回転のみ）
         
         Parameters:
             joystick_x: X軸の入力値 (-1.0 から 1.0)
             joystick_y: Y軸の入力値 (-1.0 から 1.0)
         """
+        self.update_camera_motion((joystick_x, joystick_y) + NEUTRAL_MOTION[2:])
+    
+    def update_camera_motion(self, motion) -> None:
+        """カメラ操作ごとの操作量に基づいてカメラ位置を更新
+        
+        すべての操作（回転、平行移動、前後移動）を1つのカメラの変更にまとめ、カメラへの書き込みは1回にする。
+        閾値未満の操作はカメラに書き込まずに蓄積し、回転（yaw/pitch/roll）の蓄積量が回転の閾値を、
+        または移動（pan_x/pan_y/dolly）の蓄積量が移動の閾値を超えた時点でまとめて書き込む
+        （残りは入力停止時に flush_pending_rotation で書き込む）
+        
+        Parameters:
+            motion: CAMERA_DOFS の順の操作量（-1.0 から 1.0 に軸の倍率を掛けた値）
+        """
         try:
             # 入力がほぼゼロの場合は処理をスキップ（パフォーマンス向上）
-            if abs(joystick_x) < 0.005 and abs(joystick_y) < 0.005:
+            if all(abs(value) < 0.005 for value in motion):
+                return
+            
+            # シンプルな回転スケール計算
+            rotation_scale = self.rotation_scale * 0.3
+            
+            # 単純な線形スケーリングで操作量を蓄積
+            pending = self._pending_motion
+            for i, value in enumerate(motion):
+                pending[i] += value * rotation_scale
+            
+            # 回転と移動のどちらの蓄積量も閾値未満ならカメラへの書き込みを見送る
+            # （回転はラジアン、移動は注視点までの距離に対する割合なので別々の閾値と比べる）
+            rotation_threshold = self._get_rotation_threshold()
+            translation_threshold = self._get_translation_threshold()
+            rotation = pending[0] * pending[0] + pending[1] * pending[1] + pending[2] * pending[2]
+            translation = pending[3] * pending[3] + pending[4] * pending[4] + pending[5] * pending[5]
+            if rotation < rotation_threshold * rotation_threshold and translation < translation_threshold * translation_threshold:
+                self.skipped_updates += 1
                 return
             
+            self._apply_pending_rotation()
+            
+        except Exception as e:
+            futil.log(f'Error updating camera position: {str(e)}', adsk.core.LogLevels.ErrorLogLevel)
+            if getattr(config, "DEBUG", False):
+                futil.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
+    
+    def flush_pending_rotation(self) -> None:
+        """蓄積されている閾値未満の操作をカメラに書き込む（入力停止時に呼び出す）"""
+        if self._pending_motion == list(NEUTRAL_MOTION):
+            return
+        try:
+            self._apply_pending_rotation()
+        except Exception as e:
+            futil.log(f'Error flushing camera rotation: {str(e)}', adsk.core.LogLevels.ErrorLogLevel)
+            if getattr(config, "DEBUG", False):
+                futil.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
+    
+    def _apply_pending_rotation(self) -> None:
+        """蓄積された操作量から回転のクォータニオンと移動量を求め、1回の書き込みでカメラに適用する"""
+        yaw, pitch, roll, pan_x, pan_y, dolly = self._pending_motion
+        self._pending_motion = list(NEUTRAL_MOTION)
+        
+        # 1回の書き込みで回転する角度に上限を設ける（メインスレッドが止まった後にカメラが飛ばないように）
+        max_rotation = getattr(config, "MAX_FRAME_ROTATION", 0.0)
+        if max_rotation > 0.0:
+            magnitude = math.sqrt(yaw * yaw + pitch * pitch + roll * roll)
+            if magnitude > max_rotation:
+                scale = max_rotation / magnitude
+                yaw *= scale
+                pitch *= scale
+                roll *= scale
+                self.clamped_updates += 1
+        
+        # 平行移動と前後移動にも上限を設ける（回転と同じくメインスレッドが止まっていた間の蓄積で飛ばないように）
+        max_translation = getattr(config, "MAX_FRAME_TRANSLATION", 0.0)
+        if max_translation > 0.0:
+            magnitude = math.sqrt(pan_x * pan_x + pan_y * pan_y)
+            if magnitude > max_translation:
+                scale = max_translation / magnitude
+                pan_x *= scale
+                pan_y *= scale
+                self.clamped_updates += 1
+            if abs(dolly) > max_translation:
+                dolly = math.copysign(max_translation, dolly)
+                self.clamped_updates += 1
+        
+        # ジョイスティック操作が優先されるため、実行中のビュー遷移と複数ステップの回転はその時点で止める
+        # （実行待ちのボタンの機能はユーザーが押したものなので破棄せず、次の周期で実行する）
+        self.camera_util.cancel_transition()
+        self.rotations.sequencer.cancel()
+        
+        q = None
+        if yaw != 0.0 or pitch != 0.0 or roll != 0.0:
             # カメラベクトルを取得
             forward, right, up = self.camera_util.get_camera_vectors()
             if not forward or not right or not up:
                 return
             
-            # シンプルな回転スケール計算
-            rotation_scale = self.rotation_scale * 0.3
-            
-            # 単純な線形スケーリング
-            joystick_x_scaled = joystick_x * rotation_scale
-            joystick_y_scaled = joystick_y * rotation_scale
-            
             # クォータニオン計算
             from ..lib.cameraUtils.quaternion import Quaternion
             
@@ -72,104 +191,114 @@ class CameraController:
                 world_z_axis = adsk.core.Vector3D.create(0, 0, 1)
                 z_direction = 1 if up.dotProduct(world_z_axis) >= 0 else -1
                 
-                q_vertical = Quaternion.from_axis_angle(right, joystick_y_scaled)
-                q_horizontal = Quaternion.from_axis_angle(world_z_axis, z_direction * -joystick_x_scaled)
+                q_vertical = Quaternion.from_axis_angle(right, pitch)
+                q_horizontal = Quaternion.from_axis_angle(world_z_axis, z_direction * -yaw)
             else:
                 # 通常モード
-                q_vertical = Quaternion.from_axis_angle(right, joystick_y_scaled)
-                q_horizontal = Quaternion.from_axis_angle(up, -joystick_x_scaled)
+                q_vertical = Quaternion.from_axis_angle(right, pitch)
+                q_horizontal = Quaternion.from_axis_angle(up, -yaw)
 
             # 回転を結合
             q = q_horizontal * q_vertical
+            if roll != 0.0:
+                # 視線軸周りの回転
+                q = Quaternion.from_axis_angle(forward, roll) * q
+        
+        # 回転と移動をまとめて適用
+        self.camera_util.move_camera(q, pan_x, pan_y, dolly)
+        self.applied_updates += 1
+    
+    def _get_rotation_threshold(self) -> float:
+        """カメラに書き込む最小回転角（ラジアン）を取得する
+        
+        ROTATION_EPSILON_PIXELS が正の場合は、ビューポートの高さと画角から
+        1ピクセルあたりの角度を求めて閾値を決める（ビューポート情報は一定間隔でのみ再取得）
+        """
+        epsilon = getattr(config, "ROTATION_EPSILON", 0.0)
+        pixels = getattr(config, "ROTATION_EPSILON_PIXELS", 0.0)
+        if pixels <= 0.0:
+            return epsilon
+        return max(epsilon, self._get_pixel_angle() * pixels)
+    
+    def _get_translation_threshold(self) -> float:
+        """カメラに書き込む最小の移動量（注視点までの距離に対する割合。前後移動は距離の対数）を取得する
+        
+        ROTATION_EPSILON_PIXELS が正の場合は、注視点の距離で1ピクセルに相当する移動量を閾値にする
+        （注視点の距離での1ピクセルは距離の 2*tan(fov/2)/高さ 倍なので、1ピクセルあたりの角度と同じ値になる）
+        """
+        epsilon = getattr(config, "TRANSLATION_EPSILON", 0.0)
+        pixels = getattr(config, "ROTATION_EPSILON_PIXELS", 0.0)
+        if pixels <= 0.0:
+            return epsilon
+        return max(epsilon, self._get_pixel_angle() * pixels)
+    
+    def _get_pixel_angle(self) -> float:
+        """ビューポートの高さと画角から1ピクセルあたりの角度を求める（一定間隔でのみ再取得）"""
+        now = time.time()
+        if now - self._pixel_angle_time > self.PIXEL_ANGLE_REFRESH_INTERVAL:
+            self._pixel_angle_time = now
+            try:
+                viewport = self.camera_util.get_viewport()
+                if viewport and viewport.height > 0:
+                    fov = viewport.camera.perspectiveAngle
+                    # 注視点の距離で画面の高さは 2*tan(fov/2)*d、回転で動く量は θ*d
+                    self._pixel_angle = 2.0 * math.tan(fov * 0.5) / viewport.height
+            except Exception:
+                self._pixel_angle = 0.0
+        return self._pixel_angle
+    
+    def enqueue_function(self, function_name: str, count: int = 1, repeating: bool = False) -> None:
+        """機能名を指定して機能を実行待ちに積む（実行はカメラ更新の周期で行う）"""
+        action = action_registry.get(function_name)
+        if action is None:
+            if function_name != NO_ACTION:
+                futil.log(f"未知の機能: {function_name}", adsk.core.LogLevels.WarningLogLevel)
+            return
+        self.action_queue.enqueue(action, count=count, repeating=repeating)
+    
+    def execute_action(self, action: Action) -> None:
+        """登録された機能を実行する"""
+        try:
+            viewport = self.camera_util.get_viewport()
+            if not viewport:
+                futil.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
+                return
             
-            # 回転を適用
-            self.camera_util.rotate_camera_with_quaternion(q)
+            action.handler(self)
+            futil.log(action.log_message, adsk.core.LogLevels.InfoLogLevel)
             
+            # ビューポートを更新
+            if action.needs_refresh:
+                viewport.refresh()
+        
         except Exception as e:
-            futil.log(f'Error updating camera position: {str(e)}', adsk.core.LogLevels.ErrorLogLevel)
-            if getattr(config, "DEBUG", False):
-                futil.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
+            futil.log(f"ボタン機能の実行に失敗しました ({action.name}): {str(e)}", adsk.core.LogLevels.ErrorLogLevel)
+            futil.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
     
-    def execute_button_function(self, function_name: str) -> None:
-        """ボタンに割り当てられた機能を実行する"""
+    def execute_rotation(self, action: Action, kind: str, angle_degrees: float, smart: bool, count: int) -> None:
+        """実行待ちの間に合算した相対回転を1回の回転として実行する"""
         try:
-            viewport = app.activeViewport
+            viewport = self.camera_util.get_viewport()
             if not viewport:
                 futil.log("No active viewport found.", adsk.core.LogLevels.WarningLogLevel)
                 return
-
-            if function_name == "home_view":
-                self.navigate_to_home_view()
-            elif function_name == "fit_view":
-                self.camera_util.fit_view()
-                futil.log("フィットビューを実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "viewcube_front":
-                self.camera_util.set_viewcube_orientation(adsk.core.ViewOrientations.FrontViewOrientation)
-                futil.log("ビューキューブ前面を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "viewcube_back":
-                self.camera_util.set_viewcube_orientation(adsk.core.ViewOrientations.BackViewOrientation)
-                futil.log("ビューキューブ背面を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "viewcube_left":
-                self.camera_util.set_viewcube_orientation(adsk.core.ViewOrientations.LeftViewOrientation)
-                futil.log("ビューキューブ左面を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "viewcube_right":
-                self.camera_util.set_viewcube_orientation(adsk.core.ViewOrientations.RightViewOrientation)
-                futil.log("ビューキューブ右面を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "viewcube_top":
-                self.camera_util.set_viewcube_orientation(adsk.core.ViewOrientations.TopViewOrientation)
-                futil.log("ビューキューブ上面を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "viewcube_bottom":
-                self.camera_util.set_viewcube_orientation(adsk.core.ViewOrientations.BottomViewOrientation)
-                futil.log("ビューキューブ下面を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "iso_view":
-                self.camera_util.set_isometric_view()
-                futil.log("アイソメトリックビューを実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "nearest_viewcube":
-                self.rotations.move_to_nearest_viewcube_face()
-                futil.log("最寄りのビューキューブ面を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "rotate_screen_right":
-                self.rotations.rotate_screen_horizontal(90.0)
-                futil.log("画面右回転90度を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "rotate_screen_left":
-                self.rotations.rotate_screen_horizontal(-90.0)
-                futil.log("画面左回転90度を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "smart_rotate_right":
-                self.rotations.smart_rotate_horizontal(90.0)
-                futil.log("スマート右回転90度を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "smart_rotate_left":
-                self.rotations.smart_rotate_horizontal(-90.0)
-                futil.log("スマート左回転90度を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "rotate_screen_up":
-                self.rotations.rotate_screen_vertical(90.0)
-                futil.log("画面上回転90度を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "rotate_screen_down":
-                self.rotations.rotate_screen_vertical(-90.0)
-                futil.log("画面下回転90度を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "smart_rotate_up":
-                self.rotations.smart_rotate_vertical(90.0)
-                futil.log("スマート上回転90度を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "smart_rotate_down":
-                self.rotations.smart_rotate_vertical(-90.0)
-                futil.log("スマート下回転90度を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "rotate_screen_clockwise":
-                self.rotations.rotate_screen_axial(90.0)
-                futil.log("画面垂直時計回り90度を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "rotate_screen_counter_clockwise":
-                self.rotations.rotate_screen_axial(-90.0)
-                futil.log("画面垂直反時計回り90度を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "smart_rotate_clockwise":
-                self.rotations.smart_rotate_axial(90.0)
-                futil.log("スマート垂直時計回り90度を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            elif function_name == "smart_rotate_counter_clockwise":
-                self.rotations.smart_rotate_axial(-90.0)
-                futil.log("スマート垂直反時計回り90度を実行しました", adsk.core.LogLevels.InfoLogLevel)
-            else:
-                futil.log(f"未知の機能: {function_name}", adsk.core.LogLevels.WarningLogLevel)
-                return
-
+            
+            self.rotations.rotate(kind, angle_degrees, smart)
+            futil.log(f"{action.display_name}×{count}を{angle_degrees:.0f}度の回転として実行しました", adsk.core.LogLevels.InfoLogLevel)
+            
             # ビューポートを更新
-            viewport.refresh()
-
+            if action.needs_refresh:
+                viewport.refresh()
+        
         except Exception as e:
-            futil.log(f"ボタン機能の実行に失敗しました ({function_name}): {str(e)}", adsk.core.LogLevels.ErrorLogLevel)
+            futil.log(f"ボタン機能の実行に失敗しました ({action.name}): {str(e)}", adsk.core.LogLevels.ErrorLogLevel)
             futil.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
+    
+    def execute_button_function(self, function_name: str) -> None:
+        """機能名を指定してボタンに割り当てられた機能を実行する"""
+        action = action_registry.get(function_name)
+        if action is None:
+            if function_name != NO_ACTION:
+                futil.log(f"未知の機能: {function_name}", adsk.core.LogLevels.WarningLogLevel)
+            return
+        self.execute_action(action)
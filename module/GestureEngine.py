@@ -0,0 +1,316 @@
+import adsk.core
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+from ..lib import fusionAddInUtils as futil
+from .SharedState import DPAD_DIRECTIONS, InputEvent
+from .ActionRegistry import action_registry
+
+# ジェスチャーの種類（GESTURE_ASSIGNMENTS のキーの接尾辞）
+GESTURE_PRESS = "press"
+GESTURE_LONG = "long"
+GESTURE_DOUBLE = "double"
+GESTURE_CHORD = "chord"
+
+
+def parse_input(token: str, button_names: Dict[str, int]) -> Any:
+    """割り当てのキーの入力名をボタンのインデックスまたは十字キーの方向に変換する
+
+    Parameters:
+        token: "3"（ボタン番号）、"dpad_up"（十字キー）、"L1"（BUTTON_NAMES に登録した名前）
+        button_names: ボタン名 → ボタン番号
+
+    Returns:
+        int または str: ボタンのインデックス、または十字キーの方向
+    """
+    token = token.strip()
+    if token in DPAD_DIRECTIONS:
+        return token
+    if token in button_names:
+        return int(button_names[token])
+    return int(token)
+
+
+def parse_binding(binding: str, button_names: Dict[str, int]) -> Tuple[str, Any]:
+    """GESTURE_ASSIGNMENTS のキーを (ジェスチャーの種類, 入力) に変換する
+
+    "L1+A" → (GESTURE_CHORD, frozenset({4, 0}))、"3:long" → (GESTURE_LONG, 3)、
+    "dpad_up:double" → (GESTURE_DOUBLE, "dpad_up")、"3" → (GESTURE_PRESS, 3)
+
+    Raises:
+        ValueError: 解釈できないキーの場合
+    """
+    name, _, suffix = binding.partition(":")
+    suffix = suffix.strip() or GESTURE_PRESS
+    if "+" in name:
+        if suffix != GESTURE_PRESS:
+            raise ValueError(f"同時押しには接尾辞を指定できません: {binding}")
+        inputs = frozenset(parse_input(token, button_names) for token in name.split("+"))
+        if len(inputs) < 2:
+            raise ValueError(f"同時押しには2つ以上の入力が必要です: {binding}")
+        return GESTURE_CHORD, inputs
+    if suffix not in (GESTURE_PRESS, GESTURE_LONG, GESTURE_DOUBLE):
+        raise ValueError(f"未知のジェスチャーです: {binding}")
+    return suffix, parse_input(name, button_names)
+
+
+class _KeyState:
+    """入力ごとの押下状態と判定待ちの期限"""
+    __slots__ = ('down', 'down_time', 'consumed', 'single_emitted',
+                 'long_deadline', 'chord_deadline', 'tap_deadline',
+                 'repeat_function', 'repeat_start', 'repeat_deadline')
+
+    def __init__(self):
+        self.down = False
+        self.down_time = 0.0
+        self.consumed = False          # 長押し・同時押し・ダブルタップとして処理済み
+        self.single_emitted = False    # 通常の押下として処理済み
+        self.long_deadline = None      # 長押しと判定する時刻
+        self.chord_deadline = None     # 同時押しの待ちを終える時刻
+        self.tap_deadline = None       # 2回目のタップの待ちを終える時刻
+        self.repeat_function = None    # 押し続けている間に繰り返す機能名
+        self.repeat_start = 0.0        # 繰り返しを開始した時刻
+        self.repeat_deadline = None    # 次に繰り返す時刻
+
+
+class GestureEngine:
+    """ボタン/十字キーの押下・解放のイベントから長押し、同時押し、ダブルタップを判定する
+
+    入力スレッドで process() と tick() を呼び出し、判定した機能名を emit に渡す。
+    長押し・ダブルタップ・同時押しの割り当てがない入力は押した瞬間に通常の押下として判定するため、遅延は発生しない。
+    割り当てがある入力の通常の押下は、それぞれの判定が確定するまで保留する。
+
+    相対回転の機能は押し続けている間、auto_repeat_delay 秒後から繰り返す。
+    繰り返しの間隔は auto_repeat_rate（回/秒）から始まり、auto_repeat_acceleration（回/秒²）で
+    auto_repeat_max_rate まで速くなる。tick() の1回で期限を過ぎた分はまとめて1つの機能（回数付き）として渡す。
+    """
+
+    def __init__(self, emit: Callable[..., None]):
+        """
+        Parameters:
+            emit: 判定した機能を受け取る関数 emit(機能名, 判定内容の説明, 時刻, 回数=1, 繰り返しか=False)
+        """
+        self.emit = emit
+        self.long_press_time = 0.5
+        self.double_tap_window = 0.3
+        self.chord_window = 0.08
+
+        self.auto_repeat_enabled = True
+        self.auto_repeat_delay = 0.5
+        self.auto_repeat_rate = 4.0
+        self.auto_repeat_acceleration = 2.0
+        self.auto_repeat_max_rate = 10.0
+
+        self._press: Dict[Any, str] = {}
+        self._long: Dict[Any, str] = {}
+        self._double: Dict[Any, str] = {}
+        self._chords: Dict[FrozenSet[Any], str] = {}
+        self._chord_members: Dict[Any, List[FrozenSet[Any]]] = {}
+
+        self._states: Dict[Any, _KeyState] = {}
+        # 判定待ちの期限がある入力
+        self._waiting: Dict[Any, _KeyState] = {}
+
+    def configure(self,
+                  button_assignments: Dict[int, str],
+                  dpad_assignments: Dict[str, str],
+                  gesture_assignments: Dict[str, str],
+                  button_names: Dict[str, int],
+                  long_press_time: float,
+                  double_tap_window: float,
+                  chord_window: float,
+                  auto_repeat_enabled: bool = True,
+                  auto_repeat_delay: float = 0.5,
+                  auto_repeat_rate: float = 4.0,
+                  auto_repeat_acceleration: float = 2.0,
+                  auto_repeat_max_rate: float = 10.0) -> None:
+        """割り当てとタイミングの設定を反映する（設定の読み込み時に呼び出す）"""
+        self.long_press_time = long_press_time
+        self.double_tap_window = double_tap_window
+        self.chord_window = chord_window
+
+        self.auto_repeat_enabled = auto_repeat_enabled
+        self.auto_repeat_delay = auto_repeat_delay
+        self.auto_repeat_rate = max(auto_repeat_rate, 0.1)
+        self.auto_repeat_acceleration = max(auto_repeat_acceleration, 0.0)
+        self.auto_repeat_max_rate = max(auto_repeat_max_rate, self.auto_repeat_rate)
+
+        press = {}
+        press.update({int(k): v for k, v in button_assignments.items()})
+        press.update(dpad_assignments)
+        long_map, double_map, chords = {}, {}, {}
+        for binding, function_name in gesture_assignments.items():
+            try:
+                kind, key = parse_binding(binding, button_names)
+            except (ValueError, TypeError) as e:
+                futil.log(f'ジェスチャーの割り当てが無効です ({binding}): {str(e)}', adsk.core.LogLevels.WarningLogLevel)
+                continue
+            {GESTURE_PRESS: press, GESTURE_LONG: long_map, GESTURE_DOUBLE: double_map, GESTURE_CHORD: chords}[kind][key] = function_name
+
+        chord_members: Dict[Any, List[FrozenSet[Any]]] = {}
+        for chord in chords:
+            for key in chord:
+                chord_members.setdefault(key, []).append(chord)
+
+        self._press = {k: v for k, v in press.items() if v != "none"}
+        self._long = {k: v for k, v in long_map.items() if v != "none"}
+        self._double = {k: v for k, v in double_map.items() if v != "none"}
+        self._chords = {k: v for k, v in chords.items() if v != "none"}
+        self._chord_members = chord_members
+        self.reset()
+
+    def reset(self) -> None:
+        """押下状態と判定待ちをすべて破棄する"""
+        self._states.clear()
+        self._waiting.clear()
+
+    def next_deadline(self) -> Optional[float]:
+        """最も早い判定待ちの期限（判定待ちがない場合はNone）"""
+        deadline = None
+        for state in self._waiting.values():
+            for t in (state.long_deadline, state.chord_deadline, state.tap_deadline, state.repeat_deadline):
+                if t is not None and (deadline is None or t < deadline):
+                    deadline = t
+        return deadline
+
+    def process(self, event: InputEvent) -> None:
+        """押下・解放のイベントを処理する"""
+        state = self._states.get(event.key)
+        if state is None:
+            state = self._states[event.key] = _KeyState()
+        if event.pressed:
+            self._on_press(event.key, state, event.timestamp)
+        else:
+            self._on_release(event.key, state, event.timestamp)
+
+    def tick(self, now: float) -> None:
+        """期限を過ぎた判定を確定する（入力スレッドのループごとに呼び出す）"""
+        if not self._waiting:
+            return
+        for key, state in list(self._waiting.items()):
+            if state.long_deadline is not None and now >= state.long_deadline:
+                state.long_deadline = None
+                if state.down and not state.consumed:
+                    # 押し続けているので長押しとして確定
+                    state.consumed = True
+                    state.chord_deadline = None
+                    self.emit(self._long[key], f"{key} 長押し", now)
+            if state.chord_deadline is not None and now >= state.chord_deadline:
+                state.chord_deadline = None
+                if state.down and not state.consumed and key not in self._long and key not in self._double:
+                    # 同時押しにならなかったので通常の押下として確定
+                    self._emit_single(key, state, now)
+            if state.tap_deadline is not None and now >= state.tap_deadline:
+                state.tap_deadline = None
+                if not state.down and not state.consumed:
+                    # 2回目のタップがなかったので通常の押下として確定
+                    self._emit_single(key, state, now)
+            if state.repeat_deadline is not None and now >= state.repeat_deadline:
+                self._emit_repeat(key, state, now)
+            self._update_waiting(key, state)
+
+    def _on_press(self, key: Any, state: _KeyState, now: float) -> None:
+        # 同時押しの判定（他の入力が同時押しの待ち時間内に押されている）
+        for chord in self._chord_members.get(key, ()):
+            if self._is_chord_complete(chord, key, now):
+                for member in chord:
+                    member_state = self._states.setdefault(member, _KeyState())
+                    member_state.consumed = True
+                    member_state.chord_deadline = None
+                    member_state.long_deadline = None
+                    member_state.tap_deadline = None
+                    self._update_waiting(member, member_state)
+                state.down = True
+                state.down_time = now
+                self.emit(self._chords[chord], "+".join(str(k) for k in chord) + " 同時押し", now)
+                return
+
+        # ダブルタップの判定（前回のタップから待ち時間内に押された）
+        if state.tap_deadline is not None and key in self._double:
+            state.tap_deadline = None
+            state.down = True
+            state.down_time = now
+            state.consumed = True
+            self._update_waiting(key, state)
+            self.emit(self._double[key], f"{key} ダブルタップ", now)
+            return
+
+        state.down = True
+        state.down_time = now
+        state.consumed = False
+        state.single_emitted = False
+        state.tap_deadline = None
+
+        has_long = key in self._long
+        has_double = key in self._double
+        has_chord = key in self._chord_members
+        if not (has_long or has_double or has_chord):
+            # 判定待ちが不要なので押した瞬間に確定
+            self._emit_single(key, state, now)
+            return
+
+        if has_long:
+            state.long_deadline = now + self.long_press_time
+        if has_chord:
+            state.chord_deadline = now + self.chord_window
+        self._update_waiting(key, state)
+
+    def _on_release(self, key: Any, state: _KeyState, now: float) -> None:
+        if not state.down:
+            # 設定の反映前から押されていた入力の解放は無視する
+            return
+        state.down = False
+        state.long_deadline = None
+        state.chord_deadline = None
+        state.repeat_deadline = None
+        if not state.consumed and not state.single_emitted:
+            if key in self._double:
+                # 2回目のタップを待つ
+                state.tap_deadline = now + self.double_tap_window
+            else:
+                self._emit_single(key, state, now)
+        self._update_waiting(key, state)
+
+    def _is_chord_complete(self, chord: FrozenSet[Any], key: Any, now: float) -> bool:
+        for member in chord:
+            if member == key:
+                continue
+            member_state = self._states.get(member)
+            if (member_state is None or not member_state.down or member_state.consumed
+                    or member_state.single_emitted or now - member_state.down_time > self.chord_window):
+                return False
+        return True
+
+    def _emit_single(self, key: Any, state: _KeyState, now: float) -> None:
+        state.single_emitted = True
+        function_name = self._press.get(key)
+        if function_name is None:
+            return
+        self.emit(function_name, f"{key} 押下", now)
+
+        if state.down and self.auto_repeat_enabled:
+            # 押し続けている間は相対回転を繰り返す
+            action = action_registry.get(function_name)
+            if action is not None and action.rotation:
+                state.repeat_function = function_name
+                state.repeat_start = now + self.auto_repeat_delay
+                state.repeat_deadline = state.repeat_start
+                self._update_waiting(key, state)
+
+    def _emit_repeat(self, key: Any, state: _KeyState, now: float) -> None:
+        """期限を過ぎた繰り返しの回数を数え、まとめて1つの機能として渡す"""
+        count = 0
+        deadline = state.repeat_deadline
+        while deadline <= now:
+            count += 1
+            # 押し続けた時間に応じて繰り返しの間隔を短くする
+            rate = min(self.auto_repeat_rate + self.auto_repeat_acceleration * (deadline - state.repeat_start),
+                       self.auto_repeat_max_rate)
+            deadline += 1.0 / rate
+        state.repeat_deadline = deadline
+        self.emit(state.repeat_function, f"{key} リピート", now, count, True)
+
+    def _update_waiting(self, key: Any, state: _KeyState) -> None:
+        if (state.long_deadline is None and state.chord_deadline is None
+                and state.tap_deadline is None and state.repeat_deadline is None):
+            self._waiting.pop(key, None)
+        else:
+            self._waiting[key] = state
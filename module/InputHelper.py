@@ -0,0 +1,160 @@
+"""
+ジョイスティックを別のプロセスで読み取り、共有メモリに書き込む補助プロセス（INPUT_BACKEND = 'process' の場合に使用）
+
+Fusion 360 のPythonとは別のインタープリタで動作するので、アドインが忙しい間も一定の間隔で読み取りを続け、
+デバイスドライバーの問題でこのプロセスが落ちてもアドインは影響を受けない。
+アドイン（module/SharedMemoryInputSource.py）から次のように起動される:
+    python InputHelper.py --shm <共有メモリ名> [--guid <GUID>] [--index <インデックス>] [--rate <Hz>]
+
+標準入力が閉じられたら（アドインが終了・クラッシュした場合を含む）終了する。
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from SharedState import dpad_mask_from_hat  # noqa: E402
+from SnapshotBuffer import (BUFFER_SIZE, STATUS_ERROR, STATUS_NO_DEVICE,  # noqa: E402
+                            SnapshotWriter)
+
+# pygameのウィンドウやサポートメッセージを出さない
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pygame  # noqa: E402
+
+_DEVICE_EVENTS = frozenset(getattr(pygame, name) for name in ('JOYDEVICEADDED', 'JOYDEVICEREMOVED') if hasattr(pygame, name))
+_JOYSTICK_EVENTS = [getattr(pygame, name) for name in ('JOYAXISMOTION', 'JOYBALLMOTION', 'JOYHATMOTION', 'JOYBUTTONDOWN',
+                                                       'JOYBUTTONUP', 'JOYDEVICEADDED', 'JOYDEVICEREMOVED') if hasattr(pygame, name)]
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """アドインが作成した共有メモリを開く（削除はアドインが行うので、終了時に削除されないようにする）"""
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name != 'nt':
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        except Exception:
+            pass
+    return shm
+
+
+def open_device(guid: str, index: int):
+    """GUIDが一致するジョイスティックを開く（見つからなければインデックス）。(joystick, キー) を返す"""
+    joysticks = []
+    keys = []
+    for i in range(pygame.joystick.get_count()):
+        joystick = pygame.joystick.Joystick(i)
+        joystick.init()
+        base = joystick.get_guid() if hasattr(joystick, 'get_guid') else joystick.get_name()
+        # JoystickManager と同じく、同じ機種が複数ある場合は番号を付けて区別する
+        key = base
+        duplicate = 1
+        while key in keys:
+            key = f"{base}#{duplicate}"
+            duplicate += 1
+        joysticks.append(joystick)
+        keys.append(key)
+    if not joysticks:
+        return None, None
+    if guid and guid in keys:
+        i = keys.index(guid)
+    else:
+        i = index if 0 <= index < len(joysticks) else 0
+    return joysticks[i], keys[i]
+
+
+def watch_stdin(stop_event: threading.Event) -> None:
+    """標準入力が閉じられるまで待つ（アドインが終了したら補助プロセスも終了する）"""
+    try:
+        while sys.stdin.buffer.read(1024):
+            pass
+    except Exception:
+        pass
+    stop_event.set()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='JoystickCamera input helper')
+    parser.add_argument('--shm', required=True)
+    parser.add_argument('--guid', default='')
+    parser.add_argument('--index', type=int, default=0)
+    parser.add_argument('--rate', type=float, default=250.0)
+    args = parser.parse_args()
+
+    shm = attach_shared_memory(args.shm)
+    if shm.size < BUFFER_SIZE:
+        print(f'shared memory is too small: {shm.size} < {BUFFER_SIZE}', file=sys.stderr)
+        return 2
+    writer = SnapshotWriter(shm.buf)
+
+    stop_event = threading.Event()
+    threading.Thread(target=watch_stdin, args=(stop_event,), daemon=True).start()
+
+    pygame.init()
+    pygame.joystick.init()
+    try:
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(_JOYSTICK_EVENTS)
+    except Exception:
+        pass
+
+    interval = 1.0 / max(args.rate, 1.0)
+    joystick = key = None
+    num_axes = num_buttons = num_hats = 0
+
+    def reopen():
+        nonlocal joystick, key, num_axes, num_buttons, num_hats
+        joystick, key = open_device(args.guid, args.index)
+        if joystick is not None:
+            # 軸・ボタン・ハットの数は変わらないので開いた時に1回だけ取得する
+            num_axes, num_buttons, num_hats = joystick.get_numaxes(), joystick.get_numbuttons(), joystick.get_numhats()
+            print(f'reading {joystick.get_name()} ({key}) at {args.rate:.0f} Hz', file=sys.stderr)
+
+    reopen()
+
+    try:
+        while not stop_event.is_set():
+            next_time = time.monotonic() + interval
+
+            # イベントを処理して状態を更新し、キューを空にする（接続・取り外しがあれば開き直す）
+            if any(event.type in _DEVICE_EVENTS for event in pygame.event.get()):
+                reopen()
+
+            now = time.monotonic()
+            if joystick is None:
+                # 接続されるまで間隔を空けて開き直す
+                writer.set_status(STATUS_NO_DEVICE, now)
+                stop_event.wait(0.5)
+                reopen()
+                continue
+
+            try:
+                axes = [joystick.get_axis(i) for i in range(num_axes)]
+                buttons = 0
+                for i in range(num_buttons):
+                    if joystick.get_button(i):
+                        buttons |= 1 << i
+                dpad = dpad_mask_from_hat(*joystick.get_hat(0)) if num_hats else 0
+                writer.write(now, axes, buttons, dpad, key)
+            except pygame.error as e:
+                print(f'failed to read joystick: {e}', file=sys.stderr)
+                writer.set_status(STATUS_ERROR, now)
+                joystick = None
+
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                stop_event.wait(delay)
+    finally:
+        pygame.quit()
+        writer.buffer = None
+        shm.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
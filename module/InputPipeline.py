@@ -0,0 +1,469 @@
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+from .SharedState import CAMERA_DOFS
+from .AxisCalibration import AxisCalibration, apply_calibration
+
+if TYPE_CHECKING:
+    from .AxisMapping import AxisMapping
+
+# NumPyがある場合は溜まった入力値をまとめて配列で処理する（Fusionの同梱Pythonにはないことがあるので、なければ1件ずつ処理する）
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class InputFrame:
+    """1回のポーリングで取得した入力値と、各段で求めた値（段はこれを書き換えて次の段に渡す）"""
+    __slots__ = ('time', 'device_values', 'selected_device', 'dead_zones', 'channels', 'motion', 'active')
+
+    def __init__(self, now: float, device_values: Dict[Any, Sequence[float]], selected_device: Optional[str] = None):
+        self.time = now
+        # デバイスごとのすべての軸の値（キー None は選択されたジョイスティック、インデックス、GUID）
+        self.device_values = device_values
+        # キー None のデバイスのGUID（None の場合は JoystickManager で選択されたジョイスティック）
+        self.selected_device = selected_device
+        # デバイスごとのデッドゾーン（キャリブレーションを適用済みのデバイスは 0.0）
+        self.dead_zones: Dict[Any, float] = {}
+        # 軸の対応付けごとの値（AxisMapping の順）
+        self.channels: List[float] = []
+        # CAMERA_DOFS の順の操作量
+        self.motion: List[float] = [0.0] * len(CAMERA_DOFS)
+        # 入力があるか（カメラに渡すか）
+        self.active = False
+
+
+class InputBlock:
+    """溜まった複数の入力値をまとめて処理する場合の InputFrame（値は行が入力値、列が軸などの配列）"""
+    __slots__ = ('times', 'device_values', 'selected_device', 'dead_zones', 'channels', 'motion', 'active')
+
+    def __init__(self, times, device_values: Dict[Any, Any], selected_device: Optional[str] = None):
+        self.times = times
+        # デバイスごとのすべての軸の値（形状は (入力値の数, 軸の数)）
+        self.device_values = device_values
+        self.selected_device = selected_device
+        self.dead_zones: Dict[Any, float] = {}
+        # 形状は (入力値の数, 軸の対応付けの数)
+        self.channels = None
+        # 形状は (入力値の数, len(CAMERA_DOFS))
+        self.motion = None
+        # 形状は (入力値の数,)
+        self.active = None
+
+
+class InputStage:
+    """入力処理の1つの段（状態は前回の値など一定の大きさに限る）"""
+    name = 'stage'
+
+    def __init__(self):
+        # 処理時間の計測（InputPipeline の timing が有効な場合のみ更新）
+        self.calls = 0
+        self.elapsed_ns = 0
+
+    def process(self, frame: InputFrame) -> None:
+        raise NotImplementedError
+
+    def process_block(self, block: InputBlock) -> None:
+        """複数の入力値をまとめて処理する（process を入力値ごとに呼び出した場合と同じ結果にする。NumPyがある場合のみ呼ばれる）"""
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """入力が途切れた時などに状態を破棄する"""
+        pass
+
+
+class CalibrationStage(InputStage):
+    """キャリブレーションしたデバイスの軸の値から中心のずれを引き、軸ごとの推奨デッドゾーンを適用する"""
+    name = 'calibration'
+
+    def __init__(self, calibrations: Dict[str, List[AxisCalibration]], joystick_manager):
+        super().__init__()
+        self.calibrations = calibrations
+        self.joystick_manager = joystick_manager
+        # キー（None、インデックス、GUID）からGUIDへの対応（デバイスを列挙し直した場合のみ作り直す）
+        self._keys: Dict[Any, Optional[str]] = {}
+        self._devices = None
+
+    def process(self, frame: InputFrame) -> None:
+        self._update_keys(frame.selected_device)
+
+        # 同じデバイスのキーは同じ値の一覧を共有しているので、デバイスごとに1回だけ補正する
+        device_values = frame.device_values
+        corrected = {}
+        for key, values in device_values.items():
+            calibrations = self.calibrations.get(self._keys.get(key))
+            if calibrations is None:
+                continue
+            shared = corrected.get(id(values))
+            if shared is None:
+                shared = corrected[id(values)] = (values, apply_calibration(values, calibrations))
+            device_values[key] = shared[1]
+            frame.dead_zones[key] = 0.0
+
+    def process_block(self, block: InputBlock) -> None:
+        self._update_keys(block.selected_device)
+        device_values = block.device_values
+        corrected = {}
+        for key, values in device_values.items():
+            calibrations = self.calibrations.get(self._keys.get(key))
+            if calibrations is None:
+                continue
+            shared = corrected.get(id(values))
+            if shared is None:
+                shared = corrected[id(values)] = (values, _calibrate_block(values, calibrations))
+            device_values[key] = shared[1]
+            block.dead_zones[key] = 0.0
+
+    def _update_keys(self, selected: Optional[str]) -> None:
+        """デバイスを列挙し直した場合のみキーとGUIDの対応を作り直す"""
+        manager = self.joystick_manager
+        if selected is None:
+            selected = manager.device.key if manager.device else None
+        if self._devices is not manager.devices or self._keys.get(None) != selected:
+            keys = {None: selected}
+            for index, device in enumerate(manager.devices.values()):
+                keys[index] = keys[device.key] = device.key
+            self._keys = keys
+            self._devices = manager.devices
+
+
+class AxisSelectStage(InputStage):
+    """軸の対応付けごとに軸の値を取り出す（アナログトリガーは 0.0〜1.0 に変換する）"""
+    name = 'select'
+
+    def __init__(self, mappings: Sequence['AxisMapping']):
+        super().__init__()
+        self.mappings = mappings
+
+    def process(self, frame: InputFrame) -> None:
+        device_values = frame.device_values
+        channels = []
+        for mapping in self.mappings:
+            values = device_values.get(mapping.device)
+            if values is None or mapping.axis >= len(values):
+                channels.append(0.0)
+                continue
+            value = values[mapping.axis]
+            if mapping.trigger:
+                value = (value + 1.0) * 0.5
+            channels.append(value)
+        frame.channels = channels
+
+    def process_block(self, block: InputBlock) -> None:
+        device_values = block.device_values
+        channels = np.zeros((len(block.times), len(self.mappings)))
+        for j, mapping in enumerate(self.mappings):
+            values = device_values.get(mapping.device)
+            if values is None or mapping.axis >= values.shape[1]:
+                continue
+            column = values[:, mapping.axis]
+            channels[:, j] = (column + 1.0) * 0.5 if mapping.trigger else column
+        block.channels = channels
+
+
+class DeadZoneStage(InputStage):
+    """デッドゾーン未満の値を 0 にする（キャリブレーションを適用済みのデバイスは除く）"""
+    name = 'dead_zone'
+
+    def __init__(self, mappings: Sequence['AxisMapping'], dead_zone: float):
+        super().__init__()
+        self.devices = [mapping.device for mapping in mappings]
+        self.dead_zone = dead_zone
+
+    def process(self, frame: InputFrame) -> None:
+        channels = frame.channels
+        dead_zones = frame.dead_zones
+        dead_zone = self.dead_zone
+        for i, device in enumerate(self.devices):
+            if abs(channels[i]) < (dead_zones.get(device, dead_zone) if dead_zones else dead_zone):
+                channels[i] = 0.0
+
+    def process_block(self, block: InputBlock) -> None:
+        channels = block.channels
+        dead_zones = block.dead_zones
+        for j, device in enumerate(self.devices):
+            column = channels[:, j]
+            column[np.abs(column) < dead_zones.get(device, self.dead_zone)] = 0.0
+
+
+class CurveStage(InputStage):
+    """反応曲線を適用する（符号はそのまま、大きさを curve 乗する）"""
+    name = 'curve'
+
+    def __init__(self, mappings: Sequence['AxisMapping']):
+        super().__init__()
+        self.curves = [mapping.curve for mapping in mappings]
+
+    def process(self, frame: InputFrame) -> None:
+        channels = frame.channels
+        for i, curve in enumerate(self.curves):
+            value = channels[i]
+            if curve != 1.0 and value != 0.0:
+                magnitude = abs(value) ** curve
+                channels[i] = -magnitude if value < 0.0 else magnitude
+
+    def process_block(self, block: InputBlock) -> None:
+        channels = block.channels
+        for j, curve in enumerate(self.curves):
+            if curve == 1.0:
+                continue
+            column = channels[:, j]
+            nonzero = column != 0.0
+            magnitude = np.abs(column[nonzero]) ** curve
+            column[nonzero] = np.where(column[nonzero] < 0.0, -magnitude, magnitude)
+
+
+class ScaleStage(InputStage):
+    """倍率と符号の反転を掛け、同じカメラ操作に割り当てた値を合算する"""
+    name = 'scale'
+
+    def __init__(self, mappings: Sequence['AxisMapping']):
+        super().__init__()
+        self.targets = [(mapping.dof_index, -mapping.scale if mapping.invert else mapping.scale) for mapping in mappings]
+
+    def process(self, frame: InputFrame) -> None:
+        motion = [0.0] * len(CAMERA_DOFS)
+        channels = frame.channels
+        for i, (dof_index, scale) in enumerate(self.targets):
+            value = channels[i]
+            if value != 0.0:
+                motion[dof_index] += value * scale
+        frame.motion = motion
+
+    def process_block(self, block: InputBlock) -> None:
+        motion = np.zeros((len(block.times), len(CAMERA_DOFS)))
+        channels = block.channels
+        for j, (dof_index, scale) in enumerate(self.targets):
+            motion[:, dof_index] += channels[:, j] * scale
+        block.motion = motion
+
+
+class JumpFilterStage(InputStage):
+    """前回から大きく変化した操作量を前回の値との中間にする（急な飛びを抑える簡単なスムージング）"""
+    name = 'filter'
+
+    def __init__(self, threshold: float = 0.8):
+        super().__init__()
+        self.threshold = threshold
+        self.previous = [0.0] * len(CAMERA_DOFS)
+
+    def process(self, frame: InputFrame) -> None:
+        motion = frame.motion
+        previous = self.previous
+        threshold = self.threshold
+        for i, value in enumerate(motion):
+            if abs(value - previous[i]) > threshold:
+                motion[i] = previous[i] * 0.5 + value * 0.5
+        self.previous = motion
+
+    def process_block(self, block: InputBlock) -> None:
+        """前回の値（スムージング後）に依存するため、差が閾値を超えた入力値とそれに続く入力値のみ1件ずつ処理する"""
+        motion = block.motion
+        if not len(motion):
+            return
+        threshold = self.threshold
+        previous = np.asarray(self.previous, dtype=float)
+        # スムージング前の値どうしの差で飛びの候補を求める（スムージングした直後の入力値は1件ずつ確認する）
+        jumps = np.abs(np.diff(motion, axis=0, prepend=previous[np.newaxis, :])) > threshold
+        for i in range(motion.shape[1]):
+            candidates = np.flatnonzero(jumps[:, i])
+            if not len(candidates):
+                continue
+            column = motion[:, i]
+            raw = column.copy()
+            end = -1
+            for start in candidates.tolist():
+                if start <= end:
+                    continue
+                row = start
+                while row < len(column):
+                    prior = column[row - 1] if row else previous[i]
+                    value = raw[row]
+                    if abs(value - prior) > threshold:
+                        column[row] = prior * 0.5 + value * 0.5
+                    else:
+                        # スムージングしなかった入力値の次からは、スムージング前の値どうしの差で判定できる
+                        break
+                    row += 1
+                end = row
+        self.previous = motion[-1].tolist()
+
+    def reset(self) -> None:
+        self.previous = [0.0] * len(CAMERA_DOFS)
+
+
+class ActivityStage(InputStage):
+    """操作量のいずれかが閾値を超えていれば入力ありとする"""
+    name = 'activity'
+
+    def __init__(self, threshold: float = 0.005):
+        super().__init__()
+        self.threshold = threshold
+
+    def process(self, frame: InputFrame) -> None:
+        threshold = self.threshold
+        frame.active = any(abs(value) > threshold for value in frame.motion)
+
+    def process_block(self, block: InputBlock) -> None:
+        block.active = (np.abs(block.motion) > self.threshold).any(axis=1)
+
+
+class InputPipeline:
+    """入力処理の段を順に実行する
+
+    段は設定から1回だけ組み立て、設定が変わったら組み立て直す。timing を有効にすると
+    段ごとの処理時間をナノ秒単位で計測し、入力側のCPU時間がどこで使われているかを確認できる。
+    """
+
+    def __init__(self, stages: Sequence[InputStage], timing: bool = False):
+        self.stages = list(stages)
+        self.timing = timing
+
+    def run(self, frame: InputFrame) -> InputFrame:
+        """すべての段で入力値を処理する"""
+        if not self.timing:
+            for stage in self.stages:
+                stage.process(frame)
+            return frame
+
+        clock = time.perf_counter_ns
+        for stage in self.stages:
+            start = clock()
+            stage.process(frame)
+            stage.elapsed_ns += clock() - start
+            stage.calls += 1
+        return frame
+
+    def run_block(self, times: Sequence[float], device_values: Dict[Any, Sequence[Sequence[float]]],
+                  selected_device: Optional[str] = None) -> Tuple[Any, Any]:
+        """溜まった複数の入力値をまとめて処理する（入力値ごとに run を呼び出した場合と同じ結果になる）
+
+        NumPyがある場合は各段を配列でまとめて処理し、ない場合は入力値ごとに run を呼び出す。
+
+        Parameters:
+            times: 入力値ごとの取得時刻
+            device_values: デバイスごとのすべての軸の値（行が入力値、列が軸）
+            selected_device: キー None のデバイスのGUID（InputFrame と同じ）
+
+        Returns:
+            tuple: (入力値ごとの CAMERA_DOFS の順の操作量, 入力値ごとに入力があるか)
+        """
+        if np is None:
+            return self._run_rows(times, device_values, selected_device)
+
+        # 同じデバイスのキーは同じ配列を共有させる（CalibrationStage はデバイスごとに1回だけ補正する）
+        arrays = {}
+        blocks = {}
+        for key, values in device_values.items():
+            array = arrays.get(id(values))
+            if array is None:
+                array = arrays[id(values)] = np.asarray(values, dtype=float).reshape(len(times), -1)
+            blocks[key] = array
+        block = InputBlock(times, blocks, selected_device)
+
+        if not self.timing:
+            for stage in self.stages:
+                stage.process_block(block)
+            return block.motion, block.active
+
+        clock = time.perf_counter_ns
+        count = len(times)
+        for stage in self.stages:
+            start = clock()
+            stage.process_block(block)
+            stage.elapsed_ns += clock() - start
+            stage.calls += count
+        return block.motion, block.active
+
+    def _run_rows(self, times: Sequence[float], device_values: Dict[Any, Sequence[Sequence[float]]],
+                  selected_device: Optional[str] = None) -> Tuple[List[List[float]], List[bool]]:
+        """NumPyがない場合は入力値ごとに処理する"""
+        motions = []
+        active = []
+        for row, now in enumerate(times):
+            shared = {}
+            values = {}
+            for key, rows in device_values.items():
+                value = shared.get(id(rows))
+                if value is None:
+                    value = shared[id(rows)] = list(rows[row])
+                values[key] = value
+            frame = self.run(InputFrame(now, values, selected_device))
+            motions.append(frame.motion)
+            active.append(frame.active)
+        return motions, active
+
+    def reset(self) -> None:
+        """各段の状態を破棄する"""
+        for stage in self.stages:
+            stage.reset()
+
+    def get_stage(self, name: str) -> Optional[InputStage]:
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        return None
+
+    def timing_stats(self) -> Dict[str, Dict[str, float]]:
+        """段ごとの呼び出し回数、合計時間（ナノ秒）、平均時間（ナノ秒）"""
+        return {stage.name: {'calls': stage.calls,
+                             'total_ns': stage.elapsed_ns,
+                             'mean_ns': stage.elapsed_ns / stage.calls if stage.calls else 0.0}
+                for stage in self.stages}
+
+    def reset_timing(self) -> None:
+        for stage in self.stages:
+            stage.calls = 0
+            stage.elapsed_ns = 0
+
+    def __repr__(self) -> str:
+        return f"InputPipeline({' -> '.join(stage.name for stage in self.stages)})"
+
+
+def _calibrate_block(values, calibrations: Sequence[AxisCalibration]):
+    """AxisCalibration.apply を配列の列ごとにまとめて適用する"""
+    result = values.copy()
+    for i, calibration in enumerate(calibrations[:values.shape[1]]):
+        if calibration.dead_zone is None:
+            continue
+        column = values[:, i] - calibration.offset
+        magnitude = np.abs(column)
+        span = calibration.outer - calibration.dead_zone
+        if span > 1e-6:
+            scaled = np.minimum((magnitude - calibration.dead_zone) / span, 1.0)
+        else:
+            scaled = np.ones_like(magnitude)
+        result[:, i] = np.where(magnitude <= calibration.dead_zone, 0.0, np.copysign(scaled, column))
+    return result
+
+
+def build_input_pipeline(mappings: Sequence['AxisMapping'],
+                         dead_zone: float,
+                         calibrations: Optional[Dict[str, List[AxisCalibration]]] = None,
+                         joystick_manager=None,
+                         jump_threshold: float = 0.8,
+                         activity_threshold: float = 0.005,
+                         timing: bool = False) -> InputPipeline:
+    """設定から入力処理の段を組み立てる（必要のない段は含めない）
+
+    Parameters:
+        mappings: 軸の対応付けの一覧
+        dead_zone: デッドゾーン（キャリブレーションしていないデバイスに適用する）
+        calibrations: GUID ごとの軸のキャリブレーション結果
+        joystick_manager: キャリブレーションのキーからGUIDを求めるのに使用する JoystickManager
+        jump_threshold: 前回との差がこれを超えたら中間の値にする（0以下の場合はスムージングしない）
+        activity_threshold: 操作量がこれを超えたら入力ありとする
+        timing: 段ごとの処理時間を計測するか
+    """
+    stages: List[InputStage] = []
+    if calibrations and joystick_manager is not None:
+        stages.append(CalibrationStage(calibrations, joystick_manager))
+    stages.append(AxisSelectStage(mappings))
+    stages.append(DeadZoneStage(mappings, dead_zone))
+    if any(mapping.curve != 1.0 for mapping in mappings):
+        stages.append(CurveStage(mappings))
+    stages.append(ScaleStage(mappings))
+    if jump_threshold > 0.0:
+        stages.append(JumpFilterStage(jump_threshold))
+    stages.append(ActivityStage(activity_threshold))
+    return InputPipeline(stages, timing)
@@ -0,0 +1,59 @@
+import adsk.core
+from typing import List, Optional
+from ..lib import fusionAddInUtils as futil
+from .SharedState import InputSnapshot
+
+# アドイン内でpygameを使って読み取る（JoystickManager）。InputSource は使用しない
+BACKEND_PYGAME = 'pygame'
+# 別のプロセスでpygameを使って読み取り、共有メモリで受け取る
+BACKEND_PROCESS = 'process'
+# ローカルのUDPポートで受け取る
+BACKEND_UDP = 'udp'
+# パレットの仮想ジョイスティック（commands/paletteShow）から受け取る
+BACKEND_PALETTE = 'palette'
+
+
+class InputSource:
+    """JoystickManager 以外からコントローラーの状態を受け取る入力元
+
+    入力スレッドはポーリングごとに read を呼び出し、最新の InputSnapshot の操作量を使用する。
+    read はロックを取らず、すぐに返すこと（入力が途切れた場合の扱いは入力スレッドが取得時刻で判断する）。
+    ポーリングの間に複数の状態が届く入力元は、最新より前の状態を read_backlog で返す
+    （入力スレッドはそれらをまとめて処理してスムージングなどの段の状態を進める）。
+    """
+    name = 'source'
+
+    def start(self) -> bool:
+        """入力の受け取りを開始する（失敗した場合はログに記録してFalseを返す）"""
+        return True
+
+    def read(self) -> Optional[InputSnapshot]:
+        """最新の状態を返す（まだ受け取っていなければNone）"""
+        raise NotImplementedError
+
+    def read_backlog(self) -> List[InputSnapshot]:
+        """直前の read で最新の状態に置き換えられた状態を古い順に取り出す（最新の状態だけを持つ入力元は空）"""
+        return []
+
+    def stop(self) -> None:
+        """入力の受け取りを終了し、資源を解放する"""
+        pass
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+def create_input_source(backend: str) -> Optional[InputSource]:
+    """INPUT_BACKEND に対応する入力元を作成する（'pygame' の場合と未知の値の場合はNone）"""
+    if backend == BACKEND_PROCESS:
+        from .SharedMemoryInputSource import SharedMemoryInputSource
+        return SharedMemoryInputSource()
+    if backend == BACKEND_UDP:
+        from .UdpInputSource import UdpInputSource
+        return UdpInputSource()
+    if backend == BACKEND_PALETTE:
+        from .PaletteInputSource import PaletteInputSource
+        return PaletteInputSource()
+    if backend != BACKEND_PYGAME:
+        futil.log(f"未知の入力元です: {backend}。pygameを使用します", adsk.core.LogLevels.WarningLogLevel)
+    return None
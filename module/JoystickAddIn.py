@@ -28,6 +28,15 @@ class JoystickAddIn:
     def run(self, context):
         try:
             futil.log("Joystick Add-In started")
+
+            # 別のプロセスなどから入力を受け取る場合は、アドイン内でpygameを初期化しない
+            from .. import config
+            if getattr(config, 'INPUT_BACKEND', 'pygame') != 'pygame':
+                futil.log(f'Input backend: {config.INPUT_BACKEND}')
+                self.start_joystick_thread()
+                adsk.autoTerminate(False)
+                return
+
             self.joystick_manager.initialize_pygame()
             joysticks = self.joystick_manager.get_joysticks()
 
@@ -35,7 +44,6 @@ class JoystickAddIn:
                 futil.log('No joysticks found.')
                 
                 # 設定からウェルカムメッセージの表示有無を確認
-                from .. import config
                 if config.SHOW_WELCOME_MESSAGE:
                     ui.messageBox('ジョイスティックが見つかりませんでした。ジョイスティックを接続して、アドインを再起動してください。', 'JoystickCamera')
                     
@@ -1,7 +1,9 @@
 import adsk.core
 import traceback
-from typing import List, Optional
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
 from ..lib import fusionAddInUtils as futil
+from .SharedState import dpad_mask_from_hat
 
 # Attempt to import pygame
 try:
@@ -10,6 +12,36 @@ except ImportError:
     futil.log("Pygame library not found. Please install it to use this add-in.", adsk.core.LogLevels.ErrorLogLevel)
     pygame = None
 
+# SDLのイベントキューに積むイベント（ジョイスティックの入力とデバイスの接続・取り外しのみ）
+_JOYSTICK_EVENT_NAMES = ('JOYAXISMOTION', 'JOYBALLMOTION', 'JOYHATMOTION', 'JOYBUTTONDOWN', 'JOYBUTTONUP',
+                         'JOYDEVICEADDED', 'JOYDEVICEREMOVED')
+_JOYSTICK_EVENT_TYPES = [getattr(pygame, name) for name in _JOYSTICK_EVENT_NAMES if hasattr(pygame, name)] if pygame else []
+# デバイス情報の再取得が必要になるイベント（pygame 2 以降）
+_DEVICE_EVENT_TYPES = frozenset(getattr(pygame, name) for name in ('JOYDEVICEADDED', 'JOYDEVICEREMOVED') if hasattr(pygame, name)) if pygame else frozenset()
+# ボタンと十字キーの押下・解放のイベント
+_BUTTON_DOWN = getattr(pygame, 'JOYBUTTONDOWN', None) if pygame else None
+_BUTTON_UP = getattr(pygame, 'JOYBUTTONUP', None) if pygame else None
+_HAT_MOTION = getattr(pygame, 'JOYHATMOTION', None) if pygame else None
+# 入力スレッドが取り出すまで保持するボタンと十字キーのイベントの上限（超えた分は古いものから捨て、状態の読み取りで補う）
+MAX_PENDING_INPUT_EVENTS = 256
+
+class DeviceInfo:
+    """開いたジョイスティックと変化しない情報（名前、軸・ボタン・ハットの数）"""
+    __slots__ = ('key', 'index', 'joystick', 'name', 'num_axes', 'num_buttons', 'num_hats')
+
+    def __init__(self, key: str, index: int, joystick):
+        self.key = key                    # GUID（同じ機種が複数ある場合は "GUID#番号"）
+        self.index = index                # 列挙時のインデックス
+        self.joystick = joystick
+        self.name = joystick.get_name()
+        self.num_axes = joystick.get_numaxes()
+        self.num_buttons = joystick.get_numbuttons()
+        self.num_hats = joystick.get_numhats()
+
+    def __repr__(self) -> str:
+        return f"DeviceInfo({self.key!r}, {self.name!r})"
+
+
 class JoystickManager:
     _instance = None
     
@@ -18,6 +50,12 @@ class JoystickManager:
         if cls._instance is None:
             cls._instance = super(JoystickManager, cls).__new__(cls)
             cls._instance.joystick = None
+            cls._instance.joysticks = []
+            cls._instance.device = None      # 選択されているジョイスティックの DeviceInfo
+            cls._instance.devices = {}       # GUID → DeviceInfo（接続順）
+            cls._instance.devices_changed = False  # デバイスの接続・取り外しのイベントを受け取ったか
+            # 選択されているジョイスティックのボタンと十字キーのイベント（発生順。take_input_events で取り出す）
+            cls._instance.input_events = deque(maxlen=MAX_PENDING_INPUT_EVENTS)
             cls._instance.is_initialized = False
         return cls._instance
     
@@ -39,9 +77,17 @@ class JoystickManager:
             # 完全にクリーンな状態から始める
             if hasattr(pygame, 'quit'):
                 pygame.quit()
+            
+            # 終了前に開いたハンドルは使用できないのでデバイス情報のキャッシュを破棄する
+            self.joystick = None
+            self.device = None
+            self.devices = {}
+            self.joysticks = []
+            self.input_events.clear()
                 
             pygame.init()
             pygame.joystick.init()
+            self._restrict_events()
             self.is_initialized = True
             futil.log("Pygame and joystick module initialized.")
         except Exception as e:
@@ -49,46 +95,164 @@ class JoystickManager:
             futil.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
             self.is_initialized = False
 
-    def get_joysticks(self) -> List:
+    def _restrict_events(self) -> None:
+        """SDLのイベントキューに積むイベントをジョイスティックとデバイスの接続・取り外しに限定する"""
+        try:
+            pygame.event.set_blocked(None)
+            pygame.event.set_allowed(_JOYSTICK_EVENT_TYPES)
+        except Exception as e:
+            # イベントを制限できなくても pump_events でキューは空にするので動作は続ける
+            futil.log(f"イベントの種類を制限できませんでした: {e}", adsk.core.LogLevels.WarningLogLevel)
+    
+    def pump_events(self) -> None:
+        """イベントを処理してジョイスティックの状態を更新し、溜まったイベントを取り出す
+        
+        キューを毎回空にするので、長時間の使用でもキューのメモリは増えない。
+        デバイスの接続・取り外しのイベントがあった場合は devices_changed を立て、選択されているジョイスティックの
+        ボタンと十字キー（最初のハット）のイベントは発生順に input_events に積む（ポーリングの間に押して離した場合も失わないように）
+        """
+        joystick_id = self._selected_joystick_id()
+        for event in pygame.event.get():
+            event_type = event.type
+            if event_type in _DEVICE_EVENT_TYPES:
+                self.devices_changed = True
+            elif event_type == _BUTTON_DOWN or event_type == _BUTTON_UP or event_type == _HAT_MOTION:
+                if joystick_id is None or getattr(event, 'instance_id', getattr(event, 'joy', None)) != joystick_id:
+                    continue
+                if event_type == _HAT_MOTION:
+                    if event.hat == 0:
+                        self.input_events.append(('dpad', dpad_mask_from_hat(*event.value)))
+                else:
+                    self.input_events.append(('button', event.button, event_type == _BUTTON_DOWN))
+    
+    def _selected_joystick_id(self) -> Optional[int]:
+        """選択されているジョイスティックのイベントでの識別番号（pygame 2 はインスタンスID、それより前はデバイス番号）"""
+        joystick = self.joystick
+        if joystick is None:
+            return None
+        try:
+            get_id = getattr(joystick, 'get_instance_id', None) or joystick.get_id
+            return get_id()
+        except Exception:
+            return None
+    
+    def take_input_events(self) -> List[Tuple]:
+        """pump_events で積んだボタンと十字キーのイベントを発生順に取り出す
+        
+        Returns:
+            List[Tuple]: ('button', インデックス, 押されたか) または ('dpad', 十字キーの状態のビットマスク) のリスト
+        """
+        events = []
+        while self.input_events:
+            events.append(self.input_events.popleft())
+        return events
+    
+    def get_joysticks(self, refresh: bool = False) -> List:
+        """開いているジョイスティックの一覧を取得する
+        
+        デバイスの情報はGUIDごとにキャッシュし、接続数が変わった（ホットプラグ）場合か
+        refresh が指定された場合のみ列挙し直す
+        
+        Parameters:
+            refresh: キャッシュを破棄して列挙し直すか
+        """
         if not pygame:
             futil.log("Pygame is not available, cannot get joysticks.", adsk.core.LogLevels.ErrorLogLevel)
             return []
             
         try:
-            # ジョイスティック一覧を取得
             joystick_count = pygame.joystick.get_count()
-            futil.log(f"Found {joystick_count} joysticks")
-            
-            if joystick_count == 0:
-                return []
-            
-            joysticks = []
-            for i in range(joystick_count):
-                joy = pygame.joystick.Joystick(i)
-                joy.init()
-                joysticks.append(joy)
-                futil.log(f"Joystick {i}: {joy.get_name()}, Axes: {joy.get_numaxes()}")
-            
-            # 設定から選択されたジョイスティックのインデックスを取得
-            from .. import config
-            selected_index = getattr(config, 'SELECTED_JOYSTICK', 0)
-            futil.log(f"Using joystick at index {selected_index} from config")
-            
-            # インデックスが範囲外の場合は最初のジョイスティックを使用
-            if selected_index >= len(joysticks):
-                futil.log(f"Selected joystick index {selected_index} is out of range, using first joystick instead")
-                selected_index = 0
+            if refresh or self.devices_changed or joystick_count != len(self.devices):
+                self.devices_changed = False
+                self._enumerate_devices(joystick_count)
             
-            # 選択されたジョイスティックを使用
-            if joysticks:
-                self.joystick = joysticks[selected_index]
-                futil.log(f"Selected joystick: {self.joystick.get_name()}")
-            
-            return joysticks
+            # 設定のGUID（なければインデックス）から使用するジョイスティックを選択
+            self._select_configured_device()
+            return self.joysticks
         except Exception as e:
             futil.log(f"Error getting joysticks: {e}", adsk.core.LogLevels.ErrorLogLevel)
             futil.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
             return []
+    
+    def _enumerate_devices(self, joystick_count: int) -> None:
+        """接続されているジョイスティックを開き、デバイス情報のキャッシュを作り直す"""
+        futil.log(f"Found {joystick_count} joysticks")
+        
+        previous = self.devices
+        devices: Dict[str, DeviceInfo] = {}
+        for i in range(joystick_count):
+            joy = pygame.joystick.Joystick(i)
+            joy.init()
+            guid = joy.get_guid() if hasattr(joy, 'get_guid') else joy.get_name()
+            
+            # 同じ機種を複数接続した場合はGUIDが同じになるので番号を付けて区別する
+            key = guid
+            duplicate = 1
+            while key in devices:
+                key = f"{guid}#{duplicate}"
+                duplicate += 1
+            
+            devices[key] = DeviceInfo(key, i, joy)
+            futil.log(f"Joystick {i}: {devices[key].name}, Axes: {devices[key].num_axes}, GUID: {key}")
+        
+        # 取り外されたデバイスのハンドルを閉じる（同じデバイスは同じオブジェクトが返されるので閉じない）
+        handles = [device.joystick for device in devices.values()]
+        for key, device in previous.items():
+            if key not in devices and not any(device.joystick is handle for handle in handles):
+                try:
+                    device.joystick.quit()
+                except Exception:
+                    pass
+        
+        self.devices = devices
+        self.joysticks = handles
+        self.device = None
+        self.joystick = None
+    
+    def _select_configured_device(self) -> None:
+        """設定で選択されたジョイスティックを使用する（GUIDを優先し、見つからなければインデックス）"""
+        if not self.devices:
+            self.device = None
+            self.joystick = None
+            return
+        
+        from .. import config
+        device = self.devices.get(getattr(config, 'SELECTED_JOYSTICK_GUID', ''))
+        if device is None:
+            selected_index = getattr(config, 'SELECTED_JOYSTICK', 0)
+            devices = list(self.devices.values())
+            # インデックスが範囲外の場合は最初のジョイスティックを使用
+            if selected_index >= len(devices):
+                futil.log(f"Selected joystick index {selected_index} is out of range, using first joystick instead")
+                selected_index = 0
+            device = devices[selected_index]
+        
+        if device is not self.device:
+            self.device = device
+            self.joystick = device.joystick
+            futil.log(f"Selected joystick: {device.name} (GUID: {device.key})")
+    
+    def select_device(self, index: int) -> Optional['DeviceInfo']:
+        """一覧のインデックスでジョイスティックを選択する（設定ダイアログから呼び出す）"""
+        devices = list(self.devices.values())
+        if not 0 <= index < len(devices):
+            return None
+        self.device = devices[index]
+        self.joystick = self.device.joystick
+        return self.device
+    
+    @property
+    def selected_index(self) -> int:
+        """選択されているジョイスティックの一覧でのインデックス"""
+        for i, device in enumerate(self.devices.values()):
+            if device is self.device:
+                return i
+        return 0
+    
+    def device_key_at(self, index: int) -> str:
+        """一覧のインデックスのジョイスティックのGUID（範囲外の場合は空文字列）"""
+        devices = list(self.devices.values())
+        return devices[index].key if 0 <= index < len(devices) else ""
             
     def get_axis_names(self) -> List[str]:
         """現在のジョイスティックの軸一覧を取得する"""
@@ -96,7 +260,7 @@ class JoystickManager:
             return []
             
         try:
-            num_axes = self.joystick.get_numaxes()
+            num_axes = self.device.num_axes
             axis_names = []
             
             # 一般的な軸の名前を提供
@@ -121,11 +285,15 @@ class JoystickManager:
             futil.log(f"軸情報の取得でエラーが発生: {e}", adsk.core.LogLevels.ErrorLogLevel)
             return []
 
-    def get_axes(self) -> Optional[List[float]]:
+    def get_axis_values(self, pump: bool = True) -> Optional[List[float]]:
+        """すべての軸の値を取得する（軸とカメラ操作の対応付けは呼び出し側で行う）
+        
+        Parameters:
+            pump: イベントを処理してから取得するか（同じポーリングで既に pump_events を呼んだ場合はFalse）
+        """
         # ジョイスティックが初期化されていない場合
         if not self.joystick:
             # 設定を確認し、選択されたジョイスティックを再取得
-            from .. import config
             self.initialize_pygame()
             joysticks = self.get_joysticks()
             if not joysticks:
@@ -140,40 +308,31 @@ class JoystickManager:
                 
         try:
             # イベントを処理（これがないとジョイスティックの状態が更新されない）
-            pygame.event.pump()
+            if pump:
+                self.pump_events()
             
             # ジョイスティックが有効かチェック
             if not pygame.joystick.get_init() or not hasattr(self.joystick, 'get_numaxes'):
                 futil.log("Joystick subsystem is not initialized or joystick is invalid, reinitializing...", adsk.core.LogLevels.WarningLogLevel)
                 pygame.joystick.init()
                 # ジョイスティック再取得
+                joysticks = self.get_joysticks(refresh=True)
+                if not joysticks:
+                    return None
+            elif self.devices_changed or pygame.joystick.get_count() != len(self.devices):
+                # デバイスが接続・取り外された場合のみ列挙し直す
                 joysticks = self.get_joysticks()
                 if not joysticks:
                     return None
             
-            # 軸の数を取得
-            num_axes = self.joystick.get_numaxes()
+            # 軸の数はキャッシュした値を使用
+            num_axes = self.device.num_axes
             if num_axes < 2:
                 futil.log("Joystick has less than 2 axes.", adsk.core.LogLevels.WarningLogLevel)
                 return None
             
-            # 設定から軸のインデックスを取得
-            from .. import config
-            axis_x_index = getattr(config, 'AXIS_X', 0)
-            axis_y_index = getattr(config, 'AXIS_Y', 1)
-            
-            # 指定された軸のインデックスが範囲内かチェック
-            if axis_x_index >= num_axes or axis_y_index >= num_axes:
-                futil.log(f"選択された軸が範囲外です。X軸: {axis_x_index}, Y軸: {axis_y_index}, 有効範囲: 0-{num_axes-1}", 
-                          adsk.core.LogLevels.WarningLogLevel)
-                # デフォルトの軸を使用
-                axis_x_index = 0
-                axis_y_index = 1
-            
-            # 設定された軸を使用
-            axis_x = self.joystick.get_axis(axis_x_index)
-            axis_y = self.joystick.get_axis(axis_y_index)
-            return [axis_x, axis_y]
+            get_axis = self.joystick.get_axis
+            return [get_axis(i) for i in range(num_axes)]
         except Exception as e:
             # エラーが発生した場合は再初期化を試みる
             if "video system not initialized" in str(e):
@@ -181,14 +340,67 @@ class JoystickManager:
                 self.is_initialized = False
                 self.initialize_pygame()
                 # 再初期化後も問題があれば静かに失敗する
-                return [0.0, 0.0]  # エラー時はニュートラル位置を返す
+                return []  # エラー時はニュートラル位置として扱う
             else:
                 futil.log(f"Error getting joystick axes: {e}", adsk.core.LogLevels.ErrorLogLevel)
                 return None
 
-    def get_hat_values(self) -> Optional[List[tuple]]:
+    def get_all_axis_values(self) -> Optional[Dict[Any, List[float]]]:
+        """開いているすべてのジョイスティックの軸の値を1回のイベント処理で取得する
+        
+        Returns:
+            dict: {None: 選択されたジョイスティックの値, インデックスまたはGUID: そのジョイスティックの値}。
+            選択されたジョイスティックが使用できない場合はNone
+        """
+        values = self.get_axis_values()
+        if values is None:
+            return None
+        
+        # AXIS_MAPPINGS の device はインデックスとGUIDのどちらでも指定できる
+        device_values = {None: values}
+        for index, device in enumerate(self.devices.values()):
+            if device is self.device:
+                device_values[index] = device_values[device.key] = values
+                continue
+            try:
+                get_axis = device.joystick.get_axis
+                device_values[index] = device_values[device.key] = [get_axis(i) for i in range(device.num_axes)]
+            except Exception:
+                # 取り外されたデバイスなどは読み飛ばす（ポーリングごとにログが出ないように記録しない）
+                continue
+        return device_values
+
+    def get_axes(self) -> Optional[List[float]]:
+        """設定（AXIS_X、AXIS_Y）で選択された2つの軸の値を取得する"""
+        values = self.get_axis_values()
+        if values is None:
+            return None
+        if not values:
+            return [0.0, 0.0]  # エラー時はニュートラル位置を返す
+        
+        # 設定から軸のインデックスを取得
+        from .. import config
+        axis_x_index = getattr(config, 'AXIS_X', 0)
+        axis_y_index = getattr(config, 'AXIS_Y', 1)
+        
+        # 指定された軸のインデックスが範囲内かチェック
+        num_axes = len(values)
+        if axis_x_index >= num_axes or axis_y_index >= num_axes:
+            futil.log(f"選択された軸が範囲外です。X軸: {axis_x_index}, Y軸: {axis_y_index}, 有効範囲: 0-{num_axes-1}", 
+                      adsk.core.LogLevels.WarningLogLevel)
+            # デフォルトの軸を使用
+            axis_x_index = 0
+            axis_y_index = 1
+        
+        # 設定された軸を使用
+        return [values[axis_x_index], values[axis_y_index]]
+
+    def get_hat_values(self, pump: bool = True) -> Optional[List[tuple]]:
         """ジョイスティックの十字キー（ハット）の状態を取得する
         
+        Parameters:
+            pump: イベントを処理してから取得するか
+            
         Returns:
             List[tuple]: 各ハットの(x, y)値のリスト。x, yは-1, 0, 1の値
         """
@@ -197,10 +409,11 @@ class JoystickManager:
             
         try:
             # イベントを処理
-            pygame.event.pump()
+            if pump:
+                self.pump_events()
             
             # ハットの数を取得
-            num_hats = self.joystick.get_numhats()
+            num_hats = self.device.num_hats
             if num_hats == 0:
                 return None
                 
@@ -276,10 +489,10 @@ class JoystickManager:
         
         try:
             # イベントを処理（これがないとボタンの状態が更新されない）
-            pygame.event.pump()
+            self.pump_events()
             
             # ボタン数を確認
-            num_buttons = self.joystick.get_numbuttons()
+            num_buttons = self.device.num_buttons
             if button_index >= num_buttons:
                 futil.log(f"ボタンインデックス {button_index} は範囲外です（最大: {num_buttons-1}）", 
                          adsk.core.LogLevels.WarningLogLevel)
@@ -304,10 +517,10 @@ class JoystickManager:
         
         try:
             # イベントを処理（これがないとボタンの状態が更新されない）
-            pygame.event.pump()
+            self.pump_events()
             
             # ボタン数を取得
-            num_buttons = self.joystick.get_numbuttons()
+            num_buttons = self.device.num_buttons
             button_states = []
             
             # 全ボタンの状態を取得
@@ -320,6 +533,50 @@ class JoystickManager:
             futil.log(f"ボタン状態の取得でエラーが発生しました: {e}", adsk.core.LogLevels.ErrorLogLevel)
             return []
     
+    def get_button_mask(self, pump: bool = True) -> int:
+        """ジョイスティックの全ボタンの状態をビットマスクで取得する
+        
+        Parameters:
+            pump: イベントを処理してから取得するか
+            
+        Returns:
+            int: ビットiがボタンiの状態を表す整数（取得できない場合は0）
+        """
+        if not self.joystick or not self.is_initialized:
+            return 0
+        
+        try:
+            # イベントを処理（これがないとボタンの状態が更新されない）
+            if pump:
+                self.pump_events()
+            
+            joystick = self.joystick
+            mask = 0
+            for i in range(self.device.num_buttons):
+                if joystick.get_button(i):
+                    mask |= 1 << i
+            return mask
+        except Exception as e:
+            futil.log(f"ボタン状態の取得でエラーが発生しました: {e}", adsk.core.LogLevels.ErrorLogLevel)
+            return 0
+    
+    def get_dpad_mask(self, pump: bool = True) -> int:
+        """十字キーの状態をビットマスクで取得する（SharedState.DPAD_BITS）
+        
+        Parameters:
+            pump: イベントを処理してから取得するか
+            
+        Returns:
+            int: 押されている方向のビットを立てた整数（取得できない場合は0）
+        """
+        hat_values = self.get_hat_values(pump)
+        if not hat_values:
+            return 0
+        
+        # 最初のハットを使用
+        hat_x, hat_y = hat_values[0]
+        return dpad_mask_from_hat(hat_x, hat_y)
+    
     def get_button_count(self):
         """ジョイスティックのボタン数を取得する
         
@@ -330,8 +587,7 @@ class JoystickManager:
             return 0
             
         try:
-            num_buttons = self.joystick.get_numbuttons()
-            return num_buttons
+            return self.device.num_buttons
         except Exception as e:
             futil.log(f"ボタン数の取得でエラーが発生しました: {e}", adsk.core.LogLevels.ErrorLogLevel)
             return 0
@@ -346,6 +602,11 @@ class JoystickManager:
                         self.joystick.quit()
                     self.joystick = None
                 
+                # 開いたハンドルは使用できなくなるのでデバイス情報のキャッシュも破棄する
+                self.device = None
+                self.devices = {}
+                self.joysticks = []
+                
                 # Pygameのサブシステムを順番に終了
                 if hasattr(pygame.joystick, 'quit'):
                     pygame.joystick.quit()
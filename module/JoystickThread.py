@@ -4,7 +4,12 @@ import traceback
 import adsk.core
 from ..lib import fusionAddInUtils as futil
 from .JoystickManager import JoystickManager
-from .SharedState import shared_state
+from .SharedState import shared_state, iter_bits, DPAD_DIRECTIONS, CAMERA_DOFS, NEUTRAL_MOTION, InputEvent
+from .GestureEngine import GestureEngine
+from .AxisMapping import default_axis_mappings, parse_axis_mappings
+from .AxisCalibration import CalibrationRecorder, parse_calibrations
+from .InputPipeline import InputFrame, build_input_pipeline
+from .InputSource import BACKEND_PYGAME, create_input_source
 from .. import config
 import time
 
@@ -13,11 +18,39 @@ app = adsk.core.Application.get()
 ui = app.userInterface
 
 class JoystickThread(threading.Thread):
+    # 段ごとの処理時間をログに出力する間隔（秒、INPUT_PIPELINE_TIMING の場合のみ）
+    TIMING_LOG_INTERVAL = 10.0
+
     def __init__(self, joystick_manager: JoystickManager, dead_zone: float = None):
         super().__init__(daemon=True)
         self.joystick_manager = joystick_manager
         self.stop_event = threading.Event()
         self.dead_zone = dead_zone if dead_zone is not None else getattr(config, 'DEAD_ZONE', 0.1)
+        
+        # 長押し・同時押し・ダブルタップを判定し、判定した機能をメインスレッドに渡す
+        self.gesture_engine = GestureEngine(shared_state.push_action)
+        self._settings_generation = None
+        
+        # 軸とカメラ操作の対応付けと、軸の値から操作量を求める処理の段（設定の読み込み時に組み立て直す）
+        self.axis_mappings = []
+        self.pipeline = None
+        self._mapping_key = None
+        self._timing_log_time = 0.0
+        
+        # デバイスごとの軸のキャリブレーション結果（GUID → 軸ごとの結果）
+        self.calibrations = {}
+        # 設定画面から要求されたキャリブレーション（記録する秒数）と記録中の入力値
+        self._calibration_request = None
+        self._calibration_recorder = None
+        
+        # JoystickManager 以外の入力元（INPUT_BACKEND が 'pygame' 以外の場合）
+        self.input_source = None
+        self._input_backend = BACKEND_PYGAME
+        # 入力元から最新の状態より前に届いた状態（_read_snapshot で更新する）
+        self._backlog = []
+        
+        # イベントを取りこぼして読み取った状態に合わせた押下・解放の数（JoystickManager から読み取る場合）
+        self.resynced_edges = 0
         futil.log(f"JoystickThread initialized. Dead zone: {self.dead_zone}")
 
     def run(self) -> None:
@@ -28,86 +61,92 @@ class JoystickThread(threading.Thread):
                 from .. import config
                 self.dead_zone = getattr(config, 'DEAD_ZONE', 0.1)
                 
-                # ジョイスティックの軸の値を取得
-                axes = self.joystick_manager.get_axes()
-                if axes:
-                    joystick_x, joystick_y = axes
-                    
-                    # デバッグ用：ジョイスティック入力の詳細ログ
-                    if config.DEBUG and (abs(joystick_x) > 0.01 or abs(joystick_y) > 0.01):
-                        futil.log(f"Raw joystick input: X={joystick_x:.3f}, Y={joystick_y:.3f}", adsk.core.LogLevels.InfoLogLevel)
+                # 軸の割り当てを反映する（AXIS_X、AXIS_Y、RESPONSE_CURVE、DEAD_ZONE はダイアログから直接変更されることがある）
+                mapping_key = (config.SETTINGS_GENERATION, getattr(config, 'AXIS_X', 0), getattr(config, 'AXIS_Y', 1), getattr(config, 'RESPONSE_CURVE', 1.0), self.dead_zone)
+                if self._mapping_key != mapping_key:
+                    self._mapping_key = mapping_key
+                    self._configure_axes()
+                
+                # 入力元が変更されたら切り替える
+                backend = getattr(config, 'INPUT_BACKEND', BACKEND_PYGAME)
+                if backend != self._input_backend:
+                    self._configure_input_source(backend)
+                
+                if self._calibration_request is not None or self._calibration_recorder is not None:
+                    # キャリブレーション中は静止状態の入力値を記録し、カメラは動かさない
+                    self._record_calibration()
+                    continue
+                
+                # すべての軸の値を取得する
+                now = time.monotonic()
+                snapshot = None
+                if self.input_source is not None:
+                    # 別のプロセスなどの入力元からは最新の状態を受け取る（選択されたジョイスティックのみ）
+                    snapshot = self._read_snapshot(now)
+                    device_values = {None: snapshot.axes} if snapshot else None
+                    if self._backlog:
+                        self._run_backlog(self._backlog, snapshot.device)
+                elif getattr(config, 'MULTI_DEVICE_ENABLED', False):
+                    # 複数デバイスモードでは開いているすべてのデバイスを1回のイベント処理で読み取り、1つの操作量にまとめる
+                    device_values = self.joystick_manager.get_all_axis_values()
                 else:
-                    joystick_x, joystick_y = 0.0, 0.0
+                    axis_values = self.joystick_manager.get_axis_values()
+                    device_values = {None: axis_values} if axis_values else None
 
-                # 反応曲線を取得
-                response_curve = getattr(config, 'RESPONSE_CURVE', 1.0)
+                # 設定が保存/読み込みされたらボタンの割り当てを反映する
+                if self._settings_generation != config.SETTINGS_GENERATION:
+                    self._settings_generation = config.SETTINGS_GENERATION
+                    self._configure_gestures()
                 
-                # デッドゾーン適用
-                if abs(joystick_x) < self.dead_zone:
-                    joystick_x = 0.0
-                if abs(joystick_y) < self.dead_zone:
-                    joystick_y = 0.0
+                if device_values:
+                    # キャリブレーション、デッドゾーン、反応曲線、倍率、スムージングを順に適用してカメラ操作ごとの操作量に変換する
+                    frame = self.pipeline.run(InputFrame(now, device_values, snapshot.device if snapshot else None))
+                    motion = frame.motion
+                    input_activity = frame.active
                     
-                # 反応曲線を適用（シンプル化）
-                if joystick_x != 0.0:
-                    sign_x = 1 if joystick_x > 0 else -1
-                    joystick_x = sign_x * (abs(joystick_x) ** response_curve)
-                    
-                if joystick_y != 0.0:
-                    sign_y = 1 if joystick_y > 0 else -1
-                    joystick_y = sign_y * (abs(joystick_y) ** response_curve)
-
-                # ボタン処理（すべての状態を保存）
-                if config.BUTTON_ENABLED:
-                    button_states = self.joystick_manager.get_all_button_states()
-                    # すべてのボタンの状態を保存（押された/離されたの両方を検出するため）
-                    shared_state.button_states = {i: pressed for i, pressed in enumerate(button_states)}
-                else:
-                    shared_state.button_states = {}
-
-                # 十字キー処理（すべての状態を保存）
-                if getattr(config, 'DPAD_ENABLED', True):
-                    dpad_states = self.joystick_manager.get_dpad_button_states()
-                    # すべての十字キーの状態を保存（押された/離されたの両方を検出するため）
-                    shared_state.dpad_states = {direction: pressed for direction, pressed in dpad_states.items()}
+                    # デバッグ用：ジョイスティック入力の詳細ログ
+                    if config.DEBUG and any(abs(v) > 0.01 for v in motion):
+                        futil.log(f"Joystick motion: {dict(zip(CAMERA_DOFS, motion))}", adsk.core.LogLevels.InfoLogLevel)
                 else:
-                    shared_state.dpad_states = {}
-
-                # 簡単なスムージング（軽量化）
-                if hasattr(self, 'prev_x') and hasattr(self, 'prev_y'):
-                    # 急激な変化のみチェック
-                    if abs(joystick_x - self.prev_x) > 0.8 or abs(joystick_y - self.prev_y) > 0.8:
-                        joystick_x = self.prev_x * 0.5 + joystick_x * 0.5
-                        joystick_y = self.prev_y * 0.5 + joystick_y * 0.5
+                    self.pipeline.reset()
+                    motion = list(NEUTRAL_MOTION)
+                    input_activity = False
+                
+                if self.pipeline.timing and now - self._timing_log_time > self.TIMING_LOG_INTERVAL:
+                    self._log_pipeline_timing(now)
                 
-                # 現在値を保存
-                self.prev_x = joystick_x
-                self.prev_y = joystick_y
+                # ボタンと十字キーの押下・解放を検出し、ジェスチャーを判定する
+                buttons_enabled = config.BUTTON_ENABLED
+                dpad_enabled = buttons_enabled and getattr(config, 'DPAD_ENABLED', True)
+                if self.input_source is not None:
+                    input_events = ()
+                    button_mask = snapshot.buttons if snapshot and buttons_enabled else 0
+                    dpad_mask = snapshot.dpad if snapshot and dpad_enabled else 0
+                else:
+                    # イベントは軸の取得時に処理済みなので、ボタンと十字キーの取得では処理しない（1回のポーリングで1回のみ）
+                    # ポーリングの間に押して離したボタンは状態には残らないので、その間のイベントも受け取る
+                    input_events = self.joystick_manager.take_input_events()
+                    button_mask = self.joystick_manager.get_button_mask(pump=False) if buttons_enabled else 0
+                    dpad_mask = self.joystick_manager.get_dpad_mask(pump=False) if dpad_enabled else 0
+                self._publish_edges(button_mask, dpad_mask, now, input_events, buttons_enabled, dpad_enabled)
+                self.gesture_engine.tick(now)
 
                 # SharedStateの更新（軽量化）
-                input_activity = abs(joystick_x) > 0.005 or abs(joystick_y) > 0.005
-                button_activity = any(shared_state.button_states.values()) if hasattr(shared_state, 'button_states') else False
-                dpad_activity = any(shared_state.dpad_states.values()) if hasattr(shared_state, 'dpad_states') else False
-                
-                if input_activity:  # ジョイスティック入力がある場合
-                    shared_state.joystick_x = joystick_x
-                    shared_state.joystick_y = joystick_y
-                    shared_state.is_dirty = True
+                if input_activity:  # ジョイスティック入力がある場合（すべての軸の操作量を1つの値として渡す）
+                    shared_state.publish_motion(motion, now)
                     
                     # 動きがある場合は高頻度でポーリング（30Hz）- 負荷軽減
-                    time.sleep(0.033)  # 33ms間隔
-                elif button_activity or dpad_activity:  # ボタンまたは十字キーが押されている場合
+                    self._sleep(0.033)  # 33ms間隔
+                elif button_mask | dpad_mask:  # ボタンまたは十字キーが押されている場合
                     # ボタン処理のためにより高頻度でポーリング
-                    time.sleep(0.05)  # 50ms間隔 - ボタンレスポンス向上
+                    self._sleep(0.05)  # 50ms間隔 - ボタンレスポンス向上
                 else:
-                    # 動きがない場合：無駄な更新を避ける
-                    if shared_state.is_dirty:
-                        shared_state.joystick_x = 0.0
-                        shared_state.joystick_y = 0.0
-                        shared_state.is_dirty = False
+                    # 動きがない場合：無駄な更新を避ける（入力が止まった時点を1回だけ記録する）
+                    if shared_state.is_dirty or not shared_state.is_motion_neutral:
+                        shared_state.clear_motion(now)
                     
                     # 動きがない場合は低頻度でポーリング（10Hz）- ボタンレスポンス向上のため間隔短縮
-                    time.sleep(0.1)  # 100ms間隔 - ボタン押下の検出速度向上
+                    self._sleep(0.1)  # 100ms間隔 - ボタン押下の検出速度向上
                 
                 # スリープはif-else文に移動したため、ここでは行わない
 
@@ -128,7 +167,207 @@ class JoystickThread(threading.Thread):
                     futil.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
                     time.sleep(0.5)  # エラー後は少し待つ
 
+        if self.input_source is not None:
+            self.input_source.stop()
+            self.input_source = None
         futil.log("JoystickThread stopped.")
 
+    def _publish_edges(self, button_mask: int, dpad_mask: int, now: float, input_events=(), buttons_enabled: bool = True, dpad_enabled: bool = True) -> None:
+        """ボタンと十字キーの押下・解放をジェスチャーの判定に渡す
+        
+        押下・解放は JoystickManager.take_input_events のイベント（SDLが受け取った順）から作る。
+        読み取った状態（ビットマスク）との比較は、イベントを取りこぼした場合やイベントがない入力元の場合に
+        状態を合わせるためだけに行う
+        
+        Parameters:
+            button_mask: 読み取ったボタンの状態
+            dpad_mask: 読み取った十字キーの状態
+            now: 読み取った時刻
+            input_events: 前回のポーリングからのボタンと十字キーのイベント（発生順）
+            buttons_enabled: ボタンのイベントを使うか
+            dpad_enabled: 十字キーのイベントを使うか
+        """
+        for event in input_events:
+            if event[0] == 'button':
+                if buttons_enabled:
+                    _, index, pressed = event
+                    bit = 1 << index
+                    self._publish_buttons(shared_state.button_mask | bit if pressed else shared_state.button_mask & ~bit, now)
+            elif dpad_enabled:
+                self._publish_dpad(event[1], now)
+        
+        # イベントを適用した後も状態が一致しない場合は読み取った状態に合わせる
+        resynced = self._publish_buttons(button_mask, now) + self._publish_dpad(dpad_mask, now)
+        if resynced and self.input_source is None:
+            self.resynced_edges += resynced
+            if config.DEBUG:
+                futil.log(f"ボタンのイベントと状態が一致しないため状態に合わせました（累計 {self.resynced_edges} 件）")
+    
+    def _publish_buttons(self, button_mask: int, now: float) -> int:
+        """ボタンの前回から変化したビットだけ押下・解放のイベントをジェスチャーの判定に渡し、その数を返す"""
+        changed = button_mask ^ shared_state.button_mask
+        count = 0
+        for index in iter_bits(changed):
+            bit = 1 << index
+            shared_state.button_mask ^= bit
+            self.gesture_engine.process(InputEvent(now, 'button', index, bool(button_mask & bit), shared_state.button_mask, shared_state.dpad_mask))
+            count += 1
+        return count
+    
+    def _publish_dpad(self, dpad_mask: int, now: float) -> int:
+        """十字キーの前回から変化した方向だけ押下・解放のイベントをジェスチャーの判定に渡し、その数を返す"""
+        changed = dpad_mask ^ shared_state.dpad_mask
+        count = 0
+        for index in iter_bits(changed):
+            bit = 1 << index
+            shared_state.dpad_mask ^= bit
+            self.gesture_engine.process(InputEvent(now, 'dpad', DPAD_DIRECTIONS[index], bool(dpad_mask & bit), shared_state.button_mask, shared_state.dpad_mask))
+            count += 1
+        return count
+
+    def _configure_axes(self) -> None:
+        """configの軸の割り当てを反映する（AXIS_MAPPINGS が空の場合は AXIS_X、AXIS_Y を使用する）"""
+        response_curve = getattr(config, 'RESPONSE_CURVE', 1.0)
+        mappings = parse_axis_mappings(getattr(config, 'AXIS_MAPPINGS', None), response_curve)
+        if not mappings:
+            mappings = default_axis_mappings(getattr(config, 'AXIS_X', 0), getattr(config, 'AXIS_Y', 1), response_curve)
+        self.axis_mappings = mappings
+        futil.log(f"軸の割り当てを反映しました: {mappings}")
+        
+        self.calibrations = parse_calibrations(getattr(config, 'AXIS_CALIBRATIONS', None)) if getattr(config, 'CALIBRATION_ENABLED', True) else {}
+        if self.calibrations:
+            futil.log(f"軸のキャリブレーション結果を反映しました: {self.calibrations}")
+        
+        # 軸の値から操作量を求める処理の段を組み立て直す（スムージングの状態は引き継がない）
+        self.pipeline = build_input_pipeline(
+            mappings,
+            self.dead_zone,
+            self.calibrations,
+            self.joystick_manager,
+            timing=getattr(config, 'INPUT_PIPELINE_TIMING', False)
+        )
+        self._timing_log_time = time.monotonic()
+        futil.log(f"入力処理の段を組み立てました: {self.pipeline}")
+
+    def _log_pipeline_timing(self, now: float) -> None:
+        """段ごとの処理時間をログに出力して計測をやり直す"""
+        self._timing_log_time = now
+        stats = self.pipeline.timing_stats()
+        summary = ', '.join(f"{name}={stat['mean_ns'] / 1000:.1f}µs" for name, stat in stats.items() if stat['calls'])
+        total = sum(stat['total_ns'] for stat in stats.values())
+        futil.log(f"入力処理の段ごとの平均処理時間: {summary}（合計 {total / 1e6:.2f}ms）")
+        self.pipeline.reset_timing()
+
+    def request_calibration(self, duration: float = None) -> None:
+        """軸のキャリブレーションを要求する（入力スレッドで静止状態の入力値を記録し、結果を設定に保存する）"""
+        self._calibration_request = duration if duration is not None else getattr(config, 'CALIBRATION_DURATION', 3.0)
+
+    @property
+    def is_calibrating(self) -> bool:
+        return self._calibration_request is not None or self._calibration_recorder is not None
+
+    def _record_calibration(self) -> None:
+        """開いているすべてのデバイスの入力値を記録し、記録時間が過ぎたらキャリブレーション結果を保存する"""
+        now = time.monotonic()
+        if self._calibration_recorder is None:
+            duration = self._calibration_request
+            self._calibration_request = None
+            self._calibration_recorder = CalibrationRecorder(now + duration)
+            # 記録中はカメラを動かさない
+            self.pipeline.reset()
+            shared_state.clear_motion(now)
+            futil.log(f"軸のキャリブレーションを開始しました（{duration:.1f}秒）。ジョイスティックに触れないでください")
+        
+        recorder = self._calibration_recorder
+        if self.input_source is not None:
+            snapshot = self._read_snapshot(now)
+            device_values = {snapshot.device: snapshot.axes} if snapshot and snapshot.device else None
+        else:
+            device_values = self.joystick_manager.get_all_axis_values()
+        if device_values:
+            recorder.add(device_values)
+        if now < recorder.deadline:
+            # 短い間隔で記録してノイズを取りこぼさないようにする
+            time.sleep(0.01)
+            return
+        
+        self._calibration_recorder = None
+        results = recorder.finish(getattr(config, 'CALIBRATION_MARGIN', 1.25))
+        if not results:
+            futil.log("キャリブレーションの入力値を記録できませんでした", adsk.core.LogLevels.WarningLogLevel)
+            return
+        for key, calibrations in results.items():
+            futil.log(f"軸のキャリブレーション結果 ({key}, {len(recorder.samples[key])}件): {calibrations}")
+        
+        stored = dict(getattr(config, 'AXIS_CALIBRATIONS', {}))
+        stored.update({key: [calibration.to_dict() for calibration in calibrations] for key, calibrations in results.items()})
+        config.AXIS_CALIBRATIONS = stored
+        # 保存すると設定の世代が変わり、次のポーリングで結果が反映される
+        config.save_settings()
+
+    def _configure_input_source(self, backend: str) -> None:
+        """入力元を切り替える（'pygame' の場合は JoystickManager から直接読み取る）"""
+        if self.input_source is not None:
+            self.input_source.stop()
+            self.input_source = None
+        self._input_backend = backend
+        
+        # 前の入力元の間に積まれたジョイスティックのイベントは使わない
+        self.joystick_manager.take_input_events()
+        
+        source = create_input_source(backend)
+        if source is not None and source.start():
+            self.input_source = source
+            futil.log(f"入力元を切り替えました: {source}")
+        elif source is not None:
+            futil.log(f"入力元 {backend} を開始できませんでした", adsk.core.LogLevels.ErrorLogLevel)
+            source.stop()
+        self.pipeline.reset()
+
+    def _read_snapshot(self, now: float):
+        """入力元から最新の状態を受け取る（INPUT_SOURCE_TIMEOUT 秒以上更新がなければ入力なしとする）
+        
+        最新の状態より前にポーリングの間に届いた状態は _backlog に古い順に入れる
+        """
+        snapshot = self.input_source.read()
+        self._backlog = self.input_source.read_backlog()
+        if snapshot is None or now - snapshot.timestamp > getattr(config, 'INPUT_SOURCE_TIMEOUT', 0.5):
+            self._backlog = []
+            return None
+        return snapshot
+    
+    def _run_backlog(self, backlog, device) -> None:
+        """最新の状態より前に届いた状態をまとめて処理し、スムージングなどの段の状態を送信側の頻度どおりに進める
+        （操作量は最新の状態のものだけを使う）"""
+        width = max(len(snapshot.axes) for snapshot in backlog)
+        if not width:
+            return
+        rows = [tuple(snapshot.axes) + (0.0,) * (width - len(snapshot.axes)) for snapshot in backlog]
+        self.pipeline.run_block([snapshot.timestamp for snapshot in backlog], {None: rows}, device)
+
+    def _configure_gestures(self) -> None:
+        """configのボタン割り当てとジェスチャーの設定をジェスチャーの判定に反映する"""
+        self.gesture_engine.configure(
+            getattr(config, 'BUTTON_ASSIGNMENTS', {}),
+            getattr(config, 'DPAD_ASSIGNMENTS', {}),
+            getattr(config, 'GESTURE_ASSIGNMENTS', {}),
+            getattr(config, 'BUTTON_NAMES', {}),
+            getattr(config, 'LONG_PRESS_TIME', 0.5),
+            getattr(config, 'DOUBLE_TAP_WINDOW', 0.3),
+            getattr(config, 'CHORD_WINDOW', 0.08),
+            getattr(config, 'AUTO_REPEAT_ENABLED', True),
+            getattr(config, 'AUTO_REPEAT_DELAY', 0.5),
+            getattr(config, 'AUTO_REPEAT_RATE', 4.0),
+            getattr(config, 'AUTO_REPEAT_ACCELERATION', 2.0),
+            getattr(config, 'AUTO_REPEAT_MAX_RATE', 10.0)
+        )
+
+    def _sleep(self, interval: float) -> None:
+        """ポーリング間隔だけ待つ（ジェスチャーの判定待ちの期限がそれより早い場合は期限まで）"""
+        deadline = self.gesture_engine.next_deadline()
+        if deadline is not None:
+            interval = min(interval, max(deadline - time.monotonic(), 0.001))
+        time.sleep(interval)
+
     def stop(self) -> None:
         self.stop_event.set()
@@ -0,0 +1,90 @@
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+class MotionIntegrator:
+    """前回のカメラ更新から今回までのすべての入力値を、保持された時間で重み付けして積分する
+
+    入力スレッドのポーリング間隔とカメラの更新間隔は一致しないため、最新の入力値だけを使うと
+    その間の操作が失われる。各入力値は次の入力値を取得するまで続いたとみなして時間で積分し、
+    基準の時間あたりの操作量に換算する。これにより、入力とカメラの更新間隔を変えても
+    同じ操作で同じだけカメラが動く。
+    """
+
+    def __init__(self, reference_interval: float = 0.032):
+        """
+        Parameters:
+            reference_interval: 積分した操作量をこの時間あたりの操作量に換算する（秒）。
+                                 この間隔でカメラを更新した場合に最新の入力値を使うのと同じ操作量になる
+        """
+        self.reference_interval = reference_interval
+        # 最後に取得した入力値（次の入力値を取得するまで続いているとみなす）と取得時刻
+        self._held: Tuple[float, ...] = ()
+        self._held_time = 0.0
+        # どの時刻まで積分したか
+        self._time: Optional[float] = None
+
+    def reset(self) -> None:
+        """保持している入力値を破棄する"""
+        self._held = ()
+        self._held_time = 0.0
+        self._time = None
+
+    @property
+    def is_idle(self) -> bool:
+        """保持している入力値がない、またはすべて 0 か"""
+        return not any(self._held)
+
+    def integrate(self,
+                  samples: Iterable[Tuple[Sequence[float], float]],
+                  now: float,
+                  stale_horizon: float,
+                  tail: Optional[Sequence[float]] = None) -> Optional[List[float]]:
+        """前回の呼び出しから now までの入力値を積分する
+
+        Parameters:
+            samples: 前回の呼び出し以降に取得した (入力値, 取得時刻) の一覧（古い順）
+            now: 現在の時刻（time.monotonic()）
+            stale_horizon: 取得からこの時間を過ぎた入力値は続いているとみなさない（秒）
+            tail: 最後の入力値の取得時刻から now までに使用する入力値（予測した値など。省略時は最後の入力値）
+
+        Returns:
+            list: 基準の時間あたりに換算した操作量。積分する入力値がない場合はNone
+        """
+        start = now - stale_horizon
+        if self._time is None or self._time < start:
+            # メインスレッドが止まっていた間の古い入力は積分しない
+            self._time = start
+
+        total: List[float] = []
+        for values, sample_time in samples:
+            if sample_time <= self._time:
+                # 積分済みの区間の入力値は、それ以降の区間の値として保持するだけ
+                self._held, self._held_time = tuple(values), sample_time
+                continue
+            self._accumulate(total, self._held, sample_time, stale_horizon)
+            self._held, self._held_time = tuple(values), sample_time
+
+        held = self._held
+        if tail is not None and len(tail) == len(held):
+            held = tuple(tail)
+        self._accumulate(total, held, now, stale_horizon)
+
+        if not total or not any(total):
+            return None
+        scale = 1.0 / self.reference_interval if self.reference_interval > 0.0 else 1.0
+        return [value * scale for value in total]
+
+    def _accumulate(self, total: List[float], values: Sequence[float], until: float, stale_horizon: float) -> None:
+        """保持している入力値を until まで積分する（取得から stale_horizon を過ぎた分は積分しない）"""
+        begin = self._time
+        self._time = max(until, begin)
+        duration = min(until, self._held_time + stale_horizon) - begin
+        if not values or duration <= 0.0:
+            return
+        if not total:
+            total.extend(0.0 for _ in values)
+        elif len(total) != len(values):
+            return
+        for i, value in enumerate(values):
+            if value:
+                total[i] += value * duration
@@ -0,0 +1,122 @@
+from collections import deque
+from typing import Deque, List, Sequence, Tuple
+
+
+class MotionPredictor:
+    """ジョイスティックの入力値をカメラに適用される時刻まで外挿する
+
+    入力の取得からカメラへの書き込みまでには、入力スレッドのポーリング間隔、タイマーの間隔、
+    Fusionのイベントキューの待ちがある。直近の入力値の履歴から速度を求め、実測した遅延の分だけ
+    先の入力値を予測することで、更新頻度を上げずに素早い操作の追従を良くする。
+
+    予測が行き過ぎないように、外挿する時間、入力値の変化量、入力値の範囲に上限を設け、
+    入力値が 0 に向かっている場合は 0 を超えて符号が反転しないようにする。
+    """
+
+    # 遅延の移動平均の係数
+    LATENCY_SMOOTHING: float = 0.1
+    # この時間以上入力が途切れたら履歴を破棄する（秒）
+    HISTORY_GAP: float = 0.2
+
+    def __init__(self,
+                 history_size: int = 4,
+                 max_horizon: float = 0.1,
+                 max_delta: float = 0.3,
+                 extra_latency: float = 0.0):
+        """
+        Parameters:
+            history_size: 速度を求めるのに使用する入力値の数
+            max_horizon: 外挿する最大の時間（秒）
+            max_delta: 予測で加える入力値の変化量の上限
+            extra_latency: 実測できない遅延（描画など）として加える時間（秒）
+        """
+        self._history: Deque[Tuple[Tuple[float, ...], float]] = deque(maxlen=max(history_size, 2))
+        self.max_horizon = max_horizon
+        self.max_delta = max_delta
+        self.extra_latency = extra_latency
+
+        # 入力の取得から画面に反映されるまでの遅延の移動平均（秒）
+        self.latency = 0.0
+
+    def configure(self, history_size: int, max_horizon: float, max_delta: float, extra_latency: float) -> None:
+        """設定を反映する（設定の読み込み時に呼び出す）"""
+        history_size = max(int(history_size), 2)
+        if history_size != self._history.maxlen:
+            self._history = deque(self._history, maxlen=history_size)
+        self.max_horizon = max(max_horizon, 0.0)
+        self.max_delta = max(max_delta, 0.0)
+        self.extra_latency = max(extra_latency, 0.0)
+
+    def reset(self) -> None:
+        """履歴を破棄する"""
+        self._history.clear()
+
+    def observe(self, values: Sequence[float], sample_time: float) -> None:
+        """新しい入力値を履歴に追加する"""
+        history = self._history
+        if history:
+            last_time = history[-1][1]
+            if sample_time <= last_time:
+                return
+            if sample_time - last_time > self.HISTORY_GAP or len(values) != len(history[-1][0]):
+                history.clear()
+        history.append((tuple(values), sample_time))
+
+    def record_latency(self, latency: float) -> None:
+        """入力の取得から画面に反映されるまでの遅延（適用時の入力の経過時間 + 更新間隔）を記録する"""
+        if self.latency == 0.0:
+            self.latency = latency
+        else:
+            self.latency += (latency - self.latency) * self.LATENCY_SMOOTHING
+
+    def predict(self) -> Tuple[float, ...]:
+        """画面に反映される時点の入力値を予測する
+
+        Returns:
+            tuple: 予測した入力値（カメラ操作ごとの操作量）。履歴が足りない場合は最新の入力値
+        """
+        history = self._history
+        if not history:
+            return ()
+        values = history[-1][0]
+        if len(history) < 2:
+            return values
+
+        # 実測した遅延の分だけ外挿する
+        horizon = min(self.latency + self.extra_latency, self.max_horizon)
+        if horizon <= 0.0:
+            return values
+
+        previous = history[-2][0]
+        return tuple(self._extrapolate(value, previous[i], velocity * horizon)
+                     for i, (value, velocity) in enumerate(zip(values, self._velocity())))
+
+    def _velocity(self) -> List[float]:
+        """履歴の最小二乗直線の傾き（入力値/秒）"""
+        history = self._history
+        n = len(history)
+        dims = len(history[-1][0])
+        t0 = history[0][1]
+        mean_t = sum(t - t0 for _, t in history) / n
+        means = [sum(values[i] for values, _ in history) / n for i in range(dims)]
+        var_t = 0.0
+        covs = [0.0] * dims
+        for values, t in history:
+            dt = t - t0 - mean_t
+            var_t += dt * dt
+            for i in range(dims):
+                covs[i] += dt * (values[i] - means[i])
+        if var_t < 1e-12:
+            return [0.0] * dims
+        return [cov / var_t for cov in covs]
+
+    def _extrapolate(self, value: float, previous: float, delta: float) -> float:
+        delta = max(-self.max_delta, min(self.max_delta, delta))
+        predicted = value + delta
+        reference = value if value != 0.0 else previous
+        if reference * predicted < 0.0:
+            # 0 を超えて反対方向に行き過ぎない
+            return 0.0
+        # 倍率を掛けた操作量は 1.0 を超えることがあるので、範囲は現在の値と 1.0 の大きい方にする
+        limit = max(1.0, abs(value))
+        return max(-limit, min(limit, predicted))
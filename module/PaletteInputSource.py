@@ -0,0 +1,73 @@
+import adsk.core
+import json
+import time
+from typing import Optional, Tuple
+from ..lib import fusionAddInUtils as futil
+from .InputSource import InputSource
+from .SharedState import InputSnapshot
+
+# パレットから送られる仮想ジョイスティックのアクション名（commands/paletteShow/resources/html/static/palette.js）
+PALETTE_INPUT_ACTION = 'virtualJoystick'
+# 仮想ジョイスティックの軸の数の上限
+MAX_AXES = 16
+
+# 最後に受け取ったメッセージ（受け取った時刻、JSON文字列）。
+# パレットのイベントはメインスレッドで高い頻度で届くので、受け取った時は解析せずに置き換えるだけにする
+_latest_message: Optional[Tuple[float, str]] = None
+
+
+def post_palette_input(data: str) -> None:
+    """パレットから受け取った仮想ジョイスティックの状態を保存する（メインスレッドから呼び出す）"""
+    global _latest_message
+    # タプルの代入は1回で行われるので、入力スレッドが途中の状態を読むことはない
+    _latest_message = (time.monotonic(), data)
+
+
+class PaletteInputSource(InputSource):
+    """パレットの仮想ジョイスティック（画面上のスティックとボタン）の状態を使用する
+
+    パレットからのメッセージは入力スレッドのポーリングの間に何件届いても最後の1件だけを使い、
+    JSONの解析は新しいメッセージがあった場合にポーリングごとに1回だけ行う。
+    """
+    name = 'palette'
+
+    def __init__(self):
+        self.received = 0
+        self.malformed = 0
+        self._message: Optional[Tuple[float, str]] = None
+        self._snapshot: Optional[InputSnapshot] = None
+
+    def start(self) -> bool:
+        global _latest_message
+        _latest_message = None
+        futil.log("パレットの仮想ジョイスティックから入力を受け取ります（パレットを表示してください）")
+        return True
+
+    def read(self) -> Optional[InputSnapshot]:
+        message = _latest_message
+        if message is None or message is self._message:
+            return self._snapshot
+        self._message = message
+
+        receive_time, data = message
+        try:
+            state = json.loads(data)
+            axes = tuple(max(-1.0, min(1.0, float(value))) for value in state.get('axes', ())[:MAX_AXES])
+            buttons = int(state.get('buttons', 0))
+            dpad = int(state.get('dpad', 0))
+        except (ValueError, TypeError, AttributeError) as e:
+            self.malformed += 1
+            if self.malformed == 1:
+                futil.log(f"仮想ジョイスティックの状態を読み取れませんでした: {str(e)}", adsk.core.LogLevels.WarningLogLevel)
+            return self._snapshot
+
+        self.received += 1
+        self._snapshot = InputSnapshot(self.received, receive_time, axes, buttons, dpad, self.name)
+        return self._snapshot
+
+    def stop(self) -> None:
+        futil.log(f"パレットの仮想ジョイスティックの入力を終了しました (受信: {self.received}, 不正: {self.malformed})")
+        self._snapshot = None
+
+    def __repr__(self) -> str:
+        return "PaletteInputSource()"
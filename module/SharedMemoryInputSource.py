@@ -0,0 +1,166 @@
+import adsk.core
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from multiprocessing import shared_memory
+from typing import List, Optional
+from ..lib import fusionAddInUtils as futil
+from .. import config
+from .InputSource import InputSource
+from .SharedState import InputSnapshot
+from .SnapshotBuffer import BUFFER_SIZE, STATUS_ERROR, STATUS_NO_DEVICE, SnapshotReader
+
+# 補助プロセスのスクリプト
+HELPER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'InputHelper.py')
+# 補助プロセスの標準エラー出力（起動失敗などの調査用）
+HELPER_LOG_PATH = os.path.join(tempfile.gettempdir(), 'JoystickCamera_input_helper.log')
+
+
+class SharedMemoryInputSource(InputSource):
+    """別のプロセス（module/InputHelper.py）で読み取ったジョイスティックの状態を共有メモリから受け取る
+
+    補助プロセスは Fusion 360 のPythonとGILを共有しないので、アドインが忙しい間も読み取りを続ける。
+    補助プロセスが終了した場合は一定の間隔を空けて起動し直す（その間の入力はなし）。
+    """
+    name = 'process'
+
+    # 補助プロセスが生きているか確認する間隔（秒）
+    CHECK_INTERVAL = 1.0
+    # 補助プロセスが終了してから起動し直すまでの時間（秒）
+    RESTART_DELAY = 2.0
+
+    def __init__(self):
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.reader: Optional[SnapshotReader] = None
+        self.process: Optional[subprocess.Popen] = None
+        self._log_file = None
+        self._check_time = 0.0
+        self._restart_time: Optional[float] = None
+        self._last_status = None
+        self.restarts = 0
+
+    def start(self) -> bool:
+        try:
+            # プロセスごとに異なる名前にする（同じPCで複数のFusionを起動した場合）
+            self.shm = shared_memory.SharedMemory(name=f"jcam_{os.getpid()}", create=True, size=BUFFER_SIZE)
+            self.shm.buf[:BUFFER_SIZE] = bytes(BUFFER_SIZE)
+            self.reader = SnapshotReader(self.shm.buf)
+            if self._spawn():
+                return True
+            # 起動できなかった場合も作成した共有メモリを解放する
+            self.stop()
+            return False
+        except Exception as e:
+            futil.log(f"入力の補助プロセスを開始できませんでした: {str(e)}", adsk.core.LogLevels.ErrorLogLevel)
+            futil.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
+            self.stop()
+            return False
+
+    def read(self) -> Optional[InputSnapshot]:
+        if self.reader is None:
+            return None
+        now = time.monotonic()
+        if now - self._check_time > self.CHECK_INTERVAL:
+            self._check_time = now
+            self._supervise(now)
+        snapshot = self.reader.read()
+        if self.reader.status != self._last_status:
+            self._last_status = self.reader.status
+            if self._last_status == STATUS_NO_DEVICE:
+                futil.log("入力の補助プロセス: ジョイスティックが見つかりません", adsk.core.LogLevels.WarningLogLevel)
+            elif self._last_status == STATUS_ERROR:
+                futil.log(f"入力の補助プロセス: ジョイスティックを読み取れませんでした（{HELPER_LOG_PATH}）", adsk.core.LogLevels.WarningLogLevel)
+        return snapshot
+
+    def stop(self) -> None:
+        process = self.process
+        self.process = None
+        if process is not None:
+            try:
+                # 標準入力を閉じると補助プロセスは終了する
+                if process.stdin:
+                    process.stdin.close()
+                process.wait(timeout=1.0)
+            except Exception:
+                process.kill()
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        self.reader = None
+        if self.shm is not None:
+            try:
+                self.shm.close()
+                self.shm.unlink()
+            except Exception as e:
+                futil.log(f"共有メモリを解放できませんでした: {str(e)}", adsk.core.LogLevels.WarningLogLevel)
+            self.shm = None
+
+    def _spawn(self) -> bool:
+        """補助プロセスを起動する"""
+        python = find_python()
+        if not python:
+            futil.log("補助プロセスを起動するPythonが見つかりません（INPUT_HELPER_PYTHON を設定してください）", adsk.core.LogLevels.ErrorLogLevel)
+            return False
+
+        command = [python, HELPER_SCRIPT, '--shm', self.shm.name,
+                   '--guid', getattr(config, 'SELECTED_JOYSTICK_GUID', ''),
+                   '--index', str(getattr(config, 'SELECTED_JOYSTICK', 0)),
+                   '--rate', str(getattr(config, 'INPUT_HELPER_RATE', 250.0))]
+        # アドインと同じ場所にインストールされたpygameを使えるようにする
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(path for path in sys.path if path and os.path.isdir(path))
+        if self._log_file is None:
+            self._log_file = open(HELPER_LOG_PATH, 'a')
+        creationflags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._log_file,
+                                        env=env, creationflags=creationflags)
+        self._restart_time = None
+        futil.log(f"入力の補助プロセスを起動しました (pid={self.process.pid}, {python})")
+        return True
+
+    def _supervise(self, now: float) -> None:
+        """補助プロセスが終了していれば時間を空けて起動し直す"""
+        process = self.process
+        if process is not None and process.poll() is None:
+            return
+        if self._restart_time is None:
+            code = process.returncode if process is not None else None
+            futil.log(f"入力の補助プロセスが終了しました (終了コード: {code})。{self.RESTART_DELAY}秒後に起動し直します（{HELPER_LOG_PATH}）",
+                      adsk.core.LogLevels.WarningLogLevel)
+            self.process = None
+            self._restart_time = now + self.RESTART_DELAY
+        elif now >= self._restart_time:
+            self.restarts += 1
+            try:
+                spawned = self._spawn()
+            except Exception as e:
+                futil.log(f"入力の補助プロセスを起動し直せませんでした: {str(e)}", adsk.core.LogLevels.ErrorLogLevel)
+                spawned = False
+            if not spawned:
+                # 次の確認ですぐに起動し直さず、RESTART_DELAY 秒空ける
+                self._restart_time = now + self.RESTART_DELAY
+
+    def __repr__(self) -> str:
+        pid = self.process.pid if self.process is not None else None
+        return f"SharedMemoryInputSource(pid={pid})"
+
+
+def find_python() -> Optional[str]:
+    """補助プロセスを実行するPythonを探す（Fusion 360 の sys.executable はFusion本体のため使用できない）"""
+    configured = getattr(config, 'INPUT_HELPER_PYTHON', '')
+    if configured:
+        return configured if os.path.isfile(configured) else None
+
+    candidates: List[str] = []
+    if os.path.basename(sys.executable).lower().startswith('python'):
+        candidates.append(sys.executable)
+    for prefix in (sys.prefix, sys.exec_prefix):
+        candidates += [os.path.join(prefix, 'python.exe'), os.path.join(prefix, 'bin', 'python3'), os.path.join(prefix, 'bin', 'python')]
+    for path in candidates:
+        if os.path.isfile(path):
+            return path
+    return shutil.which('python3') or shutil.which('python')
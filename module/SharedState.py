@@ -1,11 +1,159 @@
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+# 十字キーの方向とビットマスクのビット
+DPAD_DIRECTIONS: Tuple[str, ...] = ("dpad_up", "dpad_down", "dpad_left", "dpad_right")
+DPAD_BITS: Dict[str, int] = {direction: 1 << i for i, direction in enumerate(DPAD_DIRECTIONS)}
+
+
+# ジョイスティックの軸で操作するカメラの自由度（水平回転、垂直回転、視線軸周りの回転、左右移動、上下移動、前後移動）
+CAMERA_DOFS: Tuple[str, ...] = ("yaw", "pitch", "roll", "pan_x", "pan_y", "dolly")
+NEUTRAL_MOTION: Tuple[float, ...] = (0.0,) * len(CAMERA_DOFS)
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """ビットマスクで立っているビットのインデックスを下位から順に返す"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def dpad_mask_from_hat(hat_x: int, hat_y: int) -> int:
+    """ハットの値 (x, y) を十字キーのビットマスクに変換する（pygameでは上が1、下が-1）"""
+    mask = 0
+    if hat_y == 1:
+        mask |= DPAD_BITS["dpad_up"]
+    elif hat_y == -1:
+        mask |= DPAD_BITS["dpad_down"]
+    if hat_x == -1:
+        mask |= DPAD_BITS["dpad_left"]
+    elif hat_x == 1:
+        mask |= DPAD_BITS["dpad_right"]
+    return mask
+
+
+# ボタン/十字キーの押下・解放のイベント
+class InputEvent(NamedTuple):
+    timestamp: float  # time.monotonic() の時刻
+    source: str       # 'button' または 'dpad'
+    key: Any          # ボタンのインデックス、または十字キーの方向
+    pressed: bool     # True: 押された、False: 離された
+    buttons: int = 0  # イベント後のボタンのビットマスク
+    dpad: int = 0     # イベント後の十字キーのビットマスク
+
+
+# 入力スレッドで判定した機能（メインスレッドはこれを実行するだけ）
+class ResolvedAction(NamedTuple):
+    timestamp: float     # time.monotonic() の時刻
+    function_name: str   # ActionRegistry に登録された機能名
+    trigger: str         # 判定内容の説明（ログ用、例: "3 長押し"）
+    count: int = 1       # 実行する回数（押し続けた時の繰り返しはまとめて渡す）
+    repeat: bool = False # 押し続けによる繰り返しか
+
+
+# 入力を別のプロセスや通信で受け取る場合に、1回の読み取りで得られるコントローラーの状態
+class InputSnapshot(NamedTuple):
+    sequence: int              # 書き込みごとに増える番号（同じ番号なら同じ状態）
+    timestamp: float           # 入力値を取得した時刻（time.monotonic()）
+    axes: Tuple[float, ...]    # すべての軸の値
+    buttons: int = 0           # ボタンの状態のビットマスク
+    dpad: int = 0              # 十字キーの状態のビットマスク（DPAD_BITS）
+    device: Optional[str] = None  # 入力元のデバイスのGUID（キャリブレーション結果の選択に使用）
+
+
 # A simple class to hold the shared state between threads
 class SharedState:
+    # 入力スレッドからメインスレッドに渡す機能の最大数（超えた場合は古いものから破棄）
+    EVENT_QUEUE_SIZE = 64
+    # メインスレッドが取り出すまで保持する入力値の最大数（超えた場合は古いものから破棄）
+    MOTION_HISTORY_SIZE = 256
+
     def __init__(self):
-        self.joystick_x = 0.0
-        self.joystick_y = 0.0
+        # カメラ操作ごとの操作量（CAMERA_DOFS の順）と取得時刻 (操作量, time.monotonic() の時刻)。
+        # 1つのタプルで置き換えるので途中の値は読まれない
+        self.motion_sample: Tuple[Tuple[float, ...], float] = (NEUTRAL_MOTION, 0.0)
         self.is_dirty = False # Flag to indicate new data is available
-        self.button_states = {}  # ボタンの状態を保存する辞書 {button_index: is_pressed}
-        self.dpad_states = {}    # 十字キーの状態を保存する辞書 {direction: is_pressed}
+        # 前回のカメラ更新以降に取得したすべての (操作量, 時刻)。カメラ更新時に時間で重み付けして積分する
+        self.motion_history = deque(maxlen=self.MOTION_HISTORY_SIZE)
+        self.button_mask = 0  # ボタンの状態のビットマスク（ビットiがボタンiに対応）
+        self.dpad_mask = 0    # 十字キーの状態のビットマスク（DPAD_BITS）
+
+        # 入力スレッドで判定した機能（deque の append/popleft はスレッドセーフ）
+        self.action_events = deque(maxlen=self.EVENT_QUEUE_SIZE)
+        self.dropped_events = 0
+
+    @property
+    def joystick_x(self) -> float:
+        """水平回転の操作量"""
+        return self.motion_sample[0][0]
+
+    @property
+    def joystick_y(self) -> float:
+        """垂直回転の操作量"""
+        return self.motion_sample[0][1]
+
+    @property
+    def motion_timestamp(self) -> float:
+        """ジョイスティックの入力値を取得した時刻（time.monotonic()）"""
+        return self.motion_sample[1]
+
+    def publish_motion(self, motion: Tuple[float, ...], timestamp: float) -> None:
+        """カメラ操作ごとの操作量を更新する（入力スレッドから呼び出す）"""
+        sample = (tuple(motion), timestamp)
+        self.motion_sample = sample
+        self.motion_history.append(sample)
+        self.is_dirty = True
+
+    def clear_motion(self, timestamp: float) -> None:
+        """ジョイスティックの入力がなくなったことを記録する（入力スレッドから呼び出す）"""
+        sample = (NEUTRAL_MOTION, timestamp)
+        self.motion_sample = sample
+        self.motion_history.append(sample)
+        self.is_dirty = False
+
+    @property
+    def is_motion_neutral(self) -> bool:
+        """すべてのカメラ操作の操作量が 0 か"""
+        return self.motion_sample[0] == NEUTRAL_MOTION
+
+    def is_button_pressed(self, button_index: int) -> bool:
+        """ボタンが押されているか"""
+        return bool(self.button_mask >> button_index & 1)
+
+    def is_dpad_pressed(self, direction: str) -> bool:
+        """十字キーの方向が押されているか"""
+        return bool(self.dpad_mask & DPAD_BITS.get(direction, 0))
+
+    def push_action(self, function_name: str, trigger: str, timestamp: Optional[float] = None, count: int = 1, repeat: bool = False) -> None:
+        """判定した機能を追加する（入力スレッドから呼び出す）"""
+        if len(self.action_events) == self.action_events.maxlen:
+            self.dropped_events += 1
+        self.action_events.append(ResolvedAction(time.monotonic() if timestamp is None else timestamp, function_name, trigger, count, repeat))
+
+    def drain_motion(self) -> List[Tuple[Tuple[float, ...], float]]:
+        """前回取り出してから取得した (操作量, 時刻) をすべて取り出す（メインスレッドから呼び出す）"""
+        samples = []
+        motion_history = self.motion_history
+        while motion_history:
+            try:
+                samples.append(motion_history.popleft())
+            except IndexError:
+                break
+        return samples
+
+    def drain_actions(self) -> List[ResolvedAction]:
+        """溜まっている機能をすべて取り出す（メインスレッドから呼び出す）"""
+        events = []
+        action_events = self.action_events
+        while action_events:
+            try:
+                events.append(action_events.popleft())
+            except IndexError:
+                break
+        return events
 
 # Global instance
 shared_state = SharedState()
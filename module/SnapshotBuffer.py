@@ -0,0 +1,121 @@
+"""
+入力の補助プロセスとアドインの間で、コントローラーの状態を共有メモリで受け渡すための固定レイアウト
+
+補助プロセス（module/InputHelper.py）からも読み込むため、Fusion 360 の adsk と相対インポートは使用しない。
+
+レイアウト（リトルエンディアン）:
+    0  uint32  MAGIC
+    4  uint16  VERSION
+    6  uint16  軸の数
+    8  uint64  シーケンス番号（奇数の間は書き込み中）
+    16 float64 入力値を取得した時刻（time.monotonic()）
+    24 uint64  ボタンのビットマスク
+    32 uint32  十字キーのビットマスク
+    36 uint32  状態（STATUS_*）
+    40 char[64] デバイスのGUID（UTF-8、NUL埋め）
+    104 float64[MAX_AXES] 軸の値
+
+書き込み側はシーケンス番号を奇数にしてから値を書き、書き終わったら偶数にする（シーケンスロック）。
+読み取り側はロックを取らず、読み取りの前後でシーケンス番号が同じ偶数であれば値が揃っているとみなす。
+"""
+
+import struct
+from typing import Optional, Sequence
+
+try:
+    from .SharedState import InputSnapshot
+except ImportError:
+    # 補助プロセスではスクリプトとして読み込まれる
+    from SharedState import InputSnapshot
+
+MAGIC = 0x4D41434A  # b'JCAM'
+VERSION = 1
+MAX_AXES = 16
+GUID_SIZE = 64
+
+# 補助プロセスの状態
+STATUS_STARTING = 0      # 起動中
+STATUS_CONNECTED = 1     # ジョイスティックを読み取っている
+STATUS_NO_DEVICE = 2     # ジョイスティックが接続されていない
+STATUS_ERROR = 3         # 読み取りに失敗した
+
+_HEADER = struct.Struct('<IHH')
+_SEQUENCE = struct.Struct('<Q')
+_BODY = struct.Struct(f'<dQII{GUID_SIZE}s{MAX_AXES}d')
+_SEQUENCE_OFFSET = _HEADER.size
+_BODY_OFFSET = _SEQUENCE_OFFSET + _SEQUENCE.size
+
+BUFFER_SIZE = _BODY_OFFSET + _BODY.size
+
+
+class SnapshotWriter:
+    """共有メモリにコントローラーの状態を書き込む（書き込むのは1つのプロセスの1つのスレッドのみ）"""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.sequence = 0
+        _HEADER.pack_into(buffer, 0, MAGIC, VERSION, 0)
+        _SEQUENCE.pack_into(buffer, _SEQUENCE_OFFSET, 0)
+
+    def write(self, timestamp: float, axes: Sequence[float], buttons: int, dpad: int,
+              device: Optional[str] = None, status: int = STATUS_CONNECTED) -> None:
+        buffer = self.buffer
+        num_axes = min(len(axes), MAX_AXES)
+        padded = list(axes[:num_axes]) + [0.0] * (MAX_AXES - num_axes)
+        guid = (device or '').encode('utf-8')[:GUID_SIZE]
+
+        # 奇数の間は書き込み中（読み取り側は読み直す）
+        self.sequence += 1
+        _SEQUENCE.pack_into(buffer, _SEQUENCE_OFFSET, self.sequence)
+        _HEADER.pack_into(buffer, 0, MAGIC, VERSION, num_axes)
+        _BODY.pack_into(buffer, _BODY_OFFSET, timestamp, buttons & 0xFFFFFFFFFFFFFFFF, dpad, status, guid, *padded)
+        self.sequence += 1
+        _SEQUENCE.pack_into(buffer, _SEQUENCE_OFFSET, self.sequence)
+
+    def set_status(self, status: int, timestamp: float) -> None:
+        """入力値なしで状態だけを書き込む（ジョイスティックが取り外された場合など）"""
+        self.write(timestamp, (), 0, 0, None, status)
+
+
+class SnapshotReader:
+    """共有メモリからコントローラーの状態をロックを取らずに読み取る"""
+
+    # 書き込み中に当たった場合に読み直す回数
+    MAX_RETRIES = 8
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.status = STATUS_STARTING
+        self.torn_reads = 0
+        self._sequence = 0
+        self._snapshot: Optional[InputSnapshot] = None
+
+    def read(self) -> Optional[InputSnapshot]:
+        """最新の状態を返す（前回から書き込みがなければ前回の状態、まだ書き込まれていなければNone）"""
+        buffer = self.buffer
+        for _ in range(self.MAX_RETRIES):
+            sequence = _SEQUENCE.unpack_from(buffer, _SEQUENCE_OFFSET)[0]
+            if sequence == self._sequence:
+                return self._snapshot
+            if sequence & 1:
+                continue
+            magic, version, num_axes = _HEADER.unpack_from(buffer, 0)
+            body = _BODY.unpack_from(buffer, _BODY_OFFSET)
+            if _SEQUENCE.unpack_from(buffer, _SEQUENCE_OFFSET)[0] != sequence:
+                # 読み取り中に書き込まれた
+                self.torn_reads += 1
+                continue
+            if magic != MAGIC or version != VERSION:
+                return None
+
+            timestamp, buttons, dpad, status, guid, axes = body[0], body[1], body[2], body[3], body[4], body[5:]
+            self._sequence = sequence
+            self.status = status
+            if status == STATUS_CONNECTED:
+                device = guid.rstrip(b'\0').decode('utf-8', 'replace') or None
+                self._snapshot = InputSnapshot(sequence, timestamp, tuple(axes[:min(num_axes, MAX_AXES)]), buttons, dpad, device)
+            else:
+                self._snapshot = None
+            return self._snapshot
+        # 書き込みが続いて読み取れなかった場合は前回の状態
+        return self._snapshot
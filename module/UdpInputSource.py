@@ -0,0 +1,53 @@
+import adsk.core
+import traceback
+from typing import List, Optional
+from ..lib import fusionAddInUtils as futil
+from .. import config
+from .InputSource import InputSource
+from .SharedState import InputSnapshot
+from .UdpProtocol import UdpReceiver
+
+
+class UdpInputSource(InputSource):
+    """ローカルのUDPポートで受け取ったコントローラーの状態を使用する（形式は module/UdpProtocol.py）
+
+    コンパニオンアプリや自動化スクリプト、別のPCのコントローラーの中継などから操作する場合に使用する。
+    """
+    name = 'udp'
+
+    def __init__(self):
+        self.receiver: Optional[UdpReceiver] = None
+
+    def start(self) -> bool:
+        host = getattr(config, 'UDP_INPUT_HOST', '127.0.0.1')
+        port = getattr(config, 'UDP_INPUT_PORT', 50515)
+        try:
+            self.receiver = UdpReceiver(host, port, getattr(config, 'UDP_INPUT_RESET_INTERVAL', 1.0))
+            futil.log(f"UDPの入力を待ち受けています: {self.receiver.address[0]}:{self.receiver.address[1]}")
+            return True
+        except Exception as e:
+            futil.log(f"UDPのポート {host}:{port} を開けませんでした: {str(e)}", adsk.core.LogLevels.ErrorLogLevel)
+            futil.log(traceback.format_exc(), adsk.core.LogLevels.ErrorLogLevel)
+            self.receiver = None
+            return False
+
+    def read(self) -> Optional[InputSnapshot]:
+        if self.receiver is None:
+            return None
+        return self.receiver.read()
+
+    def read_backlog(self) -> List[InputSnapshot]:
+        if self.receiver is None:
+            return []
+        return self.receiver.read_backlog()
+
+    def stop(self) -> None:
+        receiver = self.receiver
+        self.receiver = None
+        if receiver is not None:
+            futil.log(f"UDPの入力を終了しました (受信: {receiver.received}, 破棄: {receiver.dropped}, 新しいパケットに置き換え: {receiver.superseded}, 不正: {receiver.malformed})")
+            receiver.close()
+
+    def __repr__(self) -> str:
+        address = self.receiver.address if self.receiver is not None else None
+        return f"UdpInputSource({address})"
@@ -0,0 +1,175 @@
+"""
+ローカルのUDPポートでコントローラーの状態を受け取るための固定長のバイナリ形式（INPUT_BACKEND = 'udp' の場合に使用）
+
+送信側のスクリプト（benchmarks/bench_udp_input.py など）からも読み込むため、Fusion 360 の adsk と相対インポートは使用しない。
+
+パケット（リトルエンディアン、96バイト固定）:
+    0  uint32  MAGIC
+    4  uint8   VERSION
+    5  uint8   軸の数（MAX_AXES まで）
+    6  uint16  フラグ（FLAG_*）
+    8  uint32  シーケンス番号（送信ごとに1ずつ増やす。一周したら0に戻る）
+    12 float64 送信側の時刻（受信側は FLAG_ACK_REQUEST の応答でそのまま返すだけ）
+    20 uint64  ボタンのビットマスク
+    28 uint32  十字キーのビットマスク
+    32 float32[MAX_AXES] 軸の値
+
+応答（FLAG_ACK_REQUEST のパケットを入力スレッドが取り出した時に送信元へ返す。20バイト固定）:
+    0  uint32  MAGIC
+    4  uint8   VERSION
+    5  uint8   0
+    6  uint16  FLAG_ACK
+    8  uint32  取り出したパケットのシーケンス番号
+    12 float64 取り出したパケットの送信側の時刻
+"""
+
+import socket
+import struct
+import time
+from collections import deque
+from typing import Deque, List, Optional, Sequence, Tuple
+
+try:
+    from .SharedState import InputSnapshot
+except ImportError:
+    # 送信側のスクリプトではモジュールのディレクトリから読み込まれる
+    from SharedState import InputSnapshot
+
+MAGIC = 0x4455434A  # b'JCUD'
+VERSION = 1
+MAX_AXES = 16
+
+# パケットのフラグ
+FLAG_ACK_REQUEST = 0x0001  # 取り出した時に応答を返す（送信側で遅延を計測する場合）
+FLAG_ACK = 0x0002          # 応答
+
+SEQUENCE_MASK = 0xFFFFFFFF
+
+_PACKET = struct.Struct(f'<IBBHIdQI{MAX_AXES}f')
+_ACK = struct.Struct('<IBBHId')
+
+PACKET_SIZE = _PACKET.size
+ACK_SIZE = _ACK.size
+
+
+def pack_packet(sequence: int, timestamp: float, axes: Sequence[float], buttons: int = 0, dpad: int = 0,
+                flags: int = 0) -> bytes:
+    """コントローラーの状態をパケットにする"""
+    num_axes = min(len(axes), MAX_AXES)
+    padded = list(axes[:num_axes]) + [0.0] * (MAX_AXES - num_axes)
+    return _PACKET.pack(MAGIC, VERSION, num_axes, flags, sequence & SEQUENCE_MASK, timestamp,
+                        buttons & 0xFFFFFFFFFFFFFFFF, dpad & 0xFFFFFFFF, *padded)
+
+
+def unpack_packet(data: bytes) -> Optional[Tuple[int, int, float, Tuple[float, ...], int, int]]:
+    """パケットを (フラグ, シーケンス番号, 送信側の時刻, 軸の値, ボタン, 十字キー) にする（形式が違えばNone）"""
+    if len(data) != PACKET_SIZE:
+        return None
+    fields = _PACKET.unpack(data)
+    magic, version, num_axes, flags, sequence, timestamp, buttons, dpad = fields[:8]
+    if magic != MAGIC or version != VERSION or num_axes > MAX_AXES:
+        return None
+    return flags, sequence, timestamp, fields[8:8 + num_axes], buttons, dpad
+
+
+def pack_ack(sequence: int, timestamp: float) -> bytes:
+    return _ACK.pack(MAGIC, VERSION, 0, FLAG_ACK, sequence & SEQUENCE_MASK, timestamp)
+
+
+def unpack_ack(data: bytes) -> Optional[Tuple[int, float]]:
+    """応答を (シーケンス番号, 送信側の時刻) にする（形式が違えばNone）"""
+    if len(data) != ACK_SIZE:
+        return None
+    magic, version, _, flags, sequence, timestamp = _ACK.unpack(data)
+    if magic != MAGIC or version != VERSION or not flags & FLAG_ACK:
+        return None
+    return sequence, timestamp
+
+
+def is_newer(sequence: int, previous: int) -> bool:
+    """シーケンス番号が前回より新しいか（一周して0に戻った場合も新しいとみなす）"""
+    difference = (sequence - previous) & SEQUENCE_MASK
+    return 0 < difference < 0x80000000
+
+
+class UdpReceiver:
+    """UDPのパケットを受け取り、最も新しいシーケンス番号の状態だけを残す
+
+    read のたびにソケットに溜まったパケットをブロックせずにすべて取り出し、古いシーケンス番号のパケットは捨てる。
+    同じ read で新しいパケットに置き換えられたパケットの状態は read_backlog で順に受け取れる。
+    reset_interval 秒以上パケットを受け取らなかった場合は、送信側が起動し直したとみなしてシーケンス番号を比較しない。
+    """
+
+    # 1回の read で取り出すパケットの上限（送信側が速すぎる場合でも入力スレッドを止めない）
+    MAX_DRAIN = 256
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, reset_interval: float = 1.0, device: Optional[str] = 'udp'):
+        self.reset_interval = reset_interval
+        self.device = device
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.setblocking(False)
+        self.address = self.socket.getsockname()
+
+        self.received = 0
+        self.dropped = 0
+        self.superseded = 0
+        self.malformed = 0
+        self._sequence: Optional[int] = None
+        self._receive_time = 0.0
+        self._snapshot: Optional[InputSnapshot] = None
+        # 新しいパケットに置き換えられたパケットの状態（古い順、read_backlog で取り出す）
+        self._backlog: Deque[InputSnapshot] = deque(maxlen=self.MAX_DRAIN)
+
+    def read(self) -> Optional[InputSnapshot]:
+        """最新の状態を返す（まだ受け取っていなければNone）。状態の時刻は受信側の time.monotonic()"""
+        latest = None
+        for _ in range(self.MAX_DRAIN):
+            try:
+                data, sender = self.socket.recvfrom(PACKET_SIZE + 1)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                # Windowsでは応答の送信先が閉じていると次の受信で ConnectionResetError になる
+                continue
+            packet = unpack_packet(data)
+            if packet is None:
+                self.malformed += 1
+                continue
+            self.received += 1
+            now = time.monotonic()
+            sequence = packet[1]
+            if self._sequence is not None and now - self._receive_time < self.reset_interval and not is_newer(sequence, self._sequence):
+                # 後から届いた古いパケット
+                self.dropped += 1
+                continue
+            if latest is not None:
+                self.superseded += 1
+                self._backlog.append(self._to_snapshot(latest[0], self._receive_time))
+            latest = packet, sender
+            self._sequence = sequence
+            self._receive_time = now
+
+        if latest is not None:
+            packet, sender = latest
+            flags, sequence, timestamp = packet[:3]
+            self._snapshot = self._to_snapshot(packet, self._receive_time)
+            if flags & FLAG_ACK_REQUEST:
+                try:
+                    self.socket.sendto(pack_ack(sequence, timestamp), sender)
+                except OSError:
+                    pass
+        return self._snapshot
+
+    def read_backlog(self) -> List[InputSnapshot]:
+        """前回の read_backlog 以降に、read で最新の状態に置き換えられたパケットの状態を古い順に取り出す"""
+        backlog = list(self._backlog)
+        self._backlog.clear()
+        return backlog
+
+    def _to_snapshot(self, packet: Tuple, receive_time: float) -> InputSnapshot:
+        _, sequence, _, axes, buttons, dpad = packet
+        return InputSnapshot(sequence, receive_time, axes, buttons, dpad, self.device)
+
+    def close(self) -> None:
+        self.socket.close()
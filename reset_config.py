@@ -19,6 +19,7 @@ def reset_config():
     config.DEAD_ZONE = 0.15
     config.UPDATE_RATE = 0.032
     config.SELECTED_JOYSTICK = 0
+    config.SELECTED_JOYSTICK_GUID = ""
     config.AXIS_X = 0
     config.AXIS_Y = 1
     config.RESPONSE_CURVE = 1.0
@@ -0,0 +1,59 @@
+"""
+テストの共通設定
+
+アドインはルートディレクトリを1つのパッケージとして相対インポートするので、親ディレクトリをパスに追加して
+パッケージ名（ディレクトリ名）付きでモジュールを読み込む。Fusion 360 の外で実行する場合は adsk の代わりに
+何を呼び出しても何もしないモジュールを登録する（Fusion API を使う処理はテストしない）。
+"""
+
+import importlib
+import os
+import sys
+import types
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.basename(ROOT)
+
+
+class _FusionStub:
+    """どの属性を参照しても呼び出しても自身を返す adsk の代わり（クラスの基底にも使える）"""
+
+    def __getattr__(self, name):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def __mro_entries__(self, bases):
+        return (object,)
+
+
+def _install_fusion_stub() -> None:
+    try:
+        import adsk.core  # noqa: F401
+        return
+    except ImportError:
+        pass
+    adsk = types.ModuleType('adsk')
+    for name in ('core', 'fusion'):
+        setattr(adsk, name, _FusionStub())
+        sys.modules[f'adsk.{name}'] = getattr(adsk, name)
+    sys.modules['adsk'] = adsk
+
+
+_install_fusion_stub()
+if os.path.dirname(ROOT) not in sys.path:
+    sys.path.insert(0, os.path.dirname(ROOT))
+
+
+def load(name: str):
+    """アドインのモジュールを読み込む（例: load('module.ActionQueue')）"""
+    return importlib.import_module(f'{PACKAGE}.{name}')
+
+
+@pytest.fixture(scope='session')
+def addin():
+    """アドインのモジュールを読み込む関数"""
+    return load
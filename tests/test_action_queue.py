@@ -0,0 +1,115 @@
+import pytest
+
+
+class FakeSequencer:
+    WAIT_FOR_SETTLE = object()
+
+    def __init__(self):
+        self.is_busy = False
+        self.cancelled = 0
+
+    def schedule(self, *steps):
+        self.is_busy = True
+
+    def cancel(self):
+        self.cancelled += 1
+        self.is_busy = False
+
+
+class FakeController:
+    """ActionQueue が実行した機能を記録する CameraController の代わり"""
+
+    def __init__(self):
+        self.rotations = type('Rotations', (), {})()
+        self.rotations.sequencer = FakeSequencer()
+        self.camera_util = type('CameraUtility', (), {})()
+        self.camera_util.cancelled = 0
+        self.camera_util.cancel_transition = self._cancel_transition
+        self.executed = []
+
+    def _cancel_transition(self):
+        self.camera_util.cancelled += 1
+
+    def execute_action(self, action):
+        self.executed.append(action.name)
+
+    def execute_rotation(self, action, kind, angle, smart, count):
+        self.executed.append((action.name, angle, count))
+
+
+@pytest.fixture
+def registry(addin):
+    return addin('module.ActionRegistry').action_registry
+
+
+@pytest.fixture
+def queue(addin, monkeypatch):
+    monkeypatch.setattr(addin('config'), 'ACTION_COALESCE_WINDOW', 0.2, raising=False)
+    return addin('module.ActionQueue').ActionQueue(FakeController())
+
+
+def test_same_rotations_are_merged(queue, registry):
+    right = registry.get('smart_rotate_right')
+    for _ in range(3):
+        queue.enqueue(right, now=0.0)
+    queue.tick(now=0.1)
+    assert queue.controller.executed == []
+    queue.tick(now=0.3)
+    assert queue.controller.executed == [('smart_rotate_right', -90.0, 3)]
+    assert queue.merged == 2 and queue.is_empty
+
+
+def test_opposite_rotations_cancel_out(queue, registry):
+    queue.enqueue(registry.get('smart_rotate_right'), now=0.0)
+    queue.enqueue(registry.get('smart_rotate_left'), now=0.0)
+    assert queue.is_empty and queue.dropped == 2
+
+
+def test_different_rotations_are_not_merged(queue, registry):
+    queue.enqueue(registry.get('smart_rotate_right'), now=0.0)
+    queue.enqueue(registry.get('rotate_screen_right'), now=0.0)
+    queue.enqueue(registry.get('smart_rotate_up'), now=0.0)
+    queue.tick(now=0.0)
+    assert queue.controller.executed == ['smart_rotate_right']
+    assert queue.controller.rotations.sequencer.is_busy
+
+
+def test_busy_sequencer_holds_relative_actions(queue, registry):
+    queue.controller.rotations.sequencer.is_busy = True
+    queue.enqueue(registry.get('rotate_screen_up'), now=0.0, repeating=True)
+    queue.tick(now=1.0)
+    assert queue.controller.executed == []
+    queue.controller.rotations.sequencer.is_busy = False
+    queue.tick(now=1.0)
+    assert queue.controller.executed == ['rotate_screen_up']
+
+
+def test_repeating_rotation_skips_coalesce_window(queue, registry):
+    queue.enqueue(registry.get('smart_rotate_up'), now=0.0, count=2, repeating=True)
+    queue.tick(now=0.0)
+    assert queue.controller.executed == [('smart_rotate_up', 180.0, 2)]
+
+
+def test_absolute_action_cancels_and_dispatches_immediately(queue, registry):
+    controller = queue.controller
+    queue.enqueue(registry.get('smart_rotate_right'), now=0.0)
+    queue.enqueue(registry.get('rotate_screen_up'), now=0.0)
+    controller.rotations.sequencer.is_busy = True
+
+    queue.enqueue(registry.get('home_view'), now=0.0, count=2)
+    assert controller.executed == ['home_view']
+    assert controller.camera_util.cancelled == 1 and controller.rotations.sequencer.cancelled == 1
+    assert queue.is_empty and queue.dropped == 3
+
+
+def test_actions_after_absolute_wait_for_its_transition(queue, registry):
+    queue.enqueue(registry.get('home_view'), now=0.0)
+    queue.enqueue(registry.get('smart_rotate_right'), now=0.0)
+    queue.tick(now=1.0)
+    assert queue.controller.executed == ['home_view']
+    assert not queue.is_empty
+
+
+@pytest.mark.parametrize('angle, expected', [(270.0, -90.0), (-270.0, 90.0), (180.0, 180.0), (-180.0, 180.0), (360.0, 0.0)])
+def test_normalize_angle(addin, angle, expected):
+    assert addin('module.ActionQueue')._normalize_angle(angle) == expected
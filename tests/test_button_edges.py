@@ -0,0 +1,54 @@
+import pytest
+
+
+@pytest.fixture
+def thread(addin):
+    shared_state = addin('module.SharedState').shared_state
+    joystick_thread = addin('module.JoystickThread')
+    thread = joystick_thread.JoystickThread(joystick_manager=None, dead_zone=0.1)
+    thread.events = []
+    thread.gesture_engine.process = thread.events.append
+    shared_state.button_mask = 0
+    shared_state.dpad_mask = 0
+    yield thread
+    shared_state.button_mask = 0
+    shared_state.dpad_mask = 0
+
+
+def edges(thread):
+    return [(event.source, event.key, event.pressed) for event in thread.events]
+
+
+def test_tap_between_polls_is_kept(thread):
+    thread._publish_edges(0, 0, 1.0, [('button', 3, True), ('button', 3, False)])
+    assert edges(thread) == [('button', 3, True), ('button', 3, False)]
+    assert thread.resynced_edges == 0
+
+
+def test_events_keep_their_order_across_buttons_and_dpad(thread):
+    events = [('dpad', 1), ('button', 0, True), ('dpad', 0), ('button', 0, False), ('button', 1, True)]
+    thread._publish_edges(0b10, 0, 1.0, events)
+    assert edges(thread) == [
+        ('dpad', 'dpad_up', True),
+        ('button', 0, True),
+        ('dpad', 'dpad_up', False),
+        ('button', 0, False),
+        ('button', 1, True),
+    ]
+    assert thread.events[-1].buttons == 0b10
+
+
+def test_repeated_events_do_not_duplicate_edges(thread):
+    thread._publish_edges(0b1, 0, 1.0, [('button', 0, True), ('button', 0, True)])
+    assert edges(thread) == [('button', 0, True)]
+
+
+def test_mask_resyncs_missed_events(thread):
+    thread._publish_edges(0b100, 0b1000, 1.0, [])
+    assert edges(thread) == [('button', 2, True), ('dpad', 'dpad_right', True)]
+    assert thread.resynced_edges == 2
+
+
+def test_disabled_buttons_ignore_events(thread):
+    thread._publish_edges(0, 0, 1.0, [('button', 0, True), ('dpad', 1)], buttons_enabled=False, dpad_enabled=False)
+    assert edges(thread) == []
@@ -0,0 +1,81 @@
+import types
+
+import pytest
+
+
+class FakeCameraUtility:
+    """カメラの位置と向きとビュー遷移アニメーションの状態だけを持つ CameraUtility の代わり"""
+
+    def __init__(self):
+        self.pose = (0.0, 0.0, 10.0, 0.0, 1.0, 0.0)
+        self.is_transitioning = False
+        self.logs = []
+
+    def log(self, message, level=None):
+        self.logs.append(message)
+
+
+@pytest.fixture
+def sequencer(addin, monkeypatch):
+    camera_sequence = addin('lib.cameraUtils.camera_sequence')
+    # schedule() は現在時刻ですぐに tick するので、テストの時刻を0から始める
+    monkeypatch.setattr(camera_sequence, 'time', types.SimpleNamespace(time=lambda: 0.0))
+    sequencer = camera_sequence.CameraSequencer(FakeCameraUtility())
+    monkeypatch.setattr(sequencer, '_read_pose', lambda: sequencer.camera_util.pose)
+    return sequencer
+
+
+def schedule_with_wait(sequencer):
+    executed = []
+    sequencer.schedule(sequencer.WAIT_FOR_SETTLE, lambda: executed.append(True))
+    return executed
+
+
+def test_waits_until_pose_is_unchanged_for_settle_ticks(sequencer):
+    executed = schedule_with_wait(sequencer)
+    for tick in range(1, sequencer.SETTLE_TICKS):
+        sequencer.tick(tick * 0.01)
+        assert not executed
+    sequencer.tick(sequencer.SETTLE_TICKS * 0.01)
+    assert executed and not sequencer.is_busy
+
+
+def test_pose_change_restarts_the_count(sequencer):
+    executed = schedule_with_wait(sequencer)
+    sequencer.tick(0.01)
+    sequencer.camera_util.pose = (1.0,) + sequencer.camera_util.pose[1:]
+    for tick in range(2, sequencer.SETTLE_TICKS + 2):
+        sequencer.tick(tick * 0.01)
+        assert not executed
+    sequencer.tick((sequencer.SETTLE_TICKS + 2) * 0.01)
+    assert executed
+
+
+def test_running_view_transition_is_never_settled(sequencer):
+    sequencer.camera_util.is_transitioning = True
+    executed = schedule_with_wait(sequencer)
+    for tick in range(1, 10):
+        sequencer.tick(tick * 0.01)
+    assert not executed
+
+    sequencer.camera_util.is_transitioning = False
+    for tick in range(10, 10 + sequencer.SETTLE_TICKS):
+        sequencer.tick(tick * 0.01)
+    assert executed
+
+
+def test_timeout_settles_a_moving_camera(sequencer):
+    executed = schedule_with_wait(sequencer)
+    sequencer.camera_util.is_transitioning = True
+    sequencer.tick(sequencer.SETTLE_TIMEOUT * 0.5)
+    assert not executed
+    sequencer.tick(sequencer.SETTLE_TIMEOUT)
+    assert executed
+
+
+def test_cancel_discards_the_wait(sequencer):
+    executed = schedule_with_wait(sequencer)
+    sequencer.cancel()
+    assert not sequencer.is_busy
+    sequencer.tick(sequencer.SETTLE_TIMEOUT)
+    assert not executed
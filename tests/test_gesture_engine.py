@@ -0,0 +1,148 @@
+import pytest
+
+LONG_PRESS_TIME = 0.5
+DOUBLE_TAP_WINDOW = 0.3
+CHORD_WINDOW = 0.08
+
+
+@pytest.fixture
+def input_event(addin):
+    return addin('module.SharedState').InputEvent
+
+
+@pytest.fixture
+def make_engine(addin):
+    gesture_engine = addin('module.GestureEngine')
+
+    def make(buttons=None, dpad=None, gestures=None, names=None, auto_repeat=False):
+        emitted = []
+        engine = gesture_engine.GestureEngine(lambda name, trigger, now, count=1, repeat=False: emitted.append((name, now, count, repeat)))
+        engine.configure(buttons or {}, dpad or {}, gestures or {}, names or {},
+                         LONG_PRESS_TIME, DOUBLE_TAP_WINDOW, CHORD_WINDOW,
+                         auto_repeat_enabled=auto_repeat, auto_repeat_delay=0.5, auto_repeat_rate=4.0,
+                         auto_repeat_acceleration=0.0, auto_repeat_max_rate=4.0)
+        engine.emitted = emitted
+        return engine
+    return make
+
+
+@pytest.fixture
+def press(input_event):
+    def press(engine, key, now, pressed=True):
+        source = 'dpad' if isinstance(key, str) else 'button'
+        engine.process(input_event(now, source, key, pressed))
+    return press
+
+
+def names(engine):
+    return [entry[0] for entry in engine.emitted]
+
+
+def test_plain_press_is_emitted_immediately(make_engine, press):
+    engine = make_engine(buttons={0: 'home_view'}, dpad={'dpad_up': 'smart_rotate_up'})
+    press(engine, 0, 1.0)
+    press(engine, 'dpad_up', 1.0)
+    assert names(engine) == ['home_view', 'smart_rotate_up']
+    assert engine.next_deadline() is None
+
+
+def test_long_press(make_engine, press):
+    engine = make_engine(buttons={1: 'home_view'}, gestures={'1:long': 'iso_view'})
+    press(engine, 1, 0.0)
+    assert engine.next_deadline() == pytest.approx(LONG_PRESS_TIME)
+    engine.tick(LONG_PRESS_TIME - 0.01)
+    assert names(engine) == []
+    engine.tick(LONG_PRESS_TIME)
+    press(engine, 1, 0.8, pressed=False)
+    assert names(engine) == ['iso_view']
+
+
+def test_short_press_with_long_assignment_emits_on_release(make_engine, press):
+    engine = make_engine(buttons={1: 'home_view'}, gestures={'1:long': 'iso_view'})
+    press(engine, 1, 0.0)
+    press(engine, 1, 0.1, pressed=False)
+    engine.tick(1.0)
+    assert names(engine) == ['home_view']
+
+
+def test_double_tap(make_engine, press):
+    engine = make_engine(buttons={2: 'viewcube_front'}, gestures={'2:double': 'viewcube_back'})
+    press(engine, 2, 0.0)
+    press(engine, 2, 0.05, pressed=False)
+    press(engine, 2, 0.2)
+    press(engine, 2, 0.25, pressed=False)
+    engine.tick(1.0)
+    assert names(engine) == ['viewcube_back']
+
+
+def test_single_tap_waits_for_double_tap_window(make_engine, press):
+    engine = make_engine(buttons={2: 'viewcube_front'}, gestures={'2:double': 'viewcube_back'})
+    press(engine, 2, 0.0)
+    press(engine, 2, 0.05, pressed=False)
+    engine.tick(0.05 + DOUBLE_TAP_WINDOW - 0.01)
+    assert names(engine) == []
+    engine.tick(0.05 + DOUBLE_TAP_WINDOW)
+    assert names(engine) == ['viewcube_front']
+
+
+def test_tap_inside_one_poll_still_counts(make_engine, press):
+    """押下と解放が同じ時刻（1回のポーリング内）でも通常の押下になる"""
+    engine = make_engine(buttons={3: 'home_view'}, gestures={'3:long': 'iso_view'})
+    press(engine, 3, 1.0)
+    press(engine, 3, 1.0, pressed=False)
+    assert names(engine) == ['home_view']
+
+
+def test_chord_with_button_names(make_engine, press):
+    engine = make_engine(buttons={4: 'smart_rotate_left', 5: 'smart_rotate_right'},
+                         gestures={'L1+R1': 'home_view'}, names={'L1': 4, 'R1': 5})
+    press(engine, 4, 0.0)
+    press(engine, 5, CHORD_WINDOW / 2)
+    engine.tick(1.0)
+    press(engine, 4, 1.1, pressed=False)
+    press(engine, 5, 1.1, pressed=False)
+    assert names(engine) == ['home_view']
+
+
+def test_chord_member_alone_is_a_press(make_engine, press):
+    engine = make_engine(buttons={4: 'smart_rotate_left', 5: 'smart_rotate_right'}, gestures={'4+5': 'home_view'})
+    press(engine, 4, 0.0)
+    engine.tick(CHORD_WINDOW)
+    press(engine, 5, 0.5)
+    assert names(engine) == ['smart_rotate_left']
+
+
+def test_held_rotation_repeats_with_count(make_engine, press):
+    engine = make_engine(buttons={6: 'smart_rotate_right'}, auto_repeat=True)
+    press(engine, 6, 0.0)
+    assert engine.emitted == [('smart_rotate_right', 0.0, 1, False)]
+    engine.tick(0.49)
+    assert len(engine.emitted) == 1
+    # 0.5秒後から4回/秒で繰り返し、tick の間に過ぎた分はまとめる
+    engine.tick(1.0)
+    assert engine.emitted[-1] == ('smart_rotate_right', 1.0, 3, True)
+    press(engine, 6, 1.1, pressed=False)
+    assert engine.next_deadline() is None
+
+
+def test_non_rotation_does_not_repeat(make_engine, press):
+    engine = make_engine(buttons={6: 'home_view'}, auto_repeat=True)
+    press(engine, 6, 0.0)
+    engine.tick(2.0)
+    assert names(engine) == ['home_view']
+
+
+def test_invalid_binding_is_ignored(make_engine, press):
+    engine = make_engine(buttons={0: 'home_view'}, gestures={'0:triple': 'iso_view', '1+1': 'iso_view'})
+    press(engine, 0, 0.0)
+    assert names(engine) == ['home_view']
+
+
+@pytest.mark.parametrize('binding, expected', [
+    ('3', ('press', 3)),
+    ('3:long', ('long', 3)),
+    ('dpad_up:double', ('double', 'dpad_up')),
+    ('L1+A', ('chord', frozenset({4, 0}))),
+])
+def test_parse_binding(addin, binding, expected):
+    assert addin('module.GestureEngine').parse_binding(binding, {'L1': 4, 'A': 0}) == expected
@@ -0,0 +1,126 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+TOLERANCE = 1e-9
+NUM_AXES = 6
+
+
+@pytest.fixture(params=['numpy', 'rows'])
+def pipeline_module(request, addin, monkeypatch):
+    """run_block を NumPy で配列としてまとめて処理する場合と、NumPyがなく1件ずつ処理する場合"""
+    module = addin('module.InputPipeline')
+    if request.param == 'numpy':
+        if module.np is None:
+            pytest.skip('NumPyがありません')
+    else:
+        monkeypatch.setattr(module, 'np', None)
+    return module
+
+
+@pytest.fixture
+def build(addin, pipeline_module):
+    axis_mapping = addin('module.AxisMapping')
+    axis_calibration = addin('module.AxisCalibration')
+    mappings = [
+        axis_mapping.AxisMapping(0, 'yaw', curve=2.0),
+        axis_mapping.AxisMapping(1, 'pitch', invert=True),
+        axis_mapping.AxisMapping(2, 'pan_x', scale=0.5, curve=1.5),
+        axis_mapping.AxisMapping(3, 'pan_y', scale=0.5, curve=1.5, invert=True),
+        axis_mapping.AxisMapping(4, 'dolly', scale=-1.0, trigger=True),
+        axis_mapping.AxisMapping(5, 'dolly', trigger=True),
+    ]
+    calibration = axis_calibration.AxisCalibration
+    calibrations = {'selected': [calibration(0.03, 0.01, 0.004, 0.0125, 0.97),
+                                 calibration(-0.02, 0.015, 0.006, 0.019, 0.98),
+                                 calibration(0.0, 0.005, 0.002, 0.01, 1.0),
+                                 calibration(0.01, 0.005, 0.002, 0.01, 0.99),
+                                 calibration(-1.0, 0.0, 0.0, None)],
+                    'udp': [calibration(0.2, 0.0, 0.0, 0.05, 0.8)] * 4}
+    joystick_manager = SimpleNamespace(device=SimpleNamespace(key='selected'), devices={})
+
+    def build():
+        return pipeline_module.build_input_pipeline(mappings, 0.15, calibrations, joystick_manager)
+    return build
+
+
+def make_samples(count, seed=1):
+    """静止、ゆっくりした操作、スムージングの対象になる急な飛びが混ざる入力値"""
+    rng = random.Random(seed)
+    values = [0.0] * NUM_AXES
+    values[4] = values[5] = -1.0
+    times = []
+    rows = []
+    for i in range(count):
+        for axis in range(NUM_AXES):
+            if rng.random() < 0.05:
+                values[axis] = rng.uniform(-1.0, 1.0)
+            else:
+                values[axis] = max(-1.0, min(1.0, values[axis] + rng.gauss(0.0, 0.05)))
+        times.append(i * 0.01)
+        rows.append(list(values))
+    return times, rows
+
+
+def run_scalar(module, pipeline, times, rows, selected_device=None):
+    motions = []
+    active = []
+    for now, row in zip(times, rows):
+        frame = pipeline.run(module.InputFrame(now, {None: list(row)}, selected_device))
+        motions.append(frame.motion)
+        active.append(frame.active)
+    return motions, active
+
+
+def run_block(pipeline, times, rows, chunks=1, selected_device=None):
+    motions = []
+    active = []
+    size = -(-len(times) // chunks)
+    for start in range(0, len(times), size):
+        block_motion, block_active = pipeline.run_block(times[start:start + size], {None: rows[start:start + size]}, selected_device)
+        motions.extend(list(row) for row in block_motion)
+        active.extend(bool(flag) for flag in block_active)
+    return motions, active
+
+
+def assert_same(expected, actual):
+    expected_motions, expected_active = expected
+    motions, active = actual
+    assert len(motions) == len(expected_motions)
+    for row, (a, b) in enumerate(zip(expected_motions, motions)):
+        assert max(abs(x - y) for x, y in zip(a, b)) <= TOLERANCE, f'{row}件目: {a} != {b}'
+    assert list(active) == list(expected_active)
+
+
+def test_block_matches_scalar(pipeline_module, build):
+    times, rows = make_samples(2000)
+    assert_same(run_scalar(pipeline_module, build(), times, rows), run_block(build(), times, rows))
+
+
+def test_block_carries_state_between_blocks(pipeline_module, build):
+    times, rows = make_samples(2000, seed=2)
+    scalar = build()
+    expected = run_scalar(pipeline_module, scalar, times, rows)
+    block = build()
+    assert_same(expected, run_block(block, times, rows, chunks=7))
+    # 次の入力値に引き継ぐスムージングの状態も一致する
+    assert block.get_stage('filter').previous == pytest.approx(scalar.get_stage('filter').previous, abs=TOLERANCE)
+
+
+def test_block_uses_selected_device_calibration(pipeline_module, build):
+    times, rows = make_samples(500, seed=3)
+    expected = run_scalar(pipeline_module, build(), times, rows, selected_device='udp')
+    assert_same(expected, run_block(build(), times, rows, selected_device='udp'))
+    assert expected != run_scalar(pipeline_module, build(), times, rows)
+
+
+def test_backlog_then_latest_matches_every_sample(pipeline_module, build):
+    """入力元から溜まった状態をまとめて処理してから最新の状態を処理すると、すべてを順に処理した場合と同じになる"""
+    times, rows = make_samples(300, seed=4)
+    expected = run_scalar(pipeline_module, build(), times, rows)
+    pipeline = build()
+    pipeline.run_block(times[:-1], {None: rows[:-1]})
+    frame = pipeline.run(pipeline_module.InputFrame(times[-1], {None: list(rows[-1])}))
+    assert frame.motion == pytest.approx(expected[0][-1], abs=TOLERANCE)
+    assert frame.active == expected[1][-1]
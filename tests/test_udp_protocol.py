@@ -0,0 +1,104 @@
+import socket
+import struct
+import time
+
+import pytest
+
+
+@pytest.fixture
+def protocol(addin):
+    return addin('module.UdpProtocol')
+
+
+def test_packet_round_trip(protocol):
+    data = protocol.pack_packet(42, 12.5, [0.5, -0.25, 1.0], buttons=1 << 40 | 0b101, dpad=0b1001,
+                                flags=protocol.FLAG_ACK_REQUEST)
+    assert len(data) == protocol.PACKET_SIZE
+    assert protocol.unpack_packet(data) == (protocol.FLAG_ACK_REQUEST, 42, 12.5, (0.5, -0.25, 1.0), 1 << 40 | 0b101, 0b1001)
+
+
+def test_axes_are_float32_and_limited(protocol):
+    axes = [0.1 * i for i in range(protocol.MAX_AXES + 4)]
+    _, _, _, unpacked, _, _ = protocol.unpack_packet(protocol.pack_packet(1, 0.0, axes))
+    assert len(unpacked) == protocol.MAX_AXES
+    assert unpacked == pytest.approx(axes[:protocol.MAX_AXES], abs=1e-6)
+
+
+def test_sequence_wraps_to_32_bits(protocol):
+    packet = protocol.unpack_packet(protocol.pack_packet(protocol.SEQUENCE_MASK + 3, 0.0, []))
+    assert packet[1] == 2 and packet[3] == ()
+
+
+def test_malformed_packets_are_rejected(protocol):
+    data = protocol.pack_packet(1, 0.0, [0.5])
+    assert protocol.unpack_packet(data[:-1]) is None
+    assert protocol.unpack_packet(data + b'\0') is None
+    assert protocol.unpack_packet(struct.pack('<I', 0) + data[4:]) is None
+    assert protocol.unpack_packet(data[:4] + bytes([protocol.VERSION + 1]) + data[5:]) is None
+    assert protocol.unpack_packet(data[:5] + bytes([protocol.MAX_AXES + 1]) + data[6:]) is None
+
+
+def test_ack_round_trip(protocol):
+    data = protocol.pack_ack(7, 3.25)
+    assert len(data) == protocol.ACK_SIZE
+    assert protocol.unpack_ack(data) == (7, 3.25)
+    assert protocol.unpack_ack(data[:-1]) is None
+    assert protocol.unpack_ack(protocol.pack_packet(7, 3.25, [])) is None
+
+
+@pytest.mark.parametrize('sequence, previous, expected', [
+    (2, 1, True),
+    (1, 1, False),
+    (1, 2, False),
+    (0, 0xFFFFFFFF, True),
+    (5, 0xFFFFFFF0, True),
+    (0xFFFFFFF0, 5, False),
+])
+def test_is_newer_handles_wraparound(protocol, sequence, previous, expected):
+    assert protocol.is_newer(sequence, previous) is expected
+
+
+@pytest.fixture
+def link(protocol):
+    receiver = protocol.UdpReceiver('127.0.0.1', 0)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.settimeout(1.0)
+
+    def send(*packets):
+        """パケットを送信し、すべて取り出されるまで read を繰り返す"""
+        expected = receiver.received + receiver.malformed + len(packets)
+        for packet in packets:
+            sender.sendto(packet, receiver.address)
+        snapshot = receiver.read()
+        deadline = time.monotonic() + 1.0
+        while receiver.received + receiver.malformed < expected and time.monotonic() < deadline:
+            time.sleep(0.005)
+            snapshot = receiver.read()
+        return snapshot
+
+    yield receiver, sender, send
+    sender.close()
+    receiver.close()
+
+
+def test_receiver_keeps_newest_and_backlog(protocol, link):
+    receiver, _, send = link
+    snapshot = send(*(protocol.pack_packet(sequence, 0.0, [sequence / 10.0]) for sequence in (1, 2, 3)))
+    assert snapshot.sequence == 3 and snapshot.device == 'udp'
+    assert [backlog.sequence for backlog in receiver.read_backlog()] == [1, 2]
+    assert receiver.read_backlog() == []
+    assert receiver.superseded == 2 and receiver.dropped == 0
+
+
+def test_receiver_drops_late_and_malformed_packets(protocol, link):
+    receiver, _, send = link
+    send(protocol.pack_packet(10, 0.0, [0.5]))
+    snapshot = send(protocol.pack_packet(9, 0.0, [0.9]), b'JCUD')
+    assert snapshot.sequence == 10 and snapshot.axes == (0.5,)
+    assert receiver.dropped == 1 and receiver.malformed == 1
+
+
+def test_receiver_answers_ack_requests(protocol, link):
+    _, sender, send = link
+    send(protocol.pack_packet(5, 1.5, [0.0], flags=protocol.FLAG_ACK_REQUEST))
+    assert protocol.unpack_ack(sender.recv(protocol.ACK_SIZE + 1)) == (5, 1.5)